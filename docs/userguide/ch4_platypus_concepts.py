@@ -512,3 +512,12 @@ $beforPage(self,canvas,document)$. The methods allow class derivation to be used
 standard behaviour, whilst the attributes allow instance changes. The $id$ argument is used at
 run time to perform $PageTemplate$ switching so $id='FirstPage'$ or $id='TwoColumns'$ are typical.
 """)
+disc("""
+Decoration which is identical on every page (letterheads, logos, watermarks, borders) can instead be
+drawn by the optional $onPageStatic$ callable, which has the same signature. It is called only once per
+document to draw into a PDF form XObject; each page using the template then just places the form before
+$onPage$ is called, so the operators are not repeated in every page's content stream. Templates sharing the
+same $onPageStatic$ share the form. Anything which varies from page to page, such as page numbers, must still be
+drawn by $onPage$ or $onPageEnd$. $SimpleDocTemplate.build$ accepts an $onPageStatic$ argument for
+both of its templates.
+""")
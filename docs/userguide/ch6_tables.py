@@ -14,6 +14,13 @@ $Table$ cells can hold anything which can be converted to
 a <b>Python</b> $string$ or $Flowables$ (or lists of $Flowables$).
 """)
 
+disc("""
+For very long tables whose rows come from a database cursor or generator the
+$StreamingTable$ class takes a row iterator and fixed column widths; it pulls and sizes only
+the rows needed for the current frame, repeats the first $repeatRows$ rows as a header and
+emits each page slice as an ordinary $Table$.
+""")
+
 disc("""
 Our present tables are a trade-off between efficient drawing and specification
 and functionality.  We assume the reader has some familiarity with HTML tables.
@@ -790,3 +797,27 @@ story.append(
         )
     )   
 """)
+
+heading2("""$Precompiled()$ and $precompileStory()$""")
+disc("""When many documents share the same boilerplate (terms, disclosures, static tables) the $precompileStory$ function
+can lay that part of the story out once and keep the result. Each $Paragraph$, $Preformatted$ or $Table$ in the story is
+wrapped in a $Precompiled$ flowable which keeps the line breaks and sizes computed at one width; wrapping it again at that
+width costs nothing and only a split at a page end does new layout work. If $key$ is given the precompiled flowables are
+remembered in the process and the story argument, which may be a callable, is only used when there is no
+usable entry. An entry is discarded if any paragraph style it uses has been changed or a font it uses has been replaced;
+only the most recently used stories are kept and $clearPrecompiledStories()$ forgets them all.
+""")
+eg("""
+from reportlab.platypus.flowables import precompileStory
+def terms():
+    return [Paragraph(t, styles['BodyText']) for t in termsTexts]
+for customer in customers:
+    doc = SimpleDocTemplate(...)
+    story = [Paragraph('Dear %s' % customer.name, styles['Normal'])]
+    story.extend(precompileStory(terms, key='terms'))
+    doc.build(story)
+""")
+disc("""The layout is made at the first width the flowables are wrapped at unless a $width$ argument is given.
+Flowables that depend on more than the available width, such as $KeepTogether$, are passed through unchanged, as are
+subclasses of $Paragraph$, $Preformatted$ and $Table$ unless they set $_precompilable$ themselves.
+""")
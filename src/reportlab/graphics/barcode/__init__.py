@@ -29,7 +29,8 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 #
-__all__ = tuple('''registerWidget getCodes getCodeNames createBarcodeDrawing createBarcodeImageInMemory'''.split())
+__all__ = tuple('''registerWidget getCodes getCodeNames createBarcodeDrawing createBarcodeImageInMemory
+        BarcodeSymbol createBarcodeSymbol createBarcodeSymbols'''.split())
 __version__ = '0.9'
 __doc__='''Popular barcodes available as reusable widgets'''
 
@@ -150,3 +151,158 @@ def createBarcodeImageInMemory(codeName,**options):
     format = options.pop('format','png')
     d = createBarcodeDrawing(codeName, **options)
     return d.asString(format)
+
+class BarcodeSymbol:
+    """A barcode reduced to what is needed to draw it.
+
+    bars is a list of ((fillColor, strokeColor, strokeWidth), runs) with runs a
+    list of (x, y, width, height); horizontally touching bars of the same
+    kind are merged into one run.  strings is a list of
+    (transform, x, y, text, fontName, fontSize, textAnchor, fillColor) for the
+    human readable text.  Instances are made by createBarcodeSymbol(s).
+    """
+    def __init__(self, width, height, bars, strings):
+        self.width = width
+        self.height = height
+        self.bars = bars
+        self.strings = strings
+
+    def drawOn(self, canv, x=0, y=0):
+        """draw on a pdfgen canvas with the lower left corner at x, y; the bars
+        of each kind are drawn as one path"""
+        canv.saveState()
+        canv.translate(x, y)
+        for (fillColor, strokeColor, strokeWidth), runs in self.bars:
+            p = canv.beginPath()
+            for bx, by, bw, bh in runs:
+                p.rect(bx, by, bw, bh)
+            stroke = strokeColor is not None and strokeWidth>0
+            if stroke:
+                canv.setStrokeColor(strokeColor)
+                canv.setLineWidth(strokeWidth)
+            if fillColor is not None:
+                canv.setFillColor(fillColor)
+            canv.drawPath(p, stroke=stroke, fill=fillColor is not None)
+        for A, sx, sy, text, fontName, fontSize, textAnchor, fillColor in self.strings:
+            canv.saveState()
+            canv.transform(*A)
+            canv.setFont(fontName, fontSize)
+            canv.setFillColor(fillColor)
+            if textAnchor=='middle':
+                canv.drawCentredString(sx, sy, text)
+            elif textAnchor=='end':
+                canv.drawRightString(sx, sy, text)
+            else:
+                canv.drawString(sx, sy, text)
+            canv.restoreState()
+        canv.restoreState()
+
+def _flattenBarcode(node, A, bars, strings):
+    from reportlab.graphics.shapes import Group, Rect, String, UserNode, mmult
+    for n in node.contents:
+        if isinstance(n, UserNode):
+            n = n.provideNode()
+        if isinstance(n, Group):
+            _flattenBarcode(n, mmult(A, n.transform), bars, strings)
+        elif isinstance(n, Rect):
+            strokeWidth = n.strokeWidth if n.strokeColor is not None else 0
+            if n.fillColor is None and not strokeWidth: continue
+            a, b, c, d, e, f = A
+            if b or c:
+                raise ValueError('cannot flatten a rotated or skewed barcode rectangle')
+            x, w = a*n.x+e, a*n.width
+            y, h = d*n.y+f, d*n.height
+            if w<0: x, w = x+w, -w
+            if h<0: y, h = y+h, -h
+            bars.setdefault((n.fillColor, n.strokeColor if strokeWidth else None, strokeWidth), []).append((x, y, w, h))
+        elif isinstance(n, String):
+            strings.append((tuple(A), n.x, n.y, n.text, n.fontName, n.fontSize, n.textAnchor, n.fillColor))
+        else:
+            raise ValueError('cannot flatten barcode node %r' % n)
+
+def _mergeRuns(runs, eps=1e-6):
+    runs.sort(key=lambda r: (r[1], r[3], r[0]))
+    merged = [list(runs[0])]
+    for x, y, w, h in runs[1:]:
+        m = merged[-1]
+        if y==m[1] and h==m[3] and abs(m[0]+m[2]-x)<eps:
+            m[2] = x+w-m[0]
+        else:
+            merged.append([x, y, w, h])
+    return [tuple(m) for m in merged]
+
+def _makeBarcodeSymbol(args):
+    codeName, value, options = args
+    d = createBarcodeDrawing(codeName, value=value, **dict(options))
+    bars = {}
+    strings = []
+    _flattenBarcode(d, tuple(d.transform), bars, strings)
+    bars = [(k, _mergeRuns(runs) if not k[2] else runs) for k, runs in bars.items()]
+    return BarcodeSymbol(d.width, d.height, bars, strings)
+
+from collections import OrderedDict
+_symbolCache = OrderedDict()
+_symbolCacheSize = 10000
+
+def _symbolKey(codeName, value, options):
+    try:
+        key = codeName, value, tuple(sorted(options.items()))
+        hash(key)
+        return key
+    except TypeError:
+        return None
+
+def _cacheSymbol(key, symbol):
+    if key is not None:
+        _symbolCache[key] = symbol
+        if len(_symbolCache)>_symbolCacheSize:
+            _symbolCache.popitem(last=False)
+
+def createBarcodeSymbol(codeName, value, **options):
+    """return a BarcodeSymbol for value taking the same options as
+    createBarcodeDrawing; symbols are kept in a cache of recent ones"""
+    key = _symbolKey(codeName, value, options)
+    symbol = _symbolCache.get(key) if key is not None else None
+    if symbol is None:
+        symbol = _makeBarcodeSymbol((codeName, value, options))
+        _cacheSymbol(key, symbol)
+    else:
+        _symbolCache.move_to_end(key)
+    return symbol
+
+def createBarcodeSymbols(codeName, values, processes=None, chunksize=64, **options):
+    """return a list of BarcodeSymbols, one for each of values, taking the same
+    options as createBarcodeDrawing.
+
+    Repeated and recently seen values are encoded just once.  The others are
+    encoded in this process unless processes>1 is given; then they go to a
+    pool of that many workers."""
+    values = list(values)
+    symbols = [None]*len(values)
+    todo = {}   #key --> indices of values to encode
+    other = []  #unhashable values
+    for i, v in enumerate(values):
+        key = _symbolKey(codeName, v, options)
+        if key is None:
+            other.append(i)
+        elif key in _symbolCache:
+            _symbolCache.move_to_end(key)
+            symbols[i] = _symbolCache[key]
+        else:
+            todo.setdefault(key, []).append(i)
+    work = [(codeName, values[I[0]], options) for I in todo.values()]+[(codeName, values[i], options) for i in other]
+    processes = min(processes or 1, len(work))
+    if processes>1:
+        import multiprocessing
+        ctx = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else multiprocessing
+        with ctx.Pool(processes) as pool:
+            made = pool.map(_makeBarcodeSymbol, work, chunksize)
+    else:
+        made = list(map(_makeBarcodeSymbol, work))
+    for (key, I), symbol in zip(todo.items(), made):
+        _cacheSymbol(key, symbol)
+        for i in I:
+            symbols[i] = symbol
+    for i, symbol in zip(other, made[len(todo):]):
+        symbols[i] = symbol
+    return symbols
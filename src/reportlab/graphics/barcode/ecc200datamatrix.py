@@ -86,6 +86,20 @@ ALOGVAL = (
     179, 75, 150, 1
 )
 
+_rsTables = {}     #num_code_words --> products of each byte with the factors
+def _getRSTable(num_code_words):
+    '''the products of each byte with the factors packed into an int with
+    the product with factor j in byte j'''
+    T = _rsTables.get(num_code_words)
+    if T is None:
+        L = [LOGVAL[f] for f in reversed(FACTORS[num_code_words])]
+        T = _rsTables[num_code_words] = [0]+[
+                int.from_bytes(bytes(ALOGVAL[(LOGVAL[t]+l)%255] for l in L),'big')
+                for t in range(1,256)]
+    return T
+
+_placements = {}    #symbol layout --> source of each module, see _get_placement
+
 from reportlab.graphics.barcode.common import Barcode
 class ECC200DataMatrix(Barcode):
     '''This code only supports a Type 12 (44x44) C40 encoded data matrix.
@@ -193,24 +207,24 @@ class ECC200DataMatrix(Barcode):
 
     def _get_reed_solomon_code(self, data, num_code_words):
         """
-        This method is basically verbatim from "huBarcode" which is BSD licensed
+        This method is derived from "huBarcode" which is BSD licensed
         https://github.com/hudora/huBarcode/blob/master/hubarcode/datamatrix/reedsolomon.py
+        The code words are kept in one int and the products come from a table.
         """
-        cw_factors = FACTORS[num_code_words]
-        code_words = [0] * num_code_words
+        T = _getRSTable(num_code_words)
+        shift = 8 * (num_code_words - 1)
+        mask = (1 << (shift + 8)) - 1
+        code_words = 0  # code word j in byte j
 
         for data_word in data:
-            tmp = self._gfsum(data_word, code_words[-1])
-            for j in range(num_code_words - 1, -1, -1):
-                code_words[j] = self._gfproduct(tmp, cw_factors[j])
-                if j > 0:
-                    code_words[j] = self._gfsum(code_words[j - 1], code_words[j])
+            code_words = (code_words << 8 & mask) ^ T[data_word ^ (code_words >> shift)]
 
-        code_words.reverse()
-        return code_words
+        return list(code_words.to_bytes(num_code_words, 'big'))
 
     def _get_next_bits(self, data):
         value = data.pop(0)
+        if isinstance(value, tuple):
+            return list(value)  #labels used by _get_placement
         bits = []
         for i in range(0, 8):
             bits.append(value >> i & 1)
@@ -413,6 +427,35 @@ class ECC200DataMatrix(Barcode):
 
         return merged
 
+    def _place_codewords(self, codewords):
+        matrix = self._create_matrix(codewords)
+        data_regions = self._create_data_regions(matrix)
+        wrapped = self._wrap_data_regions_with_finders(data_regions)
+        merged = self._merge_data_regions(wrapped)
+
+        merged.reverse() # Helpful since PDFs start at bottom left corner
+
+        return merged
+
+    def _get_placement(self):
+        """
+        Return for each row of the symbol the index of each module's bit in
+        the codeword bits (most significant first) followed by 0 and 1 for
+        the fixed modules.  The layout only depends on the symbol size so it
+        is worked out once by placing labels instead of bits.
+        """
+        key = (self.row_modules, self.col_modules, self.row_regions, self.col_regions,
+                self.cw_data, self.cw_ecc)
+        placement = _placements.get(key)
+        if placement is None:
+            n = 8 * (self.cw_data + self.cw_ecc)
+            # labels start at 2 to tell them from the fixed 0 and 1 modules
+            labels = [tuple(range(i, i + 8)) for i in range(2, n + 2, 8)]
+            placement = _placements[key] = [
+                    [x - 2 if x > 1 else n + x for x in row]
+                    for row in self._place_codewords(labels)]
+        return placement
+
     def encode(self):
         if hasattr(self, 'encoded'):
             return self.encoded
@@ -420,12 +463,10 @@ class ECC200DataMatrix(Barcode):
         encoded = self._encode_c40(self.validated)
         encoded += self._get_reed_solomon_code(encoded, self.cw_ecc)
 
-        matrix = self._create_matrix(encoded)
-        data_regions = self._create_data_regions(matrix)
-        wrapped = self._wrap_data_regions_with_finders(data_regions)
-        self.encoded = self._merge_data_regions(wrapped)
-
-        self.encoded.reverse() # Helpful since PDFs start at bottom left corner
+        bits = [value >> i & 1 for value in encoded for i in (7, 6, 5, 4, 3, 2, 1, 0)]
+        bits += (0, 1)
+        get = bits.__getitem__
+        self.encoded = [bytearray(map(get, row)) for row in self._get_placement()]
 
         return self.encoded
 
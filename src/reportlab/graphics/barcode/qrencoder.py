@@ -335,6 +335,14 @@ class QRCode:
         self.makeImpl(False, self.getBestMaskPattern())
 
     def makeImpl(self, test, maskPattern):
+        self.setupFunctionPatterns(test, maskPattern)
+        if (self.dataCache == None):
+            self.dataCache = QRCode.createData(self.version,
+                                               self.errorCorrectLevel,
+                                               self.dataList)
+        self.mapData(self.dataCache, maskPattern)
+
+    def setupFunctionPatterns(self, test, maskPattern):
         self.moduleCount = self.version * 4 + 17
         self.modules = [ [False] * self.moduleCount
                          for x in range(self.moduleCount) ]
@@ -346,11 +354,6 @@ class QRCode:
         self.setupTypeInfo(test, maskPattern)
         if (self.version >= 7):
             self.setupTypeNumber(test)
-        if (self.dataCache == None):
-            self.dataCache = QRCode.createData(self.version,
-                                               self.errorCorrectLevel,
-                                               self.dataList)
-        self.mapData(self.dataCache, maskPattern)
 
     _positionProbePattern = [
         [True,  True,  True,  True,  True,  True,  True],
@@ -381,11 +384,24 @@ class QRCode:
                 self.modules[row+r][col-1] = False
 
     def getBestMaskPattern(self):
+        # the test matrix has blank format information whatever the mask,
+        # so the function patterns and data bits are laid out just once as
+        # one integer per row (column 0 in the top bit) and only the masks
+        # are applied to them
+        self.setupFunctionPatterns(True, 0)
+        if (self.dataCache == None):
+            self.dataCache = QRCode.createData(self.version,
+                                               self.errorCorrectLevel,
+                                               self.dataList)
+        n = self.moduleCount
+        fixed = [QRUtil.rowInt(row) for row in self.modules]
+        pos, bits = self.dataRows(self.dataCache)
         minLostPoint = 0
         pattern = 0
         for i in range(8):
-            self.makeImpl(True, i);
-            lostPoint = QRUtil.getLostPoint(self);
+            rows = [ (f & ~p) | ((d ^ m) & p) for f, p, d, m in
+                     zip(fixed, pos, bits, QRUtil.getMaskRows(i, n)) ]
+            lostPoint = QRUtil.lostPoint(rows, n)
             if (i == 0 or minLostPoint > lostPoint):
                 minLostPoint = lostPoint
                 pattern = i
@@ -501,13 +517,32 @@ class QRCode:
             self._dataBitList = list(self._dataBitIterator(data))
         return iter(self._dataBitList)
 
-    def mapData(self, data, maskPattern):
-        bits = self.dataBitIterator(data)
-        mask = QRUtil.getMask(maskPattern)
+    _dataRows = None
+    def dataRows(self, data):
+        '''return per row integers (column 0 in the top bit) of the data
+        module positions and of the data bits placed in them'''
+        if not self._dataRows or self._dataRows[0] is not data:
+            n = self.moduleCount
+            pos = [0] * n
+            bits = [0] * n
+            dark = self.dataBitIterator(data)
+            for col, row in self.dataPosIterator():
+                b = 1 << (n - 1 - col)
+                pos[row] |= b
+                if next(dark, False):
+                    bits[row] |= b
+            self._dataRows = data, pos, bits
+        return self._dataRows[1:]
 
-        for (col, row), dark in zip_longest(self.dataPosIterator(), bits,
-                                            fillvalue=False):
-            self.modules[row][col] = dark ^ mask(row, col)
+    def mapData(self, data, maskPattern):
+        n = self.moduleCount
+        pos, bits = self.dataRows(data)
+        fmt = '0%db' % n
+        for r, (p, d, m) in enumerate(zip(pos, bits,
+                                          QRUtil.getMaskRows(maskPattern, n))):
+            if p:
+                v = (QRUtil.rowInt(self.modules[r]) & ~p) | ((d ^ m) & p)
+                self.modules[r] = [c == '1' for c in format(v, fmt)]
 
     PAD0 = 0xEC
     PAD1 = 0x11
@@ -557,13 +592,7 @@ class QRCode:
             maxEcCount = max(maxEcCount, ecCount)
             dcdata.append(buffer.buffer[offset:offset+dcCount])
             offset += dcCount
-            rsPoly = QRUtil.getErrorCorrectPolynomial(ecCount)
-            rawPoly = QRPolynomial(dcdata[-1], rsPoly.getLength() - 1)
-            modPoly = rawPoly.mod(rsPoly)
-            rLen = rsPoly.getLength() - 1
-            mLen = modPoly.getLength()
-            ecdata.append([ (modPoly.get(i) if i >= 0 else 0)
-                          for i in range(mLen - rLen, mLen) ])
+            ecdata.append(QRUtil.getErrorCorrectBytes(dcdata[-1], ecCount))
 
         data = [ d for dd in itertools.chain(
                 zip_longest(*dcdata), zip_longest(*ecdata))
@@ -680,6 +709,26 @@ class QRUtil:
     def getMask(cls, maskPattern):
         return cls.maskPattern[maskPattern]
 
+    _maskRows = {}
+    @classmethod
+    def getMaskRows(cls, maskPattern, moduleCount):
+        '''the mask as one integer per row, column 0 in the top bit'''
+        key = maskPattern, moduleCount
+        rows = cls._maskRows.get(key)
+        if rows is None:
+            mask = cls.getMask(maskPattern)
+            # every mask repeats after 12 rows
+            period = [ cls.rowInt([mask(i, j) for j in range(moduleCount)])
+                       for i in range(12) ]
+            rows = cls._maskRows[key] = [ period[i % 12]
+                                          for i in range(moduleCount) ]
+        return rows
+
+    @staticmethod
+    def rowInt(row):
+        '''a row of modules as an integer, column 0 in the top bit'''
+        return int(''.join(['1' if x else '0' for x in row]), 2)
+
     @staticmethod
     def getErrorCorrectPolynomial(errorCorrectLength):
         a = QRPolynomial([1], 0);
@@ -687,6 +736,26 @@ class QRUtil:
             a = a.multiply(QRPolynomial([1, QRMath.gexp(i)], 0) )
         return a
 
+    _ecTables = {}
+    @classmethod
+    def getErrorCorrectBytes(cls, data, errorCorrectLength):
+        '''the Reed-Solomon error correction bytes for data; the remainder
+        of its division by the generator polynomial done with a table of the
+        generator's multiples'''
+        table = cls._ecTables.get(errorCorrectLength)
+        if table is None:
+            g = cls.getErrorCorrectPolynomial(errorCorrectLength).num[1:]
+            glog = [LOG_TABLE[c] for c in g]
+            table = cls._ecTables[errorCorrectLength] = [[0] * len(g)] + [
+                [EXP_TABLE[(LOG_TABLE[f] + c) % 255] for c in glog]
+                for f in range(1, 256) ]
+        r = [0] * errorCorrectLength
+        for d in data:
+            t = table[d ^ r[0]]
+            r.append(0)
+            r = [a ^ b for a, b in zip(r[1:], t)]
+        return r
+
     @classmethod
     def maskScoreRule1vert(cls, modules):
         score = 0
@@ -747,8 +816,48 @@ class QRUtil:
         count = sum(sum(row) for row in modules)
         return 10 * (abs(100 * count // cellCount - 50) // 5)
 
+    _runs = re.compile('0{5,}|1{5,}')
+
+    @classmethod
+    def lostPoint(cls, rows, moduleCount):
+        '''getLostPoint for a matrix given as one integer per row'''
+        n = moduleCount
+        fmt = '0%db' % n
+        S = [format(r, fmt) for r in rows]
+        C = [''.join(c) for c in zip(*S)]
+        lostPoint = 0
+        # LEVEL1 runs of five or more alike, rows and columns
+        for s in itertools.chain(S, C):
+            for m in cls._runs.finditer(s):
+                lostPoint += m.end() - m.start() - 2
+        # LEVEL2 2x2 blocks alike
+        full = (1 << n) - 1
+        for a, b in zip(rows, rows[1:]):
+            same = ~(a ^ b) & full
+            lostPoint += 3 * bin(same & (same >> 1) & ~(a ^ (a >> 1)) &
+                                 (full >> 1)).count('1')
+        # LEVEL3 finder like patterns, scanned as maskScoreRule3hor does;
+        # that never matched the columns (tuples) so neither do we, which
+        # keeps the choice of mask unchanged
+        maxj = n - 11
+        for s in S:
+            j = s.find('10111010000')
+            while 0 <= j < maxj:
+                lostPoint += 40
+                j = s.find('10111010000', j + 11)
+        # LEVEL4 dark proportion
+        count = sum(s.count('1') for s in S)
+        lostPoint += 10 * (abs(100 * count // (n * n) - 50) // 5)
+        return lostPoint
+
     @classmethod
     def getLostPoint(cls, qrCode):
+        return cls.lostPoint([cls.rowInt(row) for row in qrCode.modules],
+                             len(qrCode.modules))
+
+    @classmethod
+    def _getLostPoint(cls, qrCode):
+        '''the original rule by rule scoring'''
         lostPoint = 0;
         # LEVEL1
         lostPoint += cls.maskScoreRule1vert(qrCode.modules)
@@ -1115,8 +1224,16 @@ class QRBitBuffer:
         return ( (self.buffer[bufIndex] >> (7 - index % 8) ) & 1) == 1
 
     def put(self, num, length):
-        for i in range(length):
-            self.putBit( ( (num >> (length - i - 1) ) & 1) == 1)
+        # fill the current byte a bit field at a time
+        while length > 0:
+            bufIndex, used = divmod(self.length, 8)
+            if len(self.buffer) <= bufIndex:
+                self.buffer.append(0)
+            n = min(8 - used, length)
+            length -= n
+            self.buffer[bufIndex] |= ( ( (num >> length) & ((1 << n) - 1) )
+                                       << (8 - used - n) )
+            self.length += n
 
     def getLengthInBits(self):
         return self.length
@@ -42,13 +42,33 @@ from reportlab.lib import normalDate
 from reportlab.graphics.shapes import Drawing, Line, PolyLine, Rect, Group, STATE_DEFAULTS, _textBoxLimits, _rotatedBoxLimits
 from reportlab.graphics.widgetbase import Widget, TypedPropertyCollection
 from reportlab.graphics.charts.textlabels import Label, PMVLabel, XLabel,  DirectDrawFlowable
-from reportlab.graphics.charts.utils import nextRoundNumber
+from reportlab.graphics.charts.utils import nextRoundNumber, _isArray, _numericColumn, _arrayRow
 from reportlab.graphics.widgets.grids import ShadedRect
 from reportlab.lib.colors import Color
 from reportlab.lib.utils import isSeq
 
 # Helpers.
+def _arrayValues(v, x):
+    '''the non NaN values of an array series or of column x of an array row; None for other rows'''
+    if _isArray(v) and v.ndim==1:
+        a = _numericColumn(v)
+    else:
+        a = _arrayRow(v)
+        if a is None: return None
+        a = a[:,x]
+    return a[a==a]
+
 def _findMinMaxValue(V, x, default, func, special=None, extraMinMaxValues=None):
+    if not special and [v for v in V if _isArray(v) or isinstance(v,tuple) and v and _isArray(v[0])]:
+        A = [_arrayValues(v,x) for v in V]
+        R = [float(func(a)) for a in A if a is not None and len(a)]
+        V = [v for v,a in zip(V,A) if a is None]
+        if V:
+            r = _findMinMaxValue(V,x,None,func)
+            if r is not None: R.append(r)
+        if not R: return default
+        r = func(R)
+        return func(func(extraMinMaxValues),r) if extraMinMaxValues else r
     if isSeq(V[0][0]):
         if special:
             f=lambda T,x=x,special=special,func=func: special(T,x,func)
@@ -1503,6 +1523,15 @@ class ValueAxis(_AxisG):
             org += self._length
         return org + sf*(value - self._valueMin)
 
+    def _scaleArray(self, values):
+        '''scale a float array of values at once; NaN is treated like None'''
+        values = values.copy()
+        values[values!=values] = 0
+        if getattr(self.scale,'__func__',None) is ValueAxis.scale:
+            return self.scale(values)
+        import numpy
+        return numpy.array([self.scale(v) for v in values.tolist()],float)
+
 class XValueAxis(_XTicks,ValueAxis):
     "X/value axis"
 
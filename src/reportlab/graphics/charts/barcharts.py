@@ -26,6 +26,7 @@ from reportlab.graphics.charts.axes import XCategoryAxis, YValueAxis, YCategoryA
 from reportlab.graphics.charts.textlabels import BarChartLabel, NoneOrInstanceOfNA_Label
 from reportlab.graphics.charts.areas import PlotArea
 from reportlab.graphics.charts.legends import _objStr
+from reportlab.graphics.charts.utils import _isArray, _numericColumn
 from reportlab import cmp
 
 class BarChartProperties(PropHolder):
@@ -228,6 +229,16 @@ class BarChart(PlotArea):
             #stacked or mixed
             data = []
             def _accumulate(*D):
+                if D and all(_isArray(d) for d in D):
+                    import numpy
+                    A = numpy.zeros((len(D),max(len(d) for d in D)))
+                    for i,d in enumerate(D):
+                        d = _numericColumn(d)
+                        A[i,:len(d)] = numpy.where(d==d,d,0)
+                    neg = A<=-1e-6
+                    data.append(numpy.where(neg,A,0).sum(0))
+                    data.append(numpy.where(neg,0,A).sum(0))
+                    return
                 pdata = max((len(d) for d in D))*[0]
                 ndata = pdata[:]
                 for d in D:
@@ -470,7 +481,7 @@ class BarChart(PlotArea):
                 x = g + xVal
 
             datum = row[colNo]
-            if datum is None:
+            if datum is None or datum!=datum:   #None or NaN
                 height = None
                 y = baseLine
             else:
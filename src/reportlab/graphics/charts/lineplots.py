@@ -5,6 +5,7 @@
 __version__='3.3.0'
 __doc__="""This module defines a very preliminary Line Plot example."""
 
+from time import mktime
 from reportlab.lib import colors
 from reportlab.lib.validators import *
 from reportlab.lib.attrmap import *
@@ -18,7 +19,7 @@ from reportlab.graphics.widgets.markers import uSymbol2Symbol, makeMarker
 from reportlab.graphics.widgets.grids import Grid, DoubleGrid, ShadedPolygon
 from reportlab.pdfbase.pdfmetrics import stringWidth, getFont
 from reportlab.graphics.charts.areas import PlotArea
-from .utils import FillPairedData
+from .utils import FillPairedData, _isArray, _arrayRow
 
 # This might be moved again from here...
 class LinePlotProperties(PropHolder):
@@ -103,6 +104,8 @@ class LinePlot(AbstractLineChart):
         annotations = AttrMapValue(None, desc='list of callables, will be called with self, xscale, yscale.',advancedUsage=1),
         behindAxes = AttrMapValue(isBoolean, desc='If true use separate line group.',advancedUsage=1),
         gridFirst = AttrMapValue(isBoolean, desc='If true use draw grids before axes.',advancedUsage=1),
+        decimation = AttrMapValue(NoneOr(OneOf('minmax','lttb')), desc="If set rows with more points than the plot has columns are reduced: 'minmax' keeps each column's first, lowest, highest and last points, 'lttb' uses largest triangle three buckets. Per point labels and styles then index the kept points.",advancedUsage=1),
+        decimationResolution = AttrMapValue(isNumber, desc='Columns per point of plot width used by decimation.',advancedUsage=1),
         )
 
     def __init__(self):
@@ -143,6 +146,8 @@ class LinePlot(AbstractLineChart):
         self.annotations = []
         self.behindAxes = 0
         self.gridFirst = 0
+        self.decimation = None
+        self.decimationResolution = 1
 
     @property
     def joinedLines(self):
@@ -208,6 +213,10 @@ class LinePlot(AbstractLineChart):
         data = self.data
         n = len(data)
         for rowNo, row in enumerate(data):
+            A = _arrayRow(row)
+            if A is not None:
+                P(list(zip(self.xValueAxis._scaleArray(A[:,0]).tolist(),self.yValueAxis._scaleArray(A[:,1]).tolist())))
+                continue
             if isinstance(row, FillPairedData):
                 other = row.other
                 if 0<=other<n:
@@ -234,6 +243,41 @@ class LinePlot(AbstractLineChart):
         self._pairInFills = len(pairs)
         self._positions = P
 
+    def decimateData(self):
+        '''return the data to be plotted; with decimation set, rows with more
+        points than the configured x axis has columns are reduced'''
+        data = self.data
+        decimation = self.decimation
+        if not decimation: return data
+        res = self.decimationResolution
+        xA = self.xValueAxis
+        n = max(3,int(xA._length*res))
+        xscale = xA.scale
+        yscale = self.yValueAxis.scale
+        D = []
+        for row in data:
+            A = _arrayRow(row)
+            if A is not None:
+                if len(A)>n:
+                    X = xA._scaleArray(A[:,0]).tolist()
+                    if decimation=='lttb':
+                        I = decimateLTTB(X,self.yValueAxis._scaleArray(A[:,1]).tolist(),n)
+                    else:
+                        I = decimateMinMax(X,A[:,1].tolist(),res)
+                    row = A[I]
+            elif len(row)>n:
+                X = [xscale(mktime(mkTimeTuple(d[0]))) if isStr(d[0]) else xscale(d[0]) for d in row]
+                if decimation=='lttb':
+                    I = decimateLTTB(X,[yscale(d[1]) for d in row],n)
+                else:
+                    I = decimateMinMax(X,[d[1] for d in row],res)
+                if isinstance(row,FillPairedData):
+                    row = FillPairedData([row[i] for i in I],row.other)
+                else:
+                    row = [row[i] for i in I]
+            D.append(row)
+        return D
+
     def _innerDrawLabel(self, rowNo, colNo, x, y):
         "Draw a label for a given item in the list."
 
@@ -418,6 +462,16 @@ class LinePlot(AbstractLineChart):
         return g
 
     def draw(self):
+        odata = self.data
+        try:
+            if [row for row in odata if isinstance(row,tuple) and row and _isArray(row[0])]:
+                #array columns become a single n x 2 array per row
+                self.data = [_arrayRow(row) if isinstance(row,tuple) else row for row in odata]
+            return self._draw()
+        finally:
+            self.data = odata
+
+    def _draw(self):
         yA = self.yValueAxis
         xA = self.xValueAxis
         if getattr(self,'_bubblePlot',None):
@@ -436,6 +490,7 @@ class LinePlot(AbstractLineChart):
 
         xA.setPosition(self.x, y, self.width)
         xA.configure(self.data)
+        self.data = self.decimateData()
         self.calcPositions()
         g = Group()
         g.add(self.makeBackground())
@@ -782,7 +837,7 @@ class GridLinePlot(SimpleTimeSeriesPlot):
         drawing.add(lp,'plot')
         return drawing
 
-    def draw(self):
+    def _draw(self):
         xva, yva = self.xValueAxis, self.yValueAxis
         if xva: xva.joinAxis = yva
         if yva: yva.joinAxis = xva
@@ -852,6 +907,7 @@ class GridLinePlot(SimpleTimeSeriesPlot):
                     steps.append(ypos[i+1] - ypos[i])
                 back.grid1.deltaSteps = steps
 
+        self.data = self.decimateData()
         self.calcPositions()
 
         width, height, scaleFactor = self.width, self.height, self.scaleFactor
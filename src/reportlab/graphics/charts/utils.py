@@ -6,6 +6,8 @@ __all__ = (
             'angle2dir',
             'boxCornerCoords',
             'CustomDrawChanger',
+            'decimateLTTB',
+            'decimateMinMax',
             'DrawTimeCollector',
             'FillPairedData',
             'find_good_grid',
@@ -234,6 +236,99 @@ def maverage(data,n=6):
 def pairMaverage(data,n=6):
     return [(x[0],s) for x,s in zip(data, maverage([x[1] for x in data],n))]
 
+def decimateMinMax(X, Y, res=1):
+    '''return the indices of the points (X[i],Y[i]) to keep when each run of
+    points in one column 1/res wide is reduced to its first, lowest, highest
+    and last points; a line through those draws like the line through all.
+    A None in Y ends a run; each run of Nones is kept as its first and last
+    points so the gaps in the line survive'''
+    I = []
+    n = len(X)
+    i = 0
+    while i<n:
+        c = floor(X[i]*res)
+        lo = hi = i
+        ylo = yhi = Y[i]
+        j = i+1
+        if ylo is None:
+            while j<n and Y[j] is None and floor(X[j]*res)==c:
+                j += 1
+        else:
+            while j<n and floor(X[j]*res)==c:
+                y = Y[j]
+                if y is None: break
+                if y<ylo:
+                    ylo = y
+                    lo = j
+                elif y>yhi:
+                    yhi = y
+                    hi = j
+                j += 1
+        I.extend(sorted({i,lo,hi,j-1}))
+        i = j
+    return I
+
+def decimateLTTB(X, Y, n):
+    '''return the indices of n of the points (X[i],Y[i]) chosen by the largest
+    triangle three buckets method; the first and last points are kept'''
+    m = len(X)
+    if n>=m: return list(range(m))
+    if n<3: n = 3
+    every = (m-2)/(n-2)
+    I = [0]
+    a = 0
+    for i in range(n-2):
+        b0 = int(i*every)+1
+        b1 = int((i+1)*every)+1
+        b2 = min(int((i+2)*every)+1,m)
+        #the average of the next bucket
+        k = b2-b1
+        avx = sum(X[b1:b2])/k
+        avy = sum(Y[b1:b2])/k
+        ax = X[a]
+        ay = Y[a]
+        best = -1
+        for j in range(b0,b1):
+            area = abs((ax-avx)*(Y[j]-ay)-(ax-X[j])*(avy-ay))
+            if area>best:
+                best = area
+                a = j
+        I.append(a)
+    I.append(m-1)
+    return I
+
+def _isArray(v):
+    '''true for NumPy arrays and array like columns eg pandas Series'''
+    return hasattr(v,'__array__') and hasattr(v,'ndim')
+
+def _numericColumn(c):
+    '''return array like c as a float array with NaN for missing values;
+    datetimes become epoch seconds and 'dd/mm/yyyy' strings are converted
+    as LinePlot does, but once per distinct string'''
+    import numpy
+    c = numpy.asarray(c)
+    k = c.dtype.kind
+    if k=='M':
+        r = c.astype('datetime64[s]').astype('int64').astype(float)
+        r[numpy.isnat(c)] = numpy.nan
+        return r
+    if k in 'US':
+        u, inv = numpy.unique(c, return_inverse=True)
+        u = numpy.array([mktime(mkTimeTuple(s)) for s in u.astype(str).tolist()],float)
+        return u[inv].reshape(c.shape)
+    if k=='O':
+        c = numpy.where(numpy.equal(c,None),numpy.nan,c)
+    return c.astype(float,copy=False)
+
+def _arrayRow(row):
+    '''return a data row given as an n x k array, or as a tuple of k array
+    columns, as an n x k float array; None for any other row'''
+    if _isArray(row):
+        return _numericColumn(row) if row.ndim==2 else None
+    if isinstance(row,tuple) and row and all(_isArray(c) and c.ndim==1 for c in row):
+        import numpy
+        return numpy.column_stack([_numericColumn(c) for c in row])
+
 class DrawTimeCollector:
     '''
     generic mechanism for collecting information about nodes at the time they are about to be drawn
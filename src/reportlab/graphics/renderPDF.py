@@ -24,10 +24,69 @@ from reportlab import rl_config
 from reportlab.graphics.renderbase import Renderer, getStateDelta, renderScaledDrawing, STATE_DEFAULTS
 
 # the main entry point for users...
-def draw(drawing, canvas, x, y, showBoundary=rl_config._unset_):
-    """As it says"""
+_FORM_BBOX = (-14400,-14400,14400,14400)    #forms must not clip the drawing
+def draw(drawing, canvas, x, y, showBoundary=rl_config._unset_, asForm=None, rasterDPI=None):
+    """As it says.
+
+    If asForm (default rl_config.drawingsAsForms) is true the drawing is
+    rendered into a form XObject named by a hash of its content and placed
+    with doForm, so identical drawings are stored only once per document.
+
+    If rasterDPI (default the drawing's rasterDPI attribute) is set the
+    drawing is placed as an image rasterized at that resolution; see
+    drawAsImage.
+    """
+    if rasterDPI is None: rasterDPI = getattr(drawing,'rasterDPI',None)
+    if rasterDPI:
+        drawAsImage(drawing, canvas, x, y, dpi=rasterDPI, showBoundary=showBoundary)
+        return
     R = _PDFRenderer()
-    R.draw(renderScaledDrawing(drawing), canvas, x, y, showBoundary=showBoundary)
+    drawing = renderScaledDrawing(drawing)
+    if asForm is None: asForm = rl_config.drawingsAsForms
+    if asForm:
+        canvas.beginForm(None,*_FORM_BBOX)
+        try:
+            R.draw(drawing, canvas, 0, 0, showBoundary=showBoundary)
+        finally:
+            name = canvas.endForm()
+        canvas.saveState()
+        canvas.translate(x,y)
+        canvas.doForm(name)
+        canvas.restoreState()
+    else:
+        R.draw(drawing, canvas, x, y, showBoundary=showBoundary)
+
+def drawAsImage(drawing, canvas, x, y, dpi=72, showBoundary=rl_config._unset_, **kwds):
+    """Place the drawing as an image rasterized by renderPM at dpi; the extra
+    keywords are passed to renderPM.drawToCachedPNG.
+
+    Rasterized drawings are cached by a digest of their content and each
+    image is stored once per document in a form named by that digest.
+    """
+    from reportlab.graphics.renderPM import drawToCachedPNG
+    from reportlab.lib.utils import ImageReader
+    from io import BytesIO
+    drawing = renderScaledDrawing(drawing)
+    w, h = drawing.width, drawing.height
+    key, png = drawToCachedPNG(drawing, dpi=dpi, **kwds)
+    if key is None:
+        canvas.drawImage(ImageReader(BytesIO(png)), x, y, w, h)
+    else:
+        name = 'RLR' + key
+        if not canvas._doc.hasForm(name):
+            canvas.beginForm(name, 0, 0, w, h)
+            canvas.drawImage(ImageReader(BytesIO(png)), 0, 0, w, h)
+            canvas.endForm()
+        canvas.saveState()
+        canvas.translate(x, y)
+        canvas.doForm(name)
+        canvas.restoreState()
+    if showBoundary is rl_config._unset_: showBoundary = rl_config.showBoundary
+    if showBoundary:
+        if hasattr(canvas,'drawBoundary'):
+            canvas.drawBoundary(showBoundary, x, y, w, h)
+        else:
+            canvas.rect(x, y, w, h)
 
 class _PDFRenderer(Renderer):
     """This draws onto a PDF document.  It needs to be a class
@@ -58,6 +117,27 @@ class _PDFRenderer(Renderer):
         if not (isinstance(node, Path) and node.isClipPath):
             self._canvas.restoreState()
 
+    def _dlBegin(self, items, group):
+        self._canvas.saveState()
+        if items: self.applyStateChanges(dict(items), {})
+
+    def _dlSet(self, items):
+        self.applyStateChanges(dict(items), {})
+
+    def _dlEnd(self, items, group, token):
+        self._canvas.restoreState()
+        for k, v in items:
+            if k=='fillColor':
+                self._fill = 0 if v is None else 1
+            elif k=='strokeColor':
+                self._stroke = 0 if v is None else 1
+
+    def _dlNode(self, anode, group):
+        #drawNode leaves these as the node set them
+        fill, stroke = self._fill, self._stroke
+        Renderer._dlNode(self, anode, group)
+        self._fill, self._stroke = fill, stroke
+
     def drawRect(self, rect):
         if rect.rx == rect.ry == 0:
             #plain old rectangle
@@ -274,14 +354,16 @@ class _PDFRenderer(Renderer):
 
 from reportlab.platypus import Flowable
 class GraphicsFlowable(Flowable):
-    """Flowable wrapper around a Pingo drawing"""
-    def __init__(self, drawing):
+    """Flowable wrapper around a Pingo drawing; if rasterDPI is set the
+    drawing is placed as a cached image rasterized at that resolution"""
+    def __init__(self, drawing, rasterDPI=None):
         self.drawing = drawing
         self.width = self.drawing.width
         self.height = self.drawing.height
+        self.rasterDPI = rasterDPI
 
     def draw(self):
-        draw(self.drawing, self.canv, 0, 0)
+        draw(self.drawing, self.canv, 0, 0, rasterDPI=self.rasterDPI)
 
 def drawToFile(d, fn, msg="", showBoundary=rl_config._unset_, autoSize=1, **kwds):
     """Makes a one-page PDF with just the drawing.
@@ -13,11 +13,11 @@ Other functions let you create a PM drawing as string or into a PM buffer.
 Execute the script to see some test drawings."""
 
 from reportlab.graphics.shapes import *
-from reportlab.graphics.renderbase import getStateDelta, renderScaledDrawing
+from reportlab.graphics.renderbase import getStateDelta, renderScaledDrawing, compileDrawing, DisplayList
 from reportlab.pdfbase.pdfmetrics import getFont, unicode2T1, stringWidth
 from reportlab.pdfbase.ttfonts import ShapedStr, shapeFragWord
 from reportlab.pdfgen.textobject import bidiShapedText
-from reportlab.lib.utils import isUnicode, asUnicode
+from reportlab.lib.utils import isUnicode, asUnicode, _digester
 from reportlab.lib.abag import ABag
 from reportlab.lib.colors import toColor, white
 from reportlab import rl_config
@@ -25,6 +25,7 @@ from .utils import setFont as _setFont, RenderPMError
 
 import os, sys
 from io import BytesIO, StringIO
+from collections import OrderedDict
 from math import sin, cos, pi, ceil
 
 def _getPMBackend(backend=None):
@@ -86,9 +87,36 @@ class _PMRenderer(Renderer):
         self._tracker.push(deltas)
         self.applyState()
 
-    def applyState(self):
+    def replay(self, ops):
+        #the display list's transforms are relative to where it is drawn
+        self._dlCTM = self._tracker.getCTM()
+        try:
+            Renderer.replay(self, ops)
+        finally:
+            del self._dlCTM
+
+    def _dlBegin(self, items, group):
+        self._dlSet(items)
+
+    def _dlSet(self, items):
+        self.applyState(mmult(self._dlCTM,self._tracker.getCTM()))
+
+    def _dlEnd(self, items, group, token):
+        self._dlSet(items)
+
+    def _dlNode(self, anode, group):
+        #drawNode expects the absolute matrix
+        combined = self._tracker._combined
+        state = combined[-1]
+        combined[-1] = dict(state, ctm=mmult(self._dlCTM,state['ctm']))
+        try:
+            Renderer._dlNode(self, anode, group)
+        finally:
+            combined[-1] = state
+
+    def applyState(self, ctm=None):
         s = self._tracker.getState()
-        self._canvas.ctm = s['ctm']
+        self._canvas.ctm = s['ctm'] if ctm is None else ctm
         self._canvas.strokeWidth = s['strokeWidth']
         alpha = s['strokeOpacity']
         if alpha is not None:
@@ -337,6 +365,18 @@ class PMCanvas:
             setattr(self,k,A[k])
         gs.setFont(fN,fS)
 
+    def clear(self,bg=None):
+        '''paint the whole pixmap with bg (default the background it was created with)
+        and drop any clipping so the canvas can be drawn on again'''
+        if bg is None: bg = self._bg
+        gs = self._gs
+        if self._clipPaths:
+            del self._clipPaths[:]
+            gs.clipPathClear()
+        gs.ctm = (1,0,0,1,0,0)
+        self.setFillColor(bg)
+        self.rect(0,0,gs.width,gs.height,stroke=0,fill=1)
+
     def toPIL(self):
         im = _getImage().new('RGBA' if self._backend=='rlPyCairo' and getattr(self,'_fmt')=='ARGB32' else 'RGB', size=(self._gs.width, self._gs.height))
         im.frombytes(self._gs.pixBuf)
@@ -725,6 +765,118 @@ def drawToString(d,fmt='GIF', dpi=72, bg=0xffffff, configPIL=None, showBoundary=
 
 save = drawToFile
 
+_rasterCache = OrderedDict()
+def drawToCachedPNG(d, dpi=72, bg=0xffffff, cacheDir=None, backend=rl_config.renderPMBackend, backendFmt='RGB', **kwds):
+    '''return key, png with png the drawing rasterized as PNG bytes and key a name
+    made from a digest of its display list and the options, or None if the drawing
+    has no stable digest (it is then rasterized every time).
+
+    The rl_config.rasterCacheSize most recently used images are kept in memory;
+    if cacheDir (default rl_config.rasterCacheDir) is set they are also kept
+    there as key.png for later runs.'''
+    dl = d if isinstance(d,DisplayList) else compileDrawing(d)
+    key = dl.digest()
+    if key is None:
+        return None, drawToString(dl, fmt='PNG', dpi=dpi, bg=bg, backend=backend, backendFmt=backendFmt, **kwds)
+    key = _digester(repr((key, dpi, bg, backend, backendFmt, sorted(kwds.items()))))
+    png = _rasterCache.get(key)
+    if png is not None:
+        _rasterCache.move_to_end(key)
+        return key, png
+    if cacheDir is None: cacheDir = rl_config.rasterCacheDir
+    fn = os.path.join(cacheDir, key+'.png') if cacheDir else None
+    if fn and os.path.isfile(fn):
+        with open(fn,'rb') as f:
+            png = f.read()
+    else:
+        png = drawToString(dl, fmt='PNG', dpi=dpi, bg=bg, backend=backend, backendFmt=backendFmt, **kwds)
+        if fn:
+            tfn = '%s.%d' % (fn,os.getpid())
+            with open(tfn,'wb') as f:
+                f.write(png)
+            os.replace(tfn,fn)  #others never see a partial file
+    if rl_config.rasterCacheSize>0:
+        _rasterCache[key] = png
+        while len(_rasterCache)>rl_config.rasterCacheSize:
+            _rasterCache.popitem(last=False)
+    return key, png
+
+_batchOptions = None
+_batchCanvases = {}
+def _batchInit(options):
+    global _batchOptions
+    _batchOptions = options
+    _batchCanvases.clear()
+
+def _batchCanvas(w, h, dpi, bg, backend, backendFmt):
+    '''return a cleared canvas of the right size, reusing one left by an earlier drawing
+    if it is opaque (a transparent one cannot be cleared by painting over it)'''
+    key = w, h, dpi, bg, backend, backendFmt
+    c = _batchCanvases.pop(key,None)
+    if c is None:
+        return key, PMCanvas(w, h, dpi=dpi, bg=bg, backend=backend, backendFmt=backendFmt)
+    c.clear()
+    return key, c
+
+def _batchDraw(item):
+    fmt, dpi, bg, configPIL, showBoundary, backend, backendFmt, kwds = _batchOptions
+    fn = None
+    if isinstance(item,tuple):
+        item, fn = item
+    d = renderScaledDrawing(item if isinstance(item,Drawing) else item())
+    key, c = _batchCanvas(d.width, d.height, dpi, bg, backend, backendFmt)
+    size = c._gs.width, c._gs.height
+    draw(d, c, 0, 0, showBoundary=showBoundary, **kwds)
+    gs = c._gs
+    f = BytesIO() if fn is None else fn
+    if fmt=='RAW':
+        if hasattr(f,'write'):
+            f.write(gs.pixBuf)
+        else:
+            with open(f,'wb') as o:
+                o.write(gs.pixBuf)
+    elif fmt=='PNG' and not configPIL and hasattr(getattr(gs,'surface',None),'write_to_png'):
+        gs.surface.write_to_png(f)
+    else:
+        c.configPIL = configPIL.copy() if configPIL else None   #saveToFile consumes its options
+        c.saveToFile(f,fmt)
+    if (gs.width,gs.height)==size and _pycairoFmtsMap.get(backendFmt.upper(),backendFmt)=='RGB24':
+        if len(_batchCanvases)>=8: _batchCanvases.clear()
+        _batchCanvases[key] = c
+    return f.getvalue() if fn is None else fn
+
+def drawBatch(drawings, fmt='PNG', dpi=72, bg=0xffffff, configPIL=None, showBoundary=rl_config._unset_,
+        backend=rl_config.renderPMBackend, backendFmt='RGB', processes=None, chunksize=1, **kwds):
+    '''rasterize many drawings, yielding the results in order.
+
+    Each item of drawings is a Drawing, a callable (eg a Drawing class or a
+    module level function) returning one, or a (drawing or callable, fn) pair.
+    Items with a file name are saved to it and yield it; other items
+    yield the image as bytes.  fmt may be any drawToFile format or 'RAW' for
+    the bare pixel buffer; PNG and RAW results are written straight from the
+    backend unless configPIL needs PIL.
+
+    The drawings are rendered in this process unless processes>1 is given;
+    then they go to a pool of that many workers and they and the callables
+    are pickled to get there, so callables are cheaper to send.  Opaque
+    canvases of the same size are reused.'''
+    options = fmt.upper(), dpi, bg, configPIL, showBoundary, backend, backendFmt, kwds
+    if processes and processes>1:
+        import multiprocessing
+        ctx = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else multiprocessing
+        with ctx.Pool(processes, initializer=_batchInit, initargs=(options,)) as pool:
+            yield from pool.imap(_batchDraw, drawings, chunksize)
+    else:
+        global _batchOptions
+        saved = _batchOptions
+        _batchInit(options)
+        try:
+            for item in drawings:
+                yield _batchDraw(item)
+        finally:
+            _batchOptions = saved
+            _batchCanvases.clear()
+
 def test(outDir='pmout', shout=False):
     def ext(x):
         if x=='tiff': x='tif'
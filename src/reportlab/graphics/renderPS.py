@@ -754,6 +754,22 @@ class _PSRenderer(Renderer):
             if k in self._restores:
                 setattr(self._canvas,self._restores[k],v)
 
+    def _dlBegin(self, items, group):
+        color = self._canvas._color
+        self._canvas.saveState()
+        if items: self.applyStateChanges(dict(items), {})
+        return color
+
+    def _dlSet(self, items):
+        self.applyStateChanges(dict(items), {})
+
+    def _dlEnd(self, items, group, color):
+        self._canvas.restoreState()
+        self._canvas._color = color
+        for k, v in items:
+            if k in self._restores:
+                setattr(self._canvas,self._restores[k],v)
+
 ##  _restores = {'stroke':'_stroke','stroke_width': '_lineWidth','stroke_linecap':'_lineCap',
 ##              'stroke_linejoin':'_lineJoin','fill':'_fill','font_family':'_font',
 ##              'font_size':'_fontSize'}
@@ -21,7 +21,7 @@ from reportlab.lib.utils import RLString, isUnicode, isBytes
 from reportlab.pdfgen.canvas import FILL_EVEN_ODD, FILL_NON_ZERO
 from .renderPM import _getImage
 
-from xml.dom import getDOMImplementation
+from xml.dom.expatbuilder import parseString
 
 ### some constants ###
 
@@ -44,9 +44,9 @@ def drawToString(d, showBoundary=rl_config.showBoundary,**kwds):
 
 def drawToFile(d, fn, showBoundary=rl_config.showBoundary,**kwds):
     d = renderScaledDrawing(d)
-    c = SVGCanvas((d.width, d.height),**kwds)
+    c = SVGCanvas((d.width, d.height),fn=fn,**kwds)
     draw(d, c, 0, 0, showBoundary=showBoundary)
-    c.save(fn)
+    c.save()
 
 def draw(drawing, canvas, x=0, y=0, showBoundary=rl_config.showBoundary):
     """As it says."""
@@ -97,6 +97,23 @@ def transformNode(doc, newTag, node=None, **attrDict):
 
     return newNode
 
+def _xmlEscape(s):
+    return s.replace("&", "&amp;").replace("<", "&lt;").replace('"', "&quot;").replace(">", "&gt;")
+
+def _xmlAttrs(attrs):
+    return ''.join([' %s="%s"' % (k,_xmlEscape(str(v))) for k,v in attrs.items()])
+
+def _stripIndent(node):
+    "remove the whitespace between the elements below node"
+    C = node.childNodes
+    if len(C)>1:
+        for c in list(C):
+            if c.nodeType==c.TEXT_NODE and not c.data.strip():
+                node.removeChild(c)
+    for c in C:
+        if c.nodeType==c.ELEMENT_NODE:
+            _stripIndent(c)
+
 class EncodedWriter(list):
     '''
     EncodedWriter(encoding) assumes .write will be called with
@@ -149,8 +166,14 @@ def py_fp_str(*args):
 
 ### classes ###
 class SVGCanvas:
-    def __init__(self, size=(300,300), encoding='utf-8', verbose=0, bom=False, **kwds):
+    def __init__(self, size=(300,300), encoding='utf-8', verbose=0, bom=False, fn=None, **kwds):
         '''
+        The document is written as it is drawn; if fn (a file name or object
+        with a write method) is given it goes straight there and save() just
+        finishes it, otherwise it is kept until save(fn). Without fn the doc,
+        svg, groupTree and currGroup DOM attributes of earlier versions are
+        available; using them switches the canvas to building a minidom tree.
+
         verbose = 0 >0 means do verbose stuff
         useClip = False True means don't use a clipPath definition put the global clip into the clip property
                         to get around an issue with safari
@@ -189,24 +212,29 @@ class SVGCanvas:
             self.fp_str = py_fp_str
         self.cfp_str = lambda *args: self.fp_str(*args).replace(' ',',')
 
-        implementation = getDOMImplementation('minidom')
         #Based on official example here http://www.w3.org/TR/SVG10/linking.html want:
         #<!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 20010904//EN" 
         #  "http://www.w3.org/TR/2001/REC-SVG-20010904/DTD/svg10.dtd">
-        #Thus,
-        #doctype = implementation.createDocumentType("svg",
-        #          "-//W3C//DTD SVG 20010904//EN",
-        #          "http://www.w3.org/TR/2001/REC-SVG-20010904/DTD/svg10.dtd")
         #
         #However, putting that example through http://validator.w3.org/ recommends:
         #<!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 1.0//EN" 
         #  "http://www.w3.org/TR/2001/REC-SVG-20010904/DTD/svg10.dtd">
         #So we'll use that for our SVG 1.0 output.
-        doctype = implementation.createDocumentType("svg",
-                  "-//W3C//DTD SVG 1.0//EN",
-                  "http://www.w3.org/TR/2001/REC-SVG-20010904/DTD/svg10.dtd")
-        self.doc = implementation.createDocument(None,"svg",doctype)
-        self.svg = self.doc.documentElement
+        self._fn = fn
+        if fn is None:
+            self._out = EncodedWriter(self.encoding,bom=bom)
+        else:
+            self._out = fn if hasattr(fn,'write') else open(fn, 'w',encoding=self.encoding)
+            if bom and self.encoding in EncodedWriter.BOMS and self.encoding not in ('utf-16','utf-32'):
+                self._out.write('\ufeff')
+        self._write = self._out.write
+        #the open elements as [tag, attributes, start tag written]
+        self._elements = []
+        self._dom = None        #see _getDOM
+        self._scaleGroupId = scaleGroupId
+        self._write('<?xml version="1.0" encoding="%s"?>%s\n' % (self.encoding,self.extraXmlDecl))
+        self._write("<!DOCTYPE svg\n  PUBLIC '-//W3C//DTD SVG 1.0//EN'\n"
+                "  'http://www.w3.org/TR/2001/REC-SVG-20010904/DTD/svg10.dtd'>\n")
         svgAttrs = dict(
                     width = str(size[0]),
                     height=str(self.height),
@@ -221,18 +249,9 @@ class SVGCanvas:
         svgAttrs['fill-rule'] = _fillRuleMap[self._fillMode]
         svgAttrs["xmlns:xlink"] = "http://www.w3.org/1999/xlink"
         svgAttrs.update(kwds.pop('svgAttrs',{}))
-        for k,v in svgAttrs.items():
-            self.svg.setAttribute(k,v)
-
-        title = self.doc.createElement('title')
-        text = self.doc.createTextNode('...')
-        title.appendChild(text)
-        self.svg.appendChild(title)
-
-        desc = self.doc.createElement('desc')
-        text = self.doc.createTextNode('...')
-        desc.appendChild(text)
-        self.svg.appendChild(desc)
+        self._begin('svg',svgAttrs)
+        self._element('title',{},'...')
+        self._element('desc',{},'...')
 
         self.setFont(STATE_DEFAULTS['fontName'], STATE_DEFAULTS['fontSize'])
         self.setStrokeColor(STATE_DEFAULTS['strokeColor'])
@@ -242,32 +261,142 @@ class SVGCanvas:
 
         if not useClip:
             # Add a rectangular clipping path identical to view area.
-            clipPath = transformNode(self.doc, "clipPath", id="clip")
-            clipRect = transformNode(self.doc, "rect", x=0, y=0,
-                width=self.width, height=self.height)
-            clipPath.appendChild(clipRect)
-            self.svg.appendChild(clipPath)
+            self._begin('clipPath',dict(id="clip"))
+            self._element('rect',dict(x=0, y=0, width=self.width, height=self.height))
+            self._end()
             gtkw = dict(style="clip-path: url(#clip)")
         else:
             gtkw = dict(clip="0 0 %d %d" % (self.width,self.height))
 
-        self.groupTree = transformNode(self.doc, "g",
-            id="group",
+        if scaleGroupId:
+            self._begin('g',dict(id=scaleGroupId, transform="scale(1,1)"))
+        self._begin('g',dict(id="group",
             transform="scale(1,-1) translate(0,-%d)" % self.height,
-            **gtkw
-            )
+            **gtkw))
 
-        if scaleGroupId:
-            self.scaleTree = transformNode(self.doc, "g", id=scaleGroupId, transform="scale(1,1)")
-            self.scaleTree.appendChild(self.groupTree)
-            self.svg.appendChild(self.scaleTree)
+    def save(self, fn=None):
+        if self._dom is not None:
+            self._saveDOM(fn)
+            return
+        while self._elements:
+            self._end()
+        out = self._out
+        if self._fn is not None:
+            if fn is not None and fn is not self._fn:
+                raise ValueError('SVGCanvas was created to write to %r not %r' % (self._fn,fn))
+            if out is not self._fn:
+                out.close()
+            return
+
+        if hasattr(fn,'write'):
+            f = fn
         else:
-            self.svg.appendChild(self.groupTree)
-        self.currGroup = self.groupTree
+            f = open(fn, 'w',encoding=self.encoding)
+        f.write(''.join(out))
+        if f is not fn:
+            f.close()
 
-    def save(self, fn=None):
+    ### output ###
+    def _begin(self, tag, attrs):
+        "start an element whose children follow"
+        if self._dom is not None:
+            node = transformNode(self._dom, tag, **attrs)
+            self._nodes[-1].appendChild(node)
+            self._nodes.append(node)
+            return
+        self._startChild()
+        self._elements.append([tag,attrs,False])
+
+    def _end(self):
+        "finish the innermost open element"
+        if self._dom is not None:
+            self._nodes.pop()
+            return
+        tag, attrs, started = self._elements.pop()
+        indent = '\t'*len(self._elements)
+        if started:
+            self._write('%s</%s>\n' % (indent,tag))
+        else:
+            self._write('%s<%s%s/>\n' % (indent,tag,_xmlAttrs(attrs)))
+
+    def _startChild(self):
+        "the innermost element is getting a child so write its start tag if need be"
+        E = self._elements
+        if E:
+            e = E[-1]
+            if not e[2]:
+                e[2] = True
+                self._write('%s<%s%s>\n' % ('\t'*(len(E)-1),e[0],_xmlAttrs(e[1])))
+        return '\t'*len(E)
+
+    def _element(self, tag, attrs, text=None, link_info=None):
+        "write a complete element, optionally wrapped in a link"
+        if self._dom is not None:
+            doc = self._dom
+            node = transformNode(doc, tag, **attrs)
+            if text is not None:
+                node.appendChild(doc.createTextNode(text))
+            if link_info:
+                assert isinstance(link_info, dict)
+                link = transformNode(doc, "a", **link_info)
+                link.appendChild(node)
+                node = link
+            self._nodes[-1].appendChild(node)
+            return
+        indent = self._startChild()
+        if link_info:
+            assert isinstance(link_info, dict)
+            self._write('%s<a%s>\n' % (indent,_xmlAttrs(link_info)))
+            self._write(self._tag(indent+'\t',tag,attrs,text))
+            self._write('%s</a>\n' % indent)
+        else:
+            self._write(self._tag(indent,tag,attrs,text))
+
+    @staticmethod
+    def _tag(indent, tag, attrs, text):
+        if text is None:
+            return '%s<%s%s/>\n' % (indent,tag,_xmlAttrs(attrs))
+        return '%s<%s%s>%s</%s>\n' % (indent,tag,_xmlAttrs(attrs),_xmlEscape(text),tag)
+
+    def _setGroupTransform(self, t):
+        if self._dom is not None:
+            node = self._nodes[-1]
+            node.setAttribute("transform", "%s %s" % (node.getAttribute("transform"), t))
+            return
+        e = self._elements[-1]
+        if e[2]:
+            #the group already has content so the transform starts a nested group
+            self._begin('g',dict(transform=t))
+        else:
+            e[1]['transform'] = '%s %s' % (e[1].get('transform',''), t)
+
+    ### DOM compatibility ###
+    def _getDOM(self):
+        """return the minidom document, building it from the output so far
+        the first time; after that drawing adds nodes to it"""
+        if self._dom is None:
+            if self._fn is not None:
+                raise AttributeError('%s writing to %r has no DOM' % (self.__class__.__name__,self._fn))
+            E = self._elements
+            text = ''.join(self._out).lstrip('\ufeff')
+            if self.extraXmlDecl:
+                text = text.replace('?>'+self.extraXmlDecl,'?>',1)    #added back by _saveDOM
+            text = [text]
+            if E and not E[-1][2]:
+                text.append('<%s%s>' % (E[-1][0],_xmlAttrs(E[-1][1])))
+            text.extend(['</%s>' % e[0] for e in reversed(E)])
+            doc = parseString(''.join(text).encode(self.encoding),namespaces=False)
+            _stripIndent(doc.documentElement)
+            nodes = [doc.documentElement]
+            for e in E[1:]:
+                nodes.append([c for c in nodes[-1].childNodes if c.nodeType==c.ELEMENT_NODE][-1])
+            self._nodes = nodes
+            self._dom = doc
+        return self._dom
+
+    def _saveDOM(self, fn):
         writer = EncodedWriter(self.encoding,bom=self.bom)
-        self.doc.writexml(writer,addindent="\t",newl="\n",encoding=self.encoding)
+        self._dom.writexml(writer,addindent="\t",newl="\n",encoding=self.encoding)
 
         if hasattr(fn,'write'):
             f = fn
@@ -282,6 +411,40 @@ class SVGCanvas:
         if f is not fn:
             f.close()
 
+    @property
+    def doc(self):
+        return self._getDOM()
+
+    @property
+    def svg(self):
+        return self._getDOM().documentElement
+
+    @property
+    def groupTree(self):
+        for node in self._getDOM().getElementsByTagName('g'):
+            if node.getAttribute('id')=='group':
+                return node
+
+    @property
+    def scaleTree(self):
+        if not self._scaleGroupId:
+            raise AttributeError('%s has no scaleTree without scaleGroupId' % self.__class__.__name__)
+        return self.groupTree.parentNode
+
+    @property
+    def currGroup(self):
+        self._getDOM()
+        return self._nodes[-1]
+
+    @currGroup.setter
+    def currGroup(self, node):
+        doc = self._getDOM()
+        nodes = []
+        while node is not None and node is not doc:
+            nodes.insert(0,node)
+            node = node.parentNode
+        self._nodes = nodes
+
     ### helpers ###
     def NOTUSED_stringWidth(self, s, font=None, fontSize=None):
         """Return the logical width of the string if it were drawn
@@ -336,12 +499,7 @@ class SVGCanvas:
         xtra = {}
         if fillMode:
             xtra['fill-rule'] = _fillRuleMap[fillMode]
-        path = transformNode(self.doc, "path",
-            d=self.path, style=self._formatStyle(styles),
-            )
-        if link_info :
-            path = self._add_link(path, link_info)
-        self.currGroup.appendChild(path)
+        self._element("path", dict(d=self.path, style=self._formatStyle(styles)), link_info=link_info)
         self.path = ''
 
 
@@ -356,7 +514,7 @@ class SVGCanvas:
         vals = {0:'miter', 1:'round', 2:'bevel'}
         if self._lineJoin != v:
             self._lineJoin = v
-            self.style['stroke-linecap'] = vals[v]
+            self.style['stroke-linejoin'] = vals[v]
 
     def setDash(self, array=[], phase=0):
         """Two notations. Pass two numbers, or an array and phase."""
@@ -424,12 +582,6 @@ class SVGCanvas:
                 style['font-family'] = font
             style['font-size'] = self.fontSizer(fontSize)
 
-    def _add_link(self, dom_object, link_info) :
-        assert isinstance(link_info, dict)
-        link = transformNode(self.doc, "a", **link_info)
-        link.appendChild(dom_object)
-        return link
-
     ### shapes ###
     def rect(self, x1,y1, x2,y2, rx=8, ry=8, link_info=None, **_svgAttrs):
         "Draw a rectangle between x1,y1 and x2,y2."
@@ -438,15 +590,8 @@ class SVGCanvas:
 
         x = min(x1,x2)
         y = min(y1,y2)
-        kwds = {}
-        rect = transformNode(self.doc, "rect",
-            x=x, y=y, width=max(x1,x2)-x, height=max(y1,y2)-y,
-            style=self._formatStyle(AREA_STYLES),**_svgAttrs)
-
-        if link_info :
-            rect = self._add_link(rect, link_info)
-
-        self.currGroup.appendChild(rect)
+        self._element("rect", dict(x=x, y=y, width=max(x1,x2)-x, height=max(y1,y2)-y,
+            style=self._formatStyle(AREA_STYLES),**_svgAttrs), link_info=link_info)
 
     def roundRect(self, x1,y1, x2,y2, rx=8, ry=8, link_info=None, **_svgAttrs):
         """Draw a rounded rectangle between x1,y1 and x2,y2.
@@ -455,14 +600,8 @@ class SVGCanvas:
         These should have x1<x2, y1<y2, rx>0, and ry>0.
         """
 
-        rect = transformNode(self.doc, "rect",
-            x=x1, y=y1, width=x2-x1, height=y2-y1, rx=rx, ry=ry,
-            style=self._formatStyle(AREA_STYLES), **_svgAttrs)
-
-        if link_info:
-            rect = self._add_link(rect, link_info)
-
-        self.currGroup.appendChild(rect)
+        self._element("rect", dict(x=x1, y=y1, width=x2-x1, height=y2-y1, rx=rx, ry=ry,
+            style=self._formatStyle(AREA_STYLES), **_svgAttrs), link_info=link_info)
 
     def drawString(self, s, x, y, angle=0, link_info=None, text_anchor='left', textRenderMode=0, **_svgAttrs):
         if textRenderMode==3: return    #invisible
@@ -496,18 +635,9 @@ class SVGCanvas:
                 st += " stroke:none;"
             #if textRenderMode>=4:
             #   _gstate_clipPathSetOrAddself, -1, 1, 0  /*we are adding*/
-            text = transformNode(self.doc, "text",
-                x=x, y=y, style=st,
+            self._element("text", dict(x=x, y=y, style=st,
                 transform="translate(0,%d) scale(1,-1)" % (2*y),
-                **_svgAttrs
-                )
-            content = self.doc.createTextNode(s)
-            text.appendChild(content)
-
-            if link_info:
-                text = self._add_link(text, link_info)
-    
-            self.currGroup.appendChild(text)
+                **_svgAttrs), s, link_info=link_info)
 
     def drawCentredString(self, s, x, y, angle=0, text_anchor='middle',
             link_info=None, textRenderMode=0, **_svgAttrs):
@@ -522,58 +652,39 @@ class SVGCanvas:
                 textRenderMode=textRenderMode, **_svgAttrs)
 
     def comment(self, data):
-        "Add a comment."
-
-        comment = self.doc.createComment(data)
-        # self.currGroup.appendChild(comment)
+        "Add a comment (not written)."
 
     def drawImage(self, image, x, y, width, height, embed=True):
         buf = BytesIO()
         image.save(buf,'png')
         buf = asNative(base64.b64encode(buf.getvalue()))
-        self.currGroup.appendChild(
-                transformNode(self.doc,'image',
+        self._element('image', dict(
                     x=x,y=y,width=width,height=height,
                     href="data:image/png;base64,"+buf,
                     transform="matrix(%s)" % self.cfp_str(1,0,0,-1,0,height+2*y),
-                    )
-                )
+                    ))
 
     def line(self, x1, y1, x2, y2):
         if self._strokeColor != None:
             if 0: # something is wrong with line in my SVG viewer...
-                line = transformNode(self.doc, "line",
-                    x=x1, y=y1, x2=x2, y2=y2,
-                    style=self._formatStyle(LINE_STYLES))
-                self.currGroup.appendChild(line)
-            path = transformNode(self.doc, "path",
+                self._element("line", dict(x=x1, y=y1, x2=x2, y2=y2,
+                    style=self._formatStyle(LINE_STYLES)))
+            self._element("path", dict(
                 d="M %s L %s Z" % (self.cfp_str(x1,y1),self.cfp_str(x2,y2)),
-                style=self._formatStyle(LINE_STYLES))
-            self.currGroup.appendChild(path)
+                style=self._formatStyle(LINE_STYLES)))
 
     def ellipse(self, x1, y1, x2, y2, link_info=None):
         """Draw an orthogonal ellipse inscribed within the rectangle x1,y1,x2,y2.
 
         These should have x1<x2 and y1<y2.
         """
-        ellipse = transformNode(self.doc, "ellipse",
+        self._element("ellipse", dict(
             cx=(x1+x2)/2.0, cy=(y1+y2)/2.0, rx=(x2-x1)/2.0, ry=(y2-y1)/2.0,
-            style=self._formatStyle(AREA_STYLES))
-
-        if link_info:
-            ellipse = self._add_link(ellipse, link_info)
-            
-        self.currGroup.appendChild(ellipse)
+            style=self._formatStyle(AREA_STYLES)), link_info=link_info)
 
     def circle(self, xc, yc, r, link_info=None):
-        circle = transformNode(self.doc, "circle",
-            cx=xc, cy=yc, r=r,
-            style=self._formatStyle(AREA_STYLES))
-
-        if link_info:
-            circle = self._add_link(circle, link_info)
-        
-        self.currGroup.appendChild(circle)
+        self._element("circle", dict(cx=xc, cy=yc, r=r,
+            style=self._formatStyle(AREA_STYLES)), link_info=link_info)
 
     def drawCurve(self, x1, y1, x2, y2, x3, y3, x4, y4, closed=0):
         pass
@@ -618,22 +729,15 @@ class SVGCanvas:
         if fromcenter:
             s("L %s Z" % cfp_str(cx, cy))
 
-        path = transformNode(self.doc, "path",
-            d=' '.join(s.__self__), style=self._formatStyle())
-        self.currGroup.appendChild(path)
+        self._element("path", dict(d=' '.join(s.__self__), style=self._formatStyle()))
 
     def polygon(self, points, closed=0, link_info=None):
         assert len(points) >= 2, 'Polygon must have 2 or more points'
 
         if self._strokeColor!=None or self._fillColor!=None:
             pts = ', '.join([fp_str(*p) for p in points])
-            polyline = transformNode(self.doc, "polygon",
-                points=pts, style=self._formatStyle(AREA_STYLES))
-
-            if link_info:
-                polyline = self._add_link(polyline, link_info)
-
-            self.currGroup.appendChild(polyline)
+            self._element("polygon", dict(points=pts, style=self._formatStyle(AREA_STYLES)),
+                    link_info=link_info)
 
         # self._fillAndStroke(polyCode)
 
@@ -651,43 +755,37 @@ class SVGCanvas:
 
         if self._strokeColor != None:
             pts = ', '.join([fp_str(*p) for p in points])
-            polyline = transformNode(self.doc, "polyline",
-                points=pts, style=self._formatStyle(AREA_STYLES,fill=None))
-            self.currGroup.appendChild(polyline)
+            self._element("polyline", dict(points=pts, style=self._formatStyle(AREA_STYLES,fill=None)))
 
     ### groups ###
     def startGroup(self,attrDict=dict(transform="")):
         if self.verbose: print("+++ begin SVGCanvas.startGroup")
-        currGroup = self.currGroup
-        group = transformNode(self.doc, "g", **attrDict)
-        currGroup.appendChild(group)
-        self.currGroup = group
+        depth = len(self._elements if self._dom is None else self._nodes)
+        self._begin("g", dict(attrDict))
         if self.verbose: print("+++ end SVGCanvas.startGroup")
-        return currGroup
+        return depth
 
-    def endGroup(self,currGroup):
+    def endGroup(self,depth):
+        """end the groups started since the startGroup which returned depth;
+        a transform after something is drawn in a group starts a nested group"""
         if self.verbose: print("+++ begin SVGCanvas.endGroup")
-        self.currGroup = currGroup
+        E = self._elements if self._dom is None else self._nodes
+        while len(E)>depth:
+            self._end()
         if self.verbose: print("+++ end SVGCanvas.endGroup")
 
     def transform(self, a, b, c, d, e, f):
         if self.verbose: print("!!! begin SVGCanvas.transform", a, b, c, d, e, f)
-        tr = self.currGroup.getAttribute("transform")
         if (a, b, c, d, e, f) != (1, 0, 0, 1, 0, 0):
-            t = 'matrix(%s)' % self.cfp_str(a,b,c,d,e,f)
-            self.currGroup.setAttribute("transform", "%s %s" % (tr, t))
+            self._setGroupTransform('matrix(%s)' % self.cfp_str(a,b,c,d,e,f))
 
     def translate(self, x, y):
         if (x,y) != (0,0):
-            self.currGroup.setAttribute("transform", "%s %s"
-                % (self.currGroup.getAttribute("transform"),
-                    'translate(%s)' % self.cfp_str(x,y)))
+            self._setGroupTransform('translate(%s)' % self.cfp_str(x,y))
 
     def scale(self, sx, sy):
         if (sx,sy) != (1,1):
-            self.currGroup.setAttribute("transform", "%s %s" 
-                    % (self.groups[-1].getAttribute("transform"),
-                        'scale(%s)' % self.cfp_str(sx, sy)))
+            self._setGroupTransform('scale(%s)' % self.cfp_str(sx, sy))
 
     ### paths ###
     def moveTo(self, x, y):
@@ -747,6 +845,30 @@ class _SVGRenderer(Renderer):
 
         if self.verbose: print("### end _SVGRenderer.drawNode(%r)" % node)
 
+    def _dlBegin(self, items, group):
+        style = self._canvas.style.copy()
+        if items: self.applyStateChanges(dict(items), {})
+        return style, group and self._groupBegin(None)
+
+    def _dlSet(self, items):
+        #the style is not reset for each shape so remove what the setters leave
+        style = self._canvas.style
+        for k, v in items:
+            if k=='strokeDashArray':
+                style.pop('stroke-dasharray',None)
+                style.pop('stroke-dashoffset',None)
+            elif v is None and k in ('fillColor','strokeColor'):
+                style.pop(k[:-5]+'-opacity',None)
+        self.applyStateChanges(dict(items), {})
+
+    def _dlEnd(self, items, group, token):
+        style, depth = token
+        if group: self._groupEnd(None, depth)
+        for k, v in items:
+            if k in self._restores:
+                setattr(self._canvas,self._restores[k],v)
+        self._canvas.style = style
+
     _restores = {'strokeColor':'_strokeColor','strokeWidth': '_lineWidth','strokeLineCap':'_lineCap',
                 'strokeLineJoin':'_lineJoin','fillColor':'_fillColor','fontName':'_font',
                 'fontSize':'_fontSize'}
@@ -785,19 +907,26 @@ class _SVGRenderer(Renderer):
     def drawGroup(self, group):
         if self.verbose: print("### begin _SVGRenderer.drawGroup")
 
-        currGroup = self._canvas.startGroup()
-        a, b, c, d, e, f = self._tracker.getState()['transform']
+        token = self._groupBegin(group)
         for childNode in group.getContents():
             if isinstance(childNode, UserNode):
                 node2 = childNode.provideNode()
             else:
                 node2 = childNode
             self.drawNode(node2)
-        self._canvas.transform(a, b, c, d, e, f)
-        self._canvas.endGroup(currGroup)
+        self._groupEnd(group, token)
 
         if self.verbose: print("### end _SVGRenderer.drawGroup")
 
+    def _groupBegin(self, group):
+        canvas = self._canvas
+        depth = canvas.startGroup()
+        canvas.transform(*self._tracker.getState()['transform'])
+        return depth
+
+    def _groupEnd(self, group, depth):
+        self._canvas.endGroup(depth)
+
     def drawRect(self, rect):
         link_info = self._get_link_info_dict(rect)
         svgAttrs = getattr(rect,'_svgAttrs',{})
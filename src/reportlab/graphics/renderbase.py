@@ -8,6 +8,7 @@ __doc__='''Superclass for renderers to factor out common functionality and defau
 from reportlab.graphics.shapes import *
 from reportlab.lib.validators import DerivedValue
 from reportlab import rl_config
+from hashlib import md5
 
 from . transform import mmult, inverse
 
@@ -150,6 +151,7 @@ def _expandUserNode(node,canvas):
     return node
 
 def renderScaledDrawing(d):
+    if isinstance(d,DisplayList): return d  #scaled when compiled
     renderScale = d.renderScale
     if renderScale!=1.0:
         o = d
@@ -167,8 +169,19 @@ class Renderer:
 
     def draw(self, drawing, canvas, x=0, y=0, showBoundary=rl_config._unset_):
         """This is the top level function, which draws the drawing at the given
-        location. The recursive part is handled by drawNode."""
-        self._tracker = StateTracker(defaultObj=drawing)
+        location. The recursive part is handled by drawNode.
+
+        drawing may also be a DisplayList which is replayed if the
+        renderer provides the _dlBegin/_dlSet/_dlEnd hooks."""
+        ops = None
+        width, height = drawing.width, drawing.height
+        if isinstance(drawing,DisplayList):
+            if hasattr(self,'_dlSet'):
+                ops = drawing.ops
+                self._tracker = StateTracker(drawing.defaults.copy())
+            drawing = drawing.drawing
+        if ops is None:
+            self._tracker = StateTracker(defaultObj=drawing)
         #stash references for ease of  communication
         if showBoundary is rl_config._unset_: showBoundary=rl_config.showBoundary
         self._canvas = canvas
@@ -178,12 +191,15 @@ class Renderer:
             #bounding box
             if showBoundary:
                 if hasattr(canvas,'drawBoundary'):
-                    canvas.drawBoundary(showBoundary,x,y,drawing.width,drawing.height)
+                    canvas.drawBoundary(showBoundary,x,y,width,height)
                 else:
-                    canvas.rect(x, y, drawing.width, drawing.height)
+                    canvas.rect(x, y, width, height)
             canvas.saveState()
             self.initState(x,y)  #this is the push()
-            self.drawNode(drawing)
+            if ops is None:
+                self.drawNode(drawing)
+            else:
+                self.replay(ops)
             self.pop()
             canvas.restoreState()
         finally:
@@ -205,6 +221,58 @@ class Renderer:
         # Undefined here, but with closer analysis probably can be handled in superclass
         self.undefined("drawNode")
 
+    def replay(self, ops):
+        """draw the operations of a DisplayList.  The state each operation
+        leaves is made the current state and the renderer's hooks
+        _dlBegin(items,group) (save the state and apply items, returning a
+        token), _dlSet(items) and _dlEnd(items,group,token) (restore the state;
+        items are the values restored) make the backend agree with it."""
+        canvas = self._canvas
+        combined = self._tracker._combined
+        dlBegin = self._dlBegin
+        dlSet = self._dlSet
+        dlEnd = self._dlEnd
+        meths = {}
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        for op in ops:
+            k = op[0]
+            if k==_DL_DRAW:
+                m = op[1]
+                try:
+                    meth = meths[m]
+                except KeyError:
+                    meth = meths[m] = getattr(self,m)
+                meth(op[2])
+            elif k==_DL_SET:
+                combined[-1] = op[1]
+                dlSet(op[2])
+            elif k==_DL_BEGIN:
+                combined[-1] = op[1]
+                push(dlBegin(op[2],op[3]))
+            elif k==_DL_END:
+                combined[-1] = op[1]
+                dlEnd(op[2],op[3],pop())
+            elif k==_DL_NODE:
+                self._dlNode(op[1],op[2])
+            else:
+                node = op[1]
+                ocanvas = hasattr(node,'_canvas')
+                if not ocanvas: node._canvas = canvas
+                try:
+                    if k==_DL_CALLBACK:
+                        op[2](node,canvas=canvas,renderer=self)
+                    else:
+                        node.drawDirectly(self)
+                finally:
+                    if not ocanvas: del node._canvas
+
+    def _dlNode(self, anode, group):
+        """draw a user node of a DisplayList which is expanded for the canvas"""
+        node = _expandUserNode(anode,self._canvas)
+        if node: self._drawChild(group, anode, node)
+
     def getStateValue(self, key):
         """Return current state parameter for given key"""
         currentState = self._tracker._combined[-1]
@@ -287,25 +355,30 @@ class Renderer:
         for anode in group.getContents():
             node = _expandUserNode(anode,canvas)
             if not node: continue
+            self._drawChild(group, anode, node)
 
-            #here is where we do derived values - this seems to get everything. Touch wood.
-            self.fillDerivedValues(node)
-            try:
-                if hasattr(node,'_canvas'):
-                    ocanvas = 1
-                else:
-                    node._canvas = canvas
-                    ocanvas = None
-                if node is not anode:
-                    anode._parent = group
-                    node._parent = anode
-                else:
-                    node._parent = group
-                self.drawNode(node)
-            finally:
-                if node is not anode: del anode._parent
-                del node._parent
-                if not ocanvas: del node._canvas
+    def _drawChild(self, group, anode, node):
+        """draw node, the expansion of the child anode of group"""
+        canvas = getattr(self,'_canvas',None)
+
+        #here is where we do derived values - this seems to get everything. Touch wood.
+        self.fillDerivedValues(node)
+        try:
+            if hasattr(node,'_canvas'):
+                ocanvas = 1
+            else:
+                node._canvas = canvas
+                ocanvas = None
+            if node is not anode:
+                anode._parent = group
+                node._parent = anode
+            else:
+                node._parent = group
+            self.drawNode(node)
+        finally:
+            if node is not anode: del anode._parent
+            del node._parent
+            if not ocanvas: del node._canvas
 
     def drawWedge(self, wedge):
         # by default ask the wedge to make a polygon of itself and draw that!
@@ -351,6 +424,212 @@ class Renderer:
     def drawImage(self,*args,**kwds):
         raise NotImplementedError('drawImage')
 
+#display list operations
+_DL_BEGIN, _DL_END, _DL_SET, _DL_DRAW, _DL_CALLBACK, _DL_DIRECT, _DL_NODE = range(7)
+
+#the node classes and their draw methods in the order drawNodeDispatcher tests them
+_drawMethods = ((Line,'drawLine'), (Path,'drawPath'), (String,'drawString'), (Group,'drawGroup'),
+        (Rect,'drawRect'), (Image,'drawImage'), (Circle,'drawCircle'), (Ellipse,'drawEllipse'),
+        (PolyLine,'drawPolyLine'), (Polygon,'drawPolygon'), (Wedge,'drawWedge'), (DirectDraw,None))
+
+#a colour sets its opacity too so these are always set together, colour first
+_statePairs = (('fillColor','fillOpacity'), ('strokeColor','strokeOpacity'))
+
+def _snapshot(node):
+    """return a copy of node which later changes to node do not affect"""
+    klass = node.__class__
+    n = klass.__new__(klass)
+    d = n.__dict__
+    for a, v in node.__dict__.items():
+        if a not in ('_parent','_canvas'):
+            d[a] = v[:] if isinstance(v,list) else v.copy() if isinstance(v,dict) else v
+    return n
+
+class _CanvasProbe:
+    """stands in for the canvas while a drawing is compiled and notes
+    whether a user node looks at it"""
+    used = False
+    def __getattr__(self, a):
+        if not a.startswith('__'): self.used = True
+        raise AttributeError(a)
+
+class DisplayList:
+    """A Drawing compiled by compileDrawing into a flat list of operations.
+
+    The user nodes have been expanded, derived values filled in and the
+    graphics state worked out, so the renderers only set what changes between
+    the shapes and draw copies of them.  It shows the drawing as it was when
+    compiled; compile again after changing the drawing.  Other attributes are
+    those of the drawing.
+    """
+    def __init__(self, drawing, ops, defaults):
+        self.drawing = drawing
+        self.ops = ops
+        self.defaults = defaults
+        self.width = drawing.width
+        self.height = drawing.height
+
+    def __getattr__(self, a):
+        if a.startswith('__'): raise AttributeError(a)
+        return getattr(self.__dict__['drawing'],a)
+
+    def __len__(self):
+        return len(self.ops)
+
+    def digest(self):
+        """return a hex digest of the operations and the drawing size which is
+        the same for the same drawing in any process, or None if that cannot be
+        known (callbacks, direct drawing or values without a stable repr)"""
+        h = md5(usedforsecurity=False)
+        h.update(repr((self.width,self.height,sorted(self.defaults.items()))).encode('utf8'))
+        for op in self.ops:
+            k = op[0]
+            if k==_DL_DRAW:
+                node = op[2]
+                x = k, op[1], node.__class__.__name__, sorted(node.__dict__.items())
+            elif k in (_DL_CALLBACK,_DL_DIRECT,_DL_NODE):
+                return None
+            else:
+                x = k, op[2:]
+            x = repr(x)
+            if ' at 0x' in x: return None
+            h.update(x.encode('utf8'))
+        return h.hexdigest()
+
+class _DisplayListCompiler(Renderer):
+    """walks a drawing as the renderers do recording the state changes
+    needed before each shape is drawn.
+
+    Only groups (and direct drawing) save and restore the state; a shape sets
+    just the state values which differ from those already set."""
+    def compile(self, drawing):
+        drawing = renderScaledDrawing(drawing)
+        defaults = StateTracker(defaultObj=drawing).getState().copy()
+        #replay starts from the drawing's position so transforms are relative to that
+        state = defaults.copy()
+        state['transform'] = state['ctm'] = (1,0,0,1,0,0)
+        self._tracker = StateTracker(state.copy())
+        self._current = state
+        self._keys = [k for k in state if k not in ('transform','ctm','fillColor','fillOpacity',
+                        'strokeColor','strokeOpacity')]
+        self._saved = []
+        self._ops = []
+        self._canvas = _CanvasProbe()
+        drawing._parent = None
+        try:
+            self.drawNode(drawing)
+            return DisplayList(drawing,self._ops,defaults)
+        finally:
+            del self._ops, self._tracker, self._current, self._saved, self._canvas, drawing._parent
+
+    def _expand(self, anode):
+        """return anode's expansion or the probe if it depends on the canvas"""
+        if not isinstance(anode,UserNode): return anode
+        probe = self._canvas
+        probe.used = False
+        try:
+            node = _expandUserNode(anode,probe)
+        except:
+            if not probe.used: raise
+        return probe if probe.used else node
+
+    def drawGroup(self, group):
+        for anode in group.getContents():
+            node = self._expand(anode)
+            if node is self._canvas:
+                #drawn from the parent's state when replayed
+                self._set()
+                self._ops.append((_DL_NODE,anode,group))
+            elif node:
+                self._drawChild(group, anode, node)
+
+    def drawNode(self, node):
+        self._delta = deltas = getStateDelta(node)
+        self._tracker.push(deltas)
+        self.drawNodeDispatcher(node)
+        self._tracker.pop()
+
+    def _set(self):
+        """record setting the tracked state values which differ from the current ones"""
+        S = self._tracker.getState()
+        C = self._current
+        items = []
+        for k in self._keys:
+            v = S[k]
+            if v!=C[k]:
+                items.append((k,v[:] if isinstance(v,list) else v))
+        for c, o in _statePairs:
+            if S[c]!=C[c] or S[o]!=C[o]:
+                items.extend(((c,S[c]),(o,S[o])))
+        if items:
+            C = self._current = C.copy()
+            C.update(items)
+            self._ops.append((_DL_SET,C,tuple(items)))
+
+    def _begin(self, group):
+        """record saving the state and applying the node's transform"""
+        S = self._tracker.getState()
+        C = self._current
+        self._saved.append(C)
+        C = self._current = C.copy()
+        C['transform'] = S['transform']
+        C['ctm'] = S['ctm']
+        t = self._delta.get('transform')
+        items = (('transform',t),) if t is not None and t!=(1,0,0,1,0,0) else ()
+        self._ops.append((_DL_BEGIN,C,items,group))
+
+    def _end(self, group):
+        """record restoring the state saved by the matching _begin"""
+        C = self._current
+        S = self._current = self._saved.pop()
+        items = tuple((k,S[k]) for k in S if k not in ('transform','ctm') and S[k]!=C[k])
+        self._ops.append((_DL_END,S,items,group))
+
+    def drawNodeDispatcher(self, anode):
+        ops = self._ops
+        node = self._expand(anode)
+        if node is self._canvas:
+            self._set()
+            ops.append((_DL_NODE,anode,getattr(anode,'_parent',None)))
+            return
+        if not node: return
+        nodeparent = node is not anode and not hasattr(node,'_parent')
+        if nodeparent: node._parent = anode
+        try:
+            self.fillDerivedValues(node)
+            dtcb = getattr(node,'_drawTimeCallback',None)
+            for klass, meth in _drawMethods:
+                if isinstance(node,klass): break
+            else:
+                print('DrawingError','Unexpected element %s in drawing!' % str(node))
+                return
+            if meth=='drawGroup':
+                self._begin(1)
+                if dtcb: ops.append((_DL_CALLBACK,node,dtcb))
+                self.drawGroup(node)
+                self._end(1)
+            elif meth:
+                self._set()
+                if dtcb:
+                    #the callback may change the node so the live one is drawn
+                    ops.append((_DL_CALLBACK,node,dtcb))
+                    ops.append((_DL_DRAW,meth,node))
+                else:
+                    ops.append((_DL_DRAW,meth,_snapshot(node)))
+            else:
+                self._begin(0)
+                self._set()
+                if dtcb: ops.append((_DL_CALLBACK,node,dtcb))
+                ops.append((_DL_DIRECT,node))
+                self._end(0)
+        finally:
+            if nodeparent: del node._parent
+
+def compileDrawing(drawing):
+    """return a DisplayList for drawing which renderPDF, renderPS, renderSVG
+    and renderPM can draw repeatedly without walking the drawing again"""
+    return _DisplayListCompiler().compile(drawing)
+
 if __name__=='__main__':
     print("this file has no script interpretation")
     print(__doc__)
@@ -590,6 +590,7 @@ class Drawing(Group, Flowable):
         renderScale = AttrMapValue(isNumber,desc="Global scaling for rendering"),
         initialFontName = AttrMapValue(isStringOrNone,desc="override the STATE_DEFAULTS value for fontName"),
         initialFontSize = AttrMapValue(isNumberOrNone,desc="override the STATE_DEFAULTS value for fontSize"),
+        rasterDPI = AttrMapValue(isNumberOrNone,desc="if set PDF output places the drawing as a cached image rasterized at this resolution"),
         )
 
     _attrMap = AttrMap(BASE=Group,
@@ -852,6 +853,7 @@ class _DrawingEditorMixin:
             raise ValueError("Can't add, need name")
 
 class isStrokeDashArray(Validator):
+    _okTypes = type(None)
     def test(self,x):
         return isListOfNumbersOrNone.test(x) or (isinstance(x,(list,tuple)) and isNumber(x[0]) and isListOfNumbers(x[1]))
 isStrokeDashArray = isStrokeDashArray()
@@ -872,13 +874,15 @@ class LineShape(Shape):
         )
 
     def __init__(self, kw):
-        self.strokeColor = STATE_DEFAULTS['strokeColor']
-        self.strokeWidth = 1
-        self.strokeLineCap = 0
-        self.strokeLineJoin = 0
-        self.strokeMiterLimit = 0
-        self.strokeDashArray = None
-        self.strokeOpacity = None
+        validateSetattrs(self,
+            strokeColor = STATE_DEFAULTS['strokeColor'],
+            strokeWidth = 1,
+            strokeLineCap = 0,
+            strokeLineJoin = 0,
+            strokeMiterLimit = 0,
+            strokeDashArray = None,
+            strokeOpacity = None,
+            )
         self.setProperties(kw)
 
 class Line(LineShape):
@@ -891,10 +895,7 @@ class Line(LineShape):
 
     def __init__(self, x1, y1, x2, y2, **kw):
         LineShape.__init__(self, kw)
-        self.x1 = x1
-        self.y1 = y1
-        self.x2 = x2
-        self.y2 = y2
+        validateSetattrs(self, x1=x1, y1=y1, x2=x2, y2=y2)
 
     def getBounds(self):
         "Returns bounding rectangle of object as (x1,y1,x2,y2)"
@@ -912,8 +913,7 @@ class SolidShape(LineShape):
         )
 
     def __init__(self, kw):
-        self.fillColor = STATE_DEFAULTS['fillColor']
-        self.fillOpacity = None
+        validateSetattrs(self, fillColor=STATE_DEFAULTS['fillColor'], fillOpacity=None)
         # do this at the end so keywords overwrite
         #the above settings
         LineShape.__init__(self, kw)
@@ -1136,12 +1136,7 @@ class Rect(SolidShape):
 
     def __init__(self, x, y, width, height, rx=0, ry=0, **kw):
         SolidShape.__init__(self, kw)
-        self.x = x
-        self.y = y
-        self.width = width
-        self.height = height
-        self.rx = rx
-        self.ry = ry
+        validateSetattrs(self, x=x, y=y, width=width, height=height, rx=rx, ry=ry)
 
     def copy(self):
         new = self.__class__(self.x, self.y, self.width, self.height)
@@ -1189,9 +1184,7 @@ class Circle(SolidShape):
 
     def __init__(self, cx, cy, r, **kw):
         SolidShape.__init__(self, kw)
-        self.cx = cx
-        self.cy = cy
-        self.r = r
+        validateSetattrs(self, cx=cx, cy=cy, r=r)
 
     def copy(self):
         new = self.__class__(self.cx, self.cy, self.r)
@@ -1211,10 +1204,7 @@ class Ellipse(SolidShape):
 
     def __init__(self, cx, cy, rx, ry, **kw):
         SolidShape.__init__(self, kw)
-        self.cx = cx
-        self.cy = cy
-        self.rx = rx
-        self.ry = ry
+        validateSetattrs(self, cx=cx, cy=cy, rx=rx, ry=ry)
 
     def copy(self):
         new = self.__class__(self.cx, self.cy, self.rx, self.ry)
@@ -1499,13 +1489,15 @@ class String(Shape):
     encoding = 'utf8'
 
     def __init__(self, x, y, text, **kw):
-        self.x = x
-        self.y = y
-        self.text = text
-        self.textAnchor = 'start'
-        self.fontName = STATE_DEFAULTS['fontName']
-        self.fontSize = STATE_DEFAULTS['fontSize']
-        self.fillColor = STATE_DEFAULTS['fillColor']
+        validateSetattrs(self,
+            x = x,
+            y = y,
+            text = text,
+            textAnchor = 'start',
+            fontName = STATE_DEFAULTS['fontName'],
+            fontSize = STATE_DEFAULTS['fontSize'],
+            fillColor = STATE_DEFAULTS['fillColor'],
+            )
         self.setProperties(kw)
 
     def getEast(self):
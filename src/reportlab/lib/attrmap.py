@@ -96,39 +96,66 @@ class AttrMap(dict):
         c.update(kw)
         return c
 
+_classSetters = {}
+def _reset():
+    '''forget the property setters found for each class'''
+    _classSetters.clear()
+
+from reportlab.rl_config import register_reset
+register_reset(_reset)
+del register_reset
+
+def _getClassSetters(klass):
+    '''return a dict mapping klass's property names to their setters (None if read only)'''
+    S = _classSetters.get(klass)
+    if S is None:
+        S = _classSetters[klass] = {}
+        for name in dir(klass):
+            prop = getattr(klass,name,None)
+            if isinstance(prop,property):
+                S[name] = getattr(prop,'fset',None)
+    return S
+
+def _checkUnmapped(obj,name,value,setters):
+    '''check an assignment to a name not in obj._attrMap; return True if a property setter did it'''
+    if isinstance(value, DerivedValue):
+        #we always allow the inherited values; they cannot
+        #be checked until draw time.
+        return
+    if name in setters:
+        fset = setters[name]
+        if fset:
+            fset(obj,value)
+            return True
+        raise AttributeError(f"{obj.__class__.__name__}.{name} has no setter")
+    raise AttributeError("Illegal attribute '%s' in class %s" % (name, obj.__class__.__name__))
+
+def _checkValue(obj,name,value,validate):
+    if isinstance(value, DerivedValue): return
+    try:
+        r = validate(value)
+    except Exception as e:
+        raise e.__class__(f"{obj.__class__.__name__}.{name} {validate}({value!r})") from e
+    if not r:
+        raise AttributeError(f"Illegal assignment of {value!r} to {name} in class {obj.__class__.__name__}")
+
 def validateSetattr(obj,name,value):
     '''validate setattr(obj,name,value)'''
+    setters = _classSetters.get(obj.__class__)
+    if setters is None: setters = _getClassSetters(obj.__class__)
     if rl_config.shapeChecking:
         aMap = obj._attrMap
         if aMap and name[0]!= '_':
-            #we always allow the inherited values; they cannot
-            #be checked until draw time.
-            if isinstance(value, DerivedValue):
-                #let it through
-                pass
-            elif name in aMap:
-                validate = aMap[name].validate
-                try:
-                    r = validate(value)
-                except Exception as e:
-                    raise e.__class__(f"{obj.__class__.__name__}.{name} {validate}({value!r})") from e
-                else:
-                    if not r:
-                        raise AttributeError(f"Illegal assignment of {value!r} to {name} in class {obj.__class__.__name__}")
+            amv = aMap.get(name)
+            if amv is None:
+                if _checkUnmapped(obj,name,value,setters): return
             else:
-                prop = getattr(obj.__class__,name,None)
-                if isinstance(prop,property):
-                    fset = getattr(prop,'fset',None)
-                    if fset:
-                        fset(obj,value)
-                        return
-                    else:
-                        raise AttributeError(f"{obj.__class__.__name__}.{name} has no setter")
-                else:
-                    raise AttributeError("Illegal attribute '%s' in class %s" % (name, obj.__class__.__name__))
-    prop = getattr(obj.__class__,name,None)
-    if isinstance(prop,property):
-        fset = getattr(prop,'fset',None)
+                validate = amv.validate
+                #values of the validator's always acceptable types need no call
+                if not isinstance(value,getattr(validate,'_okTypes',())):
+                    _checkValue(obj,name,value,validate)
+    if name in setters:
+        fset = setters[name]
         if fset:
             fset(obj,value)
         else:
@@ -139,6 +166,31 @@ def validateSetattr(obj,name,value):
     else:
         obj.__dict__[name] = value
 
+def validateSetattrs(obj,**kw):
+    '''validate and then set many attributes at once, as if by setattr'''
+    klass = obj.__class__
+    setters = _classSetters.get(klass)
+    if setters is None: setters = _getClassSetters(klass)
+    checked = klass.__setattr__ is not object.__setattr__   #as decided when the class was made
+    if setters or '__dict__' in kw:
+        for name, value in kw.items():
+            setattr(obj,name,value)
+        return
+    if checked and rl_config.shapeChecking:
+        aMap = obj._attrMap
+        if aMap:
+            get = aMap.get
+            for name, value in kw.items():
+                if name[0]=='_': continue
+                amv = get(name)
+                if amv is None:
+                    _checkUnmapped(obj,name,value,setters)
+                else:
+                    validate = amv.validate
+                    if not isinstance(value,getattr(validate,'_okTypes',())):
+                        _checkValue(obj,name,value,validate)
+    obj.__dict__.update(kw)
+
 def _privateAttrMap(obj,ret=0):
     '''clone obj._attrMap if required'''
     A = obj._attrMap
@@ -15,9 +15,27 @@ except AttributeError:
 class Percentage(float):
     pass
 
+_memoTypes = frozenset((str,int,float,bool,type(None)))
+_memoSize = 256
+
 class Validator:
     "base validator class"
+    _okTypes = ()       #instances of these always pass; subclasses with a stricter test must reset it
+    _memoize = False    #cache test results for immutable values
+
     def __call__(self,x):
+        if isinstance(x,self._okTypes): return True
+        if self._memoize and type(x) in _memoTypes:
+            try:
+                memo = self._memo
+            except AttributeError:
+                memo = self._memo = {}
+            k = type(x), x
+            r = memo.get(k,memo)
+            if r is memo:
+                r = self.test(x)
+                if len(memo)<_memoSize: memo[k] = r
+            return r
         return self.test(x)
 
     def __str__(self):
@@ -34,6 +52,7 @@ class Validator:
             return False
 
 class _isAnything(Validator):
+    _okTypes = object
     def test(self,x):
         return True
 
@@ -42,6 +61,7 @@ class _isNothing(Validator):
         return False
 
 class _isBoolean(Validator):
+    _memoize = True
     def test(self,x):
         if isinstance(int,bool): return x in (0,1)
         return self.normalizeTest(x)
@@ -57,10 +77,12 @@ class _isBoolean(Validator):
         raise ValueError('Must be boolean not %s' % ascii(s))
 
 class _isString(Validator):
+    _okTypes = str
     def test(self,x):
         return isStr(x)
 
 class _isCodec(Validator):
+    _memoize = True
     def test(self,x):
         if not isStr(x):
             return False
@@ -71,6 +93,7 @@ class _isCodec(Validator):
             return False
 
 class _isNumber(Validator):
+    _okTypes = (int,float)
     def test(self,x):
         if isinstance(x,(float,int)): return True
         return self.normalizeTest(x)
@@ -82,6 +105,7 @@ class _isNumber(Validator):
             return int(x)
 
 class _isInt(Validator):
+    _okTypes = int
     def test(self,x):
         if not isinstance(x,int) and not isStr(x): return False
         return self.normalizeTest(x)
@@ -90,6 +114,7 @@ class _isInt(Validator):
         return int(x.decode('utf8') if isBytes(x) else x)
 
 class _isNumberOrNone(_isNumber):
+    _okTypes = (int,float,type(None))
     def test(self,x):
         return x is None or isNumber(x)
 
@@ -99,11 +124,14 @@ class _isNumberOrNone(_isNumber):
 
 class _isListOfNumbersOrNone(Validator):
     "ListOfNumbersOrNone validator class."
+    _okTypes = type(None)
     def test(self, x):
         if x is None: return True
         return isListOfNumbers(x)
 
 class isNumberInRange(_isNumber):
+    _okTypes = ()
+    _memoize = True
     def __init__(self, min, max):
         self.min = min
         self.max = max
@@ -133,6 +161,7 @@ class _isListOfShapes(Validator):
 
 class _isListOfStringsOrNone(Validator):
     "ListOfStringsOrNone validator class."
+    _okTypes = type(None)
 
     def test(self, x):
         if x is None: return True
@@ -154,17 +183,20 @@ class _isTransform(Validator):
 
 class _isColor(Validator):
     "Color validator class."
+    _okTypes = colors.Color
     def test(self, x):
         return isinstance(x, colors.Color)
 
 class _isColorOrNone(Validator):
     "ColorOrNone validator class."
+    _okTypes = (colors.Color,type(None))
     def test(self, x):
         if x is None: return True
         return isColor(x)
 
 from reportlab.lib.normalDate import NormalDate
 class _isNormalDate(Validator):
+    _okTypes = NormalDate
     def test(self,x):
         if isinstance(x,NormalDate):
             return True
@@ -212,6 +244,7 @@ class OneOf(Validator):
         if self._patterns:
             self._enum =  tuple((_ for _ in self._enum if not isinstance(_,_re_Pattern)))
             self.test = self._test_patterns
+            self._memoize = True
 
     def test(self, x):
         return x in self._enum
@@ -245,10 +278,12 @@ class SequenceOf(Validator):
         return True
 
 class EitherOr(Validator):
+    _memoize = True
     def __init__(self,tests,name=None):
         if not isSeq(tests): tests = (tests,)
         self._tests = tests
         if name: self._str = name
+        self._okTypes = self._okTypes+tuple(_passTypes(tests))
 
     def test(self, x):
         for t in self._tests:
@@ -256,6 +291,7 @@ class EitherOr(Validator):
         return False
 
 class NoneOr(EitherOr):
+    _okTypes = (type(None),)
     def test(self, x):
         return x is None or super().test(x)
 
@@ -272,6 +308,15 @@ class _isNotSet(Validator):
     def test(self,x):
         return x is NotSetOr._not_set
 
+def _passTypes(tests):
+    '''the types that pass at least one of tests'''
+    for t in tests:
+        T = getattr(t,'_okTypes',())
+        if isinstance(T,tuple):
+            yield from T
+        else:
+            yield T
+
 class Auto(Validator):
     def __init__(self,**kw):
         self.__dict__.update(kw)
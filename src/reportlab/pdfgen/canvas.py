@@ -1076,7 +1076,11 @@ class Canvas(_PDFColorSetter):
            Some operations (like bookmarking) are permitted for pages
            but not forms.  The form will not automatically be shown in the
            document but must be explicitly referenced using doForm in pages
-           that require the form."""
+           that require the form.
+
+           If name is None the form is named by a hash of its content (the
+           operators, bounding box and resources) when endForm is called;
+           a form with identical content is only stored once."""
         self.push_state_stack()
         self.init_graphics_state()
         if self._code or self._formData:
@@ -1090,7 +1094,7 @@ class Canvas(_PDFColorSetter):
 
     def endForm(self,**extra_attributes):
         """emit the current collection of graphics operations as a Form
-           as declared previously in beginForm."""
+           as declared previously in beginForm; returns the form name."""
         (name, lowerx, lowery, upperx, uppery) = self._formData
         #self.makeForm0(name, lowerx, lowery, upperx, uppery)
         # fall through!  makeForm0 disallowed
@@ -1100,6 +1104,14 @@ class Canvas(_PDFColorSetter):
         (w,h) = self._pagesize
         if upperx is None: upperx=w
         if uppery is None: uppery=h
+        if name is None:
+            name = self._formHashName(lowerx, lowery, upperx, uppery, sorted(extra_attributes.items()))
+            if self._doc.hasForm(name):
+                #an identical form is already defined; discard this one
+                self._doc.inObject = None
+                self._restartAccumulators()
+                self.pop_state_stack()
+                return name
         form = pdfdoc.PDFFormXObject(lowerx=lowerx, lowery=lowery, upperx=upperx, uppery=uppery)
         form.compression = self._pageCompression
         form.setStreamList([self._preamble] + self._code) # ??? minus preamble (seems to be needed!)
@@ -1112,6 +1124,22 @@ class Canvas(_PDFColorSetter):
         self._doc.addForm(name, form)
         self._restartAccumulators()
         self.pop_state_stack()
+        return name
+
+    def _formHashName(self, *args):
+        '''name for the form being ended derived from its content'''
+        if self._annotationrefs:
+            #annotations are distinct objects so never share these
+            return 'RLF%d' % len(self._doc.idToObject)
+        h = hashlib.md5(usedforsecurity=False)
+        for x in ([self._preamble]+self._code,
+                    args,
+                    sorted(self._extgstate._c.items()),
+                    sorted(self._colorsUsed.items()),
+                    sorted(self._shadingUsed.items()),
+                    sorted(self._formsinuse)):
+            h.update(repr(x).encode('utf8'))
+        return 'RLF' + h.hexdigest()
 
     def addPostScriptCommand(self, command, position=1):
         """Embed literal Postscript in the document.
@@ -10,6 +10,7 @@ __all__ = (
         'Indenter',
         'IndexingFlowable',
         'LayoutError',
+        'LayoutProfiler',
         'LCActionFlowable',
         'NextFrameFlowable',
         'NextPageTemplate',
@@ -62,7 +63,8 @@ try:
 except NameError:
     from sets import Set as set
 
-import sys
+import sys, os, copy, pickle, time
+from io import BytesIO
 import logging
 logger = logging.getLogger("reportlab.platypus")
 
@@ -277,6 +279,10 @@ class PageTemplate:
     essentially a list of Frames and an onPage routine to call at the start
     of a page when this is selected. onPageEnd gets called at the end.
     derived classes can also implement beforeDrawPage and afterDrawPage if they want
+
+    onPageStatic(canv,doc) if given draws decoration that is the same on every
+    page (letterheads, logos, watermarks etc); it is called once per document to
+    make a form XObject which is then placed on each page before onPage is called.
     """
     def __init__(self,id=None,frames=[],onPage=_doNothing, onPageEnd=_doNothing,
                  pagesize=None, autoNextPageTemplate=None,
@@ -284,6 +290,7 @@ class PageTemplate:
                  artBox=None,
                  trimBox=None,
                  bleedBox=None,
+                 onPageStatic=None,
                  ):
         frames = frames or []
         if not isSeq(frames): frames = [frames]
@@ -298,6 +305,26 @@ class PageTemplate:
         self.artBox = artBox
         self.trimBox = trimBox
         self.bleedBox = bleedBox
+        self.onPageStatic = onPageStatic
+
+    def drawStatic(self,canv,doc):
+        """Draw the onPageStatic decoration; it is rendered into a form the
+        first time it is needed on this canvas for the current page size and
+        reused after that. Templates with the same onPageStatic share the form."""
+        onPageStatic = getattr(self,'onPageStatic',None)
+        if not onPageStatic: return
+        for i,t in enumerate(doc.pageTemplates):
+            if getattr(t,'onPageStatic',None)==onPageStatic: break
+        w, h = canv._pagesize
+        forms = canv.__dict__.setdefault('_staticForms',{})
+        key = i, w, h
+        name = forms.get(key)
+        if name is None:
+            name = forms[key] = 'PTStatic%d' % len(forms)
+            canv.beginForm(name,0,0,w,h)
+            onPageStatic(canv,doc)
+            canv.endForm()
+        canv.doForm(name)
 
     def beforeDrawPage(self,canv,doc):
         """Override this if you want additional functionality or prefer
@@ -417,10 +444,235 @@ class PageAccumulator:
     def onDrawStr(self,value,*args):
         return onDrawStr(value,self,encode_label(args))
 
+class LayoutProfiler:
+    """
+    Collects wrap/split/draw call counts and times for a document build.
+
+    Attach one with BaseDocTemplate.setLayoutProfiler before building.
+    Times are kept per flowable class (all calls, however deeply nested)
+    and per top level flowable ie those laid out directly into frames
+    (nested time is included in theirs). Postponed flowables, frame breaks
+    and the time spent on each page are also recorded. The results are
+    available as a dict (report), as JSON (toJSON) or as a short text
+    summary (summary).
+
+    NB the profiler keeps references to the top level flowables it has seen
+    until reset is called.
+    """
+    _kinds = ('wrap','split','draw')
+
+    def __init__(self, timer=None):
+        self.timer = timer or time.perf_counter
+        self.reset()
+
+    def reset(self):
+        self._stack = []
+        self._classes = {}
+        self._flowables = {}
+        self._postponed = []
+        self._pages = []
+        self._builds = []
+        self._frameBreaks = 0
+        self._pageStart = self._buildStart = None
+
+    def call(self, kind, f, func, *args):
+        '''time func(*args) as a kind (wrap, split or draw) call on flowable f'''
+        S = self._stack
+        if S and S[-1][0] is f and S[-1][1]==kind:
+            return func(*args)  #eg drawOn calling _drawOn; count it once
+        e = [f,kind,0]
+        S.append(e)
+        timer = self.timer
+        t0 = timer()
+        try:
+            return func(*args)
+        finally:
+            t = timer()-t0
+            S.pop()
+            if S: S[-1][2] += t
+            self._record(self._classes,f.__class__.__name__,kind,t,t-e[2])
+            if not S:
+                r = self._flowables.get(id(f))
+                if r is None or r[0] is not f:
+                    r = self._flowables[id(f)] = [f,{}]
+                self._record(r[1],kind,None,t,t-e[2])
+
+    @staticmethod
+    def _record(D,k,kind,t,s):
+        if kind is not None:
+            D = D.setdefault(k,{})
+            k = kind
+        v = D.get(k)
+        if v is None:
+            D[k] = [1,t,s]
+        else:
+            v[0] += 1
+            v[1] += t
+            v[2] += s
+
+    def buildBegin(self):
+        self._buildStart = self.timer()
+
+    def buildEnd(self):
+        if self._buildStart is not None:
+            self._builds.append(self.timer()-self._buildStart)
+            self._buildStart = None
+
+    def pageBegin(self,page):
+        self._pageStart = self.timer()
+
+    def pageEnd(self,page,nFlowables):
+        if self._pageStart is not None:
+            self._pages.append((page,self.timer()-self._pageStart,nFlowables))
+            self._pageStart = None
+
+    def frameBreak(self):
+        self._frameBreaks += 1
+
+    def postponed(self,f,page,frameId):
+        self._postponed.append((self._ident(f),page,frameId))
+
+    @staticmethod
+    def _ident(f,maxLen=80):
+        try:
+            return ' '.join(f.identity(maxLen).split())
+        except:
+            return '<%s at %s>' % (f.__class__.__name__,hex(id(f)))
+
+    @classmethod
+    def _stats(cls,D):
+        R = {}
+        tt = ts = 0
+        for kind in cls._kinds:
+            v = D.get(kind)
+            if v:
+                R[kind] = dict(count=v[0],time=v[1],self=v[2])
+                tt += v[1]
+                ts += v[2]
+        R['time'] = tt
+        R['self'] = ts
+        return R
+
+    def report(self,maxFlowables=None):
+        '''return the collected data as a dict of plain values'''
+        classes = {k:self._stats(v) for k,v in self._classes.items()}
+        F = sorted(((self._stats(D),f) for f,D in self._flowables.values()),key=lambda x: -x[0]['time'])
+        if maxFlowables is not None:
+            F = F[:maxFlowables]
+        flowables = []
+        for s,f in F:
+            s['class'] = f.__class__.__name__
+            s['identity'] = self._ident(f)
+            flowables.append(s)
+        return dict(
+                builds=self._builds[:],
+                time=sum(self._builds),
+                classes=classes,
+                flowables=flowables,
+                postponed=[dict(identity=i,page=p,frame=fid) for i,p,fid in self._postponed],
+                frameBreaks=self._frameBreaks,
+                pages=[dict(page=p,time=t,flowables=n) for p,t,n in self._pages],
+                )
+
+    def toJSON(self,f=None,maxFlowables=None,**kwds):
+        '''return the report as JSON or write it to f (a file name or file like object)'''
+        import json
+        kwds.setdefault('indent',1)
+        s = json.dumps(self.report(maxFlowables=maxFlowables),**kwds)
+        if f is None: return s
+        if isinstance(f,strTypes):
+            with open(f,'w') as f:
+                f.write(s)
+        else:
+            f.write(s)
+
+    def summary(self,n=10):
+        '''return a human readable summary of the n most expensive classes, flowables and pages'''
+        r = self.report(maxFlowables=n)
+        L = ['layout time %.3fs in %d build(s); %d pages, %d frame breaks, %d postponements' % (
+                r['time'],len(r['builds']),len(r['pages']),r['frameBreaks'],len(r['postponed']))]
+        def calls(s):
+            return ' '.join('%s=%d/%.3fs' % (k,s[k]['count'],s[k]['time']) for k in self._kinds if k in s)
+        L.append('classes by self time:')
+        for k,s in sorted(r['classes'].items(),key=lambda x: -x[1]['self'])[:n]:
+            L.append('  %-24s self %.3fs total %.3fs %s' % (k,s['self'],s['time'],calls(s)))
+        L.append('top level flowables by time:')
+        for s in r['flowables']:
+            L.append('  %.3fs %s %s' % (s['time'],calls(s),s['identity']))
+        if r['pages']:
+            L.append('slowest pages:')
+            for p in sorted(r['pages'],key=lambda x: -x['time'])[:n]:
+                L.append('  page %d %.3fs %d flowables' % (p['page'],p['time'],p['flowables']))
+        if r['postponed']:
+            L.append('postponed:')
+            for p in r['postponed'][:n]:
+                L.append('  page %d frame %r %s' % (p['page'],p['frame'],p['identity']))
+        return '\n'.join(L)
+
 def _ktAllow(f):
     '''return true if allowed in containers like KeepTogether'''
     return not (isinstance(f,(_ContainerSpace,DocIf,DocWhile)) or getattr(f,'locChanger',False))
 
+class _SectionRecorder:
+    """records where a section build places its flowables so that
+    BaseDocTemplate.buildSections can draw them onto the real canvas"""
+    def __init__(self,doc):
+        self.doc = doc
+        self.pages = []
+        self._pageOpen = False
+        handle_pageBegin = doc.handle_pageBegin
+        handle_pageEnd = doc.handle_pageEnd
+        afterFlowable = doc.afterFlowable
+        def pageBegin():
+            self.pages.append((doc.pageTemplates.index(doc.pageTemplate),[],[]))
+            self._pageOpen = True
+            handle_pageBegin()
+        def pageEnd():
+            handle_pageEnd()
+            self._pageOpen = False
+        def after(flowable):
+            if self.pages:
+                if self._pageOpen:
+                    self.record('after',doc.frame,flowable)
+                else:
+                    self.pages[-1][2].append(flowable)
+            afterFlowable(flowable)
+        doc.handle_pageBegin = pageBegin
+        doc.handle_pageEnd = pageEnd
+        doc.afterFlowable = after
+
+    def record(self,kind,frame,*args):
+        if not self.pages: return
+        for i,f in enumerate(self.doc.pageTemplate.frames):
+            if f is frame:
+                frame = i
+                break
+        self.pages[-1][1].append((kind,frame)+args)
+
+def _layoutSection(doc, story, canvasmaker, first):
+    '''lay out story using a copy of doc starting with page template index first;
+    returns the recorded pages'''
+    doc = copy.deepcopy(doc)
+    doc._firstPageTemplateIndex = first
+    rec = _SectionRecorder(doc)
+    def makeCanvas(*args,**kwds):
+        canv = canvasmaker(*args,**kwds)
+        canv._frameRecorder = rec
+        return canv
+    doc._doSave = 0
+    doc._onPage = doc._onProgress = doc._layoutProfiler = None
+    BaseDocTemplate.build(doc,story,filename=BytesIO(),canvasmaker=makeCanvas)
+    return rec.pages
+
+_sectionJob = None
+def _layoutSectionJob(i):
+    doc, sections, canvasmaker = _sectionJob
+    return _layoutSection(doc, sections[i], canvasmaker, doc._sectionPageTemplateIndex(i))
+
+def _layoutSectionPickled(args):
+    doc, story, canvasmaker, first = args
+    return _layoutSection(pickle.loads(doc), story, canvasmaker, first)
+
 class BaseDocTemplate:
     """
     First attempt at defining a document template class.
@@ -556,6 +808,7 @@ class BaseDocTemplate:
         self._onPage = None
         self._onProgress = None
         self._flowableCount = 0  # so we know how far to go
+        self._layoutProfiler = None
 
         #infinite loop detection if we start doing lots of empty pages
         self._curPageFlowableCount = 0
@@ -586,6 +839,14 @@ class BaseDocTemplate:
         '''Cleverer progress monitor - func(typ, value) called regularly'''
         self._onProgress = func
 
+    def setLayoutProfiler(self, profiler=True):
+        '''attach a LayoutProfiler (a new one if profiler is True, none if it is false)
+        to record flowable timings for subsequent builds; returns the profiler'''
+        if profiler is True:
+            profiler = LayoutProfiler()
+        self._layoutProfiler = profiler or None
+        return self._layoutProfiler
+
     def clean_hanging(self):
         'handle internal postponed actions'
         while len(self._hanging):
@@ -616,8 +877,10 @@ class BaseDocTemplate:
         shouldn't normally be called directly"""
         self.page += 1
         if self._debug: logger.debug("beginning page %d" % self.page)
+        if self._layoutProfiler: self._layoutProfiler.pageBegin(self.page)
         self.pageTemplate.beforeDrawPage(self.canv,self)
         self.pageTemplate.checkPageSize(self.canv,self)
+        self.pageTemplate.drawStatic(self.canv,self)
         self.pageTemplate.onPage(self.canv,self)
         for f in self.pageTemplate.frames: f._reset()
         self.beforePage()
@@ -678,6 +941,7 @@ class BaseDocTemplate:
             self.pageTemplate.onPageEnd(self.canv, self)
             self.afterPage()
             if self._debug: logger.debug("ending page %d" % self.page)
+            if self._layoutProfiler: self._layoutProfiler.pageEnd(self.page,self._curPageFlowableCount)
             self.canv.setPageRotation(getattr(self.pageTemplate,'rotation',self.rotation))
             self.canv.showPage()
             self._setPageTemplate()
@@ -714,6 +978,7 @@ class BaseDocTemplate:
             the next frame or if this is the last frame then invoke pageEnd.
         '''
         self._removeVars(('frame',))
+        if self._layoutProfiler: self._layoutProfiler.frameBreak()
         self._leftExtraIndent = self.frame._leftExtraIndent
         self._rightExtraIndent = self.frame._rightExtraIndent
         self._frameBGs = self.frame._frameBGs
@@ -962,6 +1227,8 @@ class BaseDocTemplate:
                         raise LayoutError(ident)
                     # this ought to be cleared when they are finally drawn!
                     f._postponed = 1
+                    if self._layoutProfiler:
+                        self._layoutProfiler.postponed(f,self.page,self.frame.id)
                     mbe = getattr(self,'_multiBuildEdits',None)
                     if mbe:
                         mbe((delattr,f,'_postponed'))
@@ -1030,6 +1297,9 @@ class BaseDocTemplate:
     def _startBuild(self, filename=None, canvasmaker=canvas.Canvas):
         self._calc()
         self.canv = self._makeCanvas(filename=filename,canvasmaker=canvasmaker)
+        if self._layoutProfiler:
+            self.canv._layoutProfiler = self._layoutProfiler
+            self._layoutProfiler.buildBegin()
         self.handle_documentBegin()
 
     def _endBuild(self):
@@ -1043,6 +1313,7 @@ class BaseDocTemplate:
 
         if getattr(self,'_doSave',1): self.canv.save()
         if self._onPage: self.canv.setPageCallBack(None)
+        if self._layoutProfiler: self._layoutProfiler.buildEnd()
 
     def build(self, flowables, filename=None, canvasmaker=canvas.Canvas):
         """Build the document from a list of flowables.
@@ -1110,6 +1381,122 @@ class BaseDocTemplate:
         if self._onProgress:
             self._onProgress('FINISHED',0)
 
+    def buildSections(self, sections, filename=None, canvasmaker=canvas.Canvas, processes=None):
+        """Build the document from a list of sections, each a list of flowables
+           that starts on a new page.
+
+           Each section is laid out (wrapped, split and placed into frames) by a
+           copy of this document template in a separate worker process; the
+           placed flowables are then drawn in order onto a single canvas so page
+           numbers, fonts, images and the outline are shared as in a normal build.
+           Layout runs with section relative page numbers, drawing and the page
+           template callbacks see the final ones.
+
+           A section may start with a PageBreakIfNotEmpty(nextTemplate=...) to
+           choose its first page template.  The placed flowables are pickled back
+           from the workers so they must be picklable; processes=0 or 1 lays the
+           sections out in this process. The workers only record where the
+           flowables go, so a flowable's draw method runs once in this process.
+           Indexing flowables are not supported.
+        """
+        global _sectionJob
+        if not self.pageTemplates:
+            raise ValueError('%s.buildSections needs page templates; add them with addPageTemplates first' % self.__class__.__name__)
+        if processes is None: processes = os.cpu_count() or 1
+        processes = min(processes,len(sections))
+        if self._onProgress:
+            self._onProgress('STARTED',0)
+            self._onProgress('SIZE_EST', len(sections))
+        self._calc()
+        self.__dict__.pop('canv',None)  #the workers must not see a canvas
+        pool = None
+        try:
+            if processes>1:
+                import multiprocessing
+                if 'fork' in multiprocessing.get_all_start_methods():
+                    _sectionJob = self, sections, canvasmaker
+                    pool = multiprocessing.get_context('fork').Pool(processes)
+                    layouts = pool.imap(_layoutSectionJob,range(len(sections)))
+                else:
+                    doc = pickle.dumps(self)
+                    pool = multiprocessing.Pool(processes)
+                    layouts = pool.imap(_layoutSectionPickled,[(doc,story,canvasmaker,self._sectionPageTemplateIndex(i))
+                                        for i,story in enumerate(sections)])
+            else:
+                doc = copy.deepcopy(self)
+                layouts = (_layoutSection(doc,story,canvasmaker,self._sectionPageTemplateIndex(i))
+                            for i,story in enumerate(sections))
+
+            self.canv = canv = self._makeCanvas(filename=filename,canvasmaker=canvasmaker)
+            self.page = 0
+            self.pageTemplate = self.pageTemplates[0]
+            self.beforeDocument()
+            canv._doctemplate = self
+            try:
+                for i, pages in enumerate(layouts):
+                    self._replaySection(pages)
+                    if self._onProgress:
+                        self._onProgress('PROGRESS',i+1)
+            finally:
+                del canv._doctemplate
+        finally:
+            _sectionJob = None
+            if pool:
+                pool.terminate()
+                pool.join()
+        self._removeVars(('build','page','frame'))
+        canv.save()
+        if self._onProgress:
+            self._onProgress('FINISHED',0)
+
+    def _sectionPageTemplateIndex(self, i):
+        '''the page template index that section i starts with'''
+        return self._firstPageTemplateIndex
+
+    def _replaySection(self, pages):
+        '''draw the pages recorded by _layoutSection'''
+        canv = self.canv
+        for pti, ops, postOps in pages:
+            self.pageTemplate = pt = self.pageTemplates[pti]
+            self.page += 1
+            pt.beforeDrawPage(canv,self)
+            pt.checkPageSize(canv,self)
+            pt.drawStatic(canv,self)
+            pt.onPage(canv,self)
+            for f in pt.frames: f._reset()
+            self.beforePage()
+            self.frame = pt.frames[0]
+            for op in ops:
+                kind, frame = op[:2]
+                if isinstance(frame,int): frame = pt.frames[frame]
+                self.frame = frame
+                if kind=='draw':
+                    f, x, y, sW = op[2:]
+                    f._frame = frame
+                    f.canv = canv
+                    try:
+                        f.drawOn(canv, x, y, _sW=sW)
+                    finally:
+                        for a in ('canv', '_frame'):
+                            if hasattr(f,a):
+                                delattr(f,a)
+                elif kind=='after':
+                    self.afterFlowable(op[2])
+                elif kind=='bg':
+                    op[2].render(canv,frame,*op[3:])
+                else:
+                    frame.drawBoundary(canv,op[2])
+            self._removeVars(('page','frame'))
+            if self._onProgress:
+                self._onProgress('PAGE', canv.getPageNumber())
+            pt.afterDrawPage(canv, self)
+            pt.onPageEnd(canv, self)
+            self.afterPage()
+            canv.setPageRotation(getattr(pt,'rotation',self.rotation))
+            canv.showPage()
+            for f in postOps:
+                self.afterFlowable(f)
+
     def _allSatisfied(self):
         """Called by multi-build - are all cross-references resolved?"""
         allHappy = 1
@@ -1298,9 +1685,11 @@ class SimpleDocTemplate(BaseDocTemplate):
         self._handle_pageBegin()
         self._handle_nextPageTemplate('Later')
 
-    def build(self,flowables,onFirstPage=_doNothing, onLaterPages=_doNothing, canvasmaker=canvas.Canvas):
+    def build(self,flowables,onFirstPage=_doNothing, onLaterPages=_doNothing, canvasmaker=canvas.Canvas, onPageStatic=None):
         """build the document using the flowables.  Annotate the first page using the onFirstPage
-               function and later pages using the onLaterPages function.  The onXXX pages should follow
+               function and later pages using the onLaterPages function.  Decoration that is the same
+               on every page may be drawn by onPageStatic; it is drawn once into a form which is
+               reused on each page (see PageTemplate).  The onXXX pages should follow
                the signature
 
                   def myOnFirstPage(canvas, document):
@@ -1311,15 +1700,30 @@ class SimpleDocTemplate(BaseDocTemplate):
                footers, etcetera. They can use external variables to vary
                the look (for example providing page numbering or section names).
         """
+        self._addSimpleTemplates(onFirstPage,onLaterPages,onPageStatic)
+        BaseDocTemplate.build(self,flowables, canvasmaker=canvasmaker)
+
+    def buildSections(self, sections, onFirstPage=_doNothing, onLaterPages=_doNothing, filename=None,
+            canvasmaker=canvas.Canvas, processes=None, onPageStatic=None):
+        """build the document from a list of sections as BaseDocTemplate.buildSections does
+           using the page templates and callbacks of the build method; sections after the
+           first start on a later page.
+        """
+        self._addSimpleTemplates(onFirstPage,onLaterPages,onPageStatic)
+        BaseDocTemplate.buildSections(self,sections,filename=filename,canvasmaker=canvasmaker,processes=processes)
+
+    def _addSimpleTemplates(self,onFirstPage,onLaterPages,onPageStatic):
         self._calc()    #in case we changed margins sizes etc
         frameT = Frame(self.leftMargin, self.bottomMargin, self.width, self.height, id='normal')
-        self.addPageTemplates([PageTemplate(id='First',frames=frameT, onPage=onFirstPage,pagesize=self.pagesize),
-                        PageTemplate(id='Later',frames=frameT, onPage=onLaterPages,pagesize=self.pagesize)])
+        self.addPageTemplates([PageTemplate(id='First',frames=frameT, onPage=onFirstPage,pagesize=self.pagesize,onPageStatic=onPageStatic),
+                        PageTemplate(id='Later',frames=frameT, onPage=onLaterPages,pagesize=self.pagesize,onPageStatic=onPageStatic)])
         if onFirstPage is _doNothing and hasattr(self,'onFirstPage'):
             self.pageTemplates[0].beforeDrawPage = self.onFirstPage
         if onLaterPages is _doNothing and hasattr(self,'onLaterPages'):
             self.pageTemplates[1].beforeDrawPage = self.onLaterPages
-        BaseDocTemplate.build(self,flowables, canvasmaker=canvasmaker)
+
+    def _sectionPageTemplateIndex(self, i):
+        return 1 if i else 0
 
 def progressCB(typ, value):
     """Example prototype for progress monitoring.
@@ -41,7 +41,7 @@ __all__ = '''AnchorFlowable BalancedColumns BulletDrawer CallerMacro CondPageBre
         HRFlowable Image ImageAndFlowables KeepInFrame KeepTogether LIIndenter ListFlowable ListItem
         Macro NullDraw PTOContainer PageBreak PageBreakIfNotEmpty ParagraphAndImage Preformatted
         SetPageTopFlowables SetTopFlowables SlowPageBreak Spacer TopPadder TraceInfo UseUpSpace XBox
-        splitLine splitLines PlacedStory'''.split()
+        splitLine splitLines PlacedStory Precompiled precompileStory clearPrecompiledStories'''.split()
 
 class TraceInfo:
     "Holder for info about where an object originated"
@@ -68,6 +68,7 @@ class Flowable:
     """
     _fixedWidth = 0         #assume wrap results depend on arguments?
     _fixedHeight = 0
+    _precompilable = 0      #wrap depends only on the width so a layout may be kept for reuse; not inherited
 
     def __init__(self):
         self.width = 0
@@ -109,7 +110,11 @@ class Flowable:
         x = self._hAlignAdjust(x,_sW)
         canvas.saveState()
         canvas.translate(x, y)
-        self._drawOn(canvas)
+        prof = getattr(canvas,'_layoutProfiler',None)
+        if prof:
+            prof.call('draw',self,self._drawOn,canvas)
+        else:
+            self._drawOn(canvas)
         if hasattr(self, '_showBoundary') and self._showBoundary:
             #diagnostic tool support
             canvas.setStrokeColor(gray)
@@ -120,7 +125,8 @@ class Flowable:
         '''intended for use by packers allows setting the canvas on
         during the actual wrap'''
         self.canv = canv
-        w, h = self.wrap(aW,aH)
+        prof = getattr(canv,'_layoutProfiler',None)
+        w, h = prof.call('wrap',self,self.wrap,aW,aH) if prof else self.wrap(aW,aH)
         del self.canv
         return w, h
 
@@ -138,7 +144,8 @@ class Flowable:
         '''intended for use by packers allows setting the canvas on
         during the actual split'''
         self.canv = canv
-        S = self.split(aW,aH)
+        prof = getattr(canv,'_layoutProfiler',None)
+        S = prof.call('split',self,self.split,aW,aH) if prof else self.split(aW,aH)
         del self.canv
         return S
 
@@ -314,6 +321,7 @@ class Preformatted(Flowable):
     You can optionally define a maximum line length and the code will be wrapped; and
     extra characters to be inserted at the beginning of each wrapped line (e.g. '> ').
     """
+    _precompilable = 1
     def __init__(self, text, style, bulletText = None, dedent=0, maxLineLength=None, splitChars=None, newLineChars=""):
         """text is the text to display. If dedent is set then common leading space
         will be chopped off the front (for example if the entire text is indented
@@ -618,9 +626,7 @@ def _listWrapOn(F,availWidth,canv,mergeSpace=1,obj=None,dims=None,fakeWidth=None
     if cframe:
         from reportlab.platypus.doctemplate import _addGeneratedContent, Indenter
         doct_frame = cframe
-        cframe = doct.frame = deepcopy(doct_frame)
-        cframe._generated_content = None
-        del cframe._generated_content
+        cframe = doct.frame = doct_frame._copy()
     try:
         W = 0
         H = 0
@@ -1280,9 +1286,151 @@ class PlacedStory(Flowable):
         self.kif.drawOn(canv,x,y)
         if self.sb: canv.drawBoundary(self.sb,x,y,self.w,self.h)
 
+class Precompiled(Flowable):
+    '''A flowable laid out once and then reused, typically in many documents.
+
+    The wrapped flowable is wrapped at width (or at the first width asked for)
+    and keeps its line breaks and sizes; later wraps at that width just return
+    the stored size, drawing goes straight to the laid out flowable and only a
+    split does any new layout work.
+    '''
+    def __init__(self, flowable, width=None, canv=None):
+        self._flowable = flowable
+        self._aW = None
+        for a in ('_ZEROSIZE','_SPACETRANSFER'):
+            if hasattr(flowable,a):
+                setattr(self,a,getattr(flowable,a))
+        if width is not None:
+            self._layout(canv,width)
+
+    def _layout(self, canv, aW):
+        self.width, self.height = self._flowable.wrapOn(canv,aW,0xfffffff)
+        self._aW = aW
+
+    def wrap(self, aW, aH):
+        if aW!=self._aW:
+            self._layout(self.canv,aW)
+        return self.width, self.height
+
+    def split(self, aW, aH):
+        if aW!=self._aW:
+            self._layout(self.canv,aW)
+        #split a shallow copy so the kept layout is not disturbed
+        S = copy(self._flowable).splitOn(self.canv,aW,aH)
+        if S: self.__dict__.pop('_postponed',None)
+        return S
+
+    def drawOn(self, canvas, x, y, _sW=0):
+        #we may be reused in another document so forget any postponement
+        self.__dict__.pop('_postponed',None)
+        self._flowable.drawOn(canvas, x, y, _sW)
+
+    def getSpaceBefore(self):
+        return self._flowable.getSpaceBefore()
+
+    def getSpaceAfter(self):
+        return self._flowable.getSpaceAfter()
+
+    def getKeepWithNext(self):
+        return self._flowable.getKeepWithNext()
+
+    def minWidth(self):
+        return self._flowable.minWidth()
+
+    def identity(self, maxLen=None):
+        return self._flowable.identity(maxLen)
+
+def _precompiledDeps(F, styles, fonts):
+    '''collect the styles and font names the flowables F depend on'''
+    for f in F:
+        if isinstance(f,(list,tuple)):
+            _precompiledDeps(f,styles,fonts)
+            continue
+        if isinstance(f,Precompiled):
+            f = f._flowable
+        style = getattr(f,'style',None)
+        if hasattr(style,'fontName'):
+            styles[id(style)] = style, style.__dict__.copy()
+            fonts.add(style.fontName)
+        for frag in getattr(f,'frags',None) or ():
+            fn = getattr(frag,'fontName',None)
+            if fn: fonts.add(fn)
+        for row in getattr(f,'_cellStyles',None) or ():
+            for cs in row:
+                fonts.add(cs.fontname)
+        for row in getattr(f,'_cellvalues',None) or ():
+            _precompiledDeps([v for v in row if isinstance(v,(Flowable,list,tuple))],styles,fonts)
+        C = getattr(f,'_content',None)
+        if C: _precompiledDeps(C,styles,fonts)
+
+def _fontsInUse(names):
+    from reportlab.pdfbase.pdfmetrics import getFont
+    F = {}
+    for fn in names:
+        try:
+            F[fn] = getFont(fn)
+        except:
+            F[fn] = None
+    return F
+
+def _isPrecompilable(f):
+    '''only the classes that say so themselves; a subclass may change how it wraps'''
+    return f.__class__.__dict__.get('_precompilable',0)
+
+from collections import OrderedDict
+_precompiledStories = OrderedDict()
+_precompiledStoriesSize = 32
+
+def clearPrecompiledStories():
+    '''forget all the stories remembered by precompileStory'''
+    _precompiledStories.clear()
+
+def precompileStory(story, width=None, key=None, canv=None):
+    '''Return a copy of story with each flowable that allows it wrapped in a Precompiled,
+    laid out at width (or when first wrapped) and kept for reuse.
+
+    story may also be a callable returning the story.  If key is given the result is
+    remembered under (key,width) and later calls return the same laid out flowables
+    without calling the story callable, as long as the paragraph styles and fonts
+    they use are unchanged; otherwise the story is precompiled afresh.
+    Nothing is pickled; the cache lives in this process, keeps only the most recently
+    used stories and may be emptied with clearPrecompiledStories.
+    '''
+    if key is not None:
+        ck = key, width
+        c = _precompiledStories.get(ck)
+        if c:
+            P, styles, fonts = c
+            if (all(s.__dict__==d for s,d in styles.values())
+                    and _fontsInUse(fonts)==fonts):
+                _precompiledStories.move_to_end(ck)
+                return P[:]
+    if callable(story):
+        story = story()
+    if not isinstance(story,(list,tuple)):
+        story = [story]
+    P = [Precompiled(f,width,canv) if _isPrecompilable(f) else f for f in story]
+    if key is not None:
+        styles = {}
+        fonts = set()
+        _precompiledDeps(P,styles,fonts)
+        _precompiledStories[ck] = P, styles, _fontsInUse(fonts)
+        _precompiledStories.move_to_end(ck)
+        if len(_precompiledStories)>_precompiledStoriesSize:
+            _precompiledStories.popitem(last=False)
+    return P[:]
+
+from reportlab.rl_config import register_reset
+register_reset(clearPrecompiledStories)
+del register_reset
+
 class _FindSplitterMixin:
-    def _findSplit(self,canv,availWidth,availHeight,mergeSpace=1,obj=None,content=None,paraFix=True):
-        '''return max width, required height for a list of flowables F'''
+    def _findSplit(self,canv,availWidth,availHeight,mergeSpace=1,obj=None,content=None,paraFix=True,measured=None):
+        '''return max width, required height for a list of flowables F
+
+        measured if not None is a dict shared between calls that caches each flowable's
+        unbounded height wrap at its last width and the splits of straddling flowables.
+        '''
         W = 0
         H = 0
         pS = sB = 0
@@ -1297,7 +1445,15 @@ class _FindSplitterMixin:
                 if isinstance(f,Indenter):
                     availWidth -= f.left+f.right
                 continue
-            w,h = f.wrapOn(canv,availWidth,0xfffffff)
+            if measured is None:
+                w,h = f.wrapOn(canv,availWidth,0xfffffff)
+            else:
+                m = measured.get(id(f))
+                if m and m[1]==availWidth:
+                    w,h = m[2:]
+                else:
+                    w,h = f.wrapOn(canv,availWidth,0xfffffff)
+                    measured[id(f)] = f,availWidth,w,h
             if w<=_FUZZ or h<=_FUZZ: continue
             W = max(W,w)
             if not atTop:
@@ -1320,10 +1476,16 @@ class _FindSplitterMixin:
                         if nH<aH: nH += leading
                         availHeight += nH-aH
                         aH = nH
-                try:
-                    S = cdeepcopy(f).splitOn(canv,availWidth,aH)
-                except:
-                    S  = None   #sometimes the deepcopy cannot be done
+                k = id(f),availWidth,aH
+                if measured is not None and k in measured:
+                    S = measured[k]
+                else:
+                    try:
+                        S = cdeepcopy(f).splitOn(canv,availWidth,aH)
+                    except:
+                        S  = None   #sometimes the deepcopy cannot be done
+                    if measured is not None:
+                        measured[k] = S
                 if not S:
                     return W, availHeight, F[:i],F[i:]
                 else:
@@ -1602,7 +1764,10 @@ class BalancedColumns(_FindSplitterMixin,NullDraw):
         cw = (aW - gap*(nCols-1) - lpad - rpad)/float(nCols)
         aH0 = aH
         aH -= tpad + bpad
-        W,H0,_C0,C2 = self._findSplit(canv,cw,nCols*aH,paraFix=False)
+        #each flowable is wrapped once at the column width and the splits of
+        #those straddling a column end are kept for the trial heights below
+        measured = {}
+        W,H0,_C0,C2 = self._findSplit(canv,cw,nCols*aH,paraFix=False,measured=measured)
         if not _C0:
             raise ValueError(
                     "%s cannot make initial split aW=%r aH=%r ie cw=%r ah=%r\ncontent=%s" % (
@@ -1618,12 +1783,12 @@ class BalancedColumns(_FindSplitterMixin,NullDraw):
                 cn = None
                 icheck = nCols-2 if endSlack else -1
                 for i in range(nCols):
-                    wi, hi, c0, c1 = self._findSplit(canv,cw,ah,content=cn,paraFix=False)
+                    wi, hi, c0, c1 = self._findSplit(canv,cw,ah,content=cn,paraFix=False,measured=measured)
                     w = max(w,wi)
                     h = max(h,hi)
                     c.append(c0)
                     if i==icheck:
-                        wc, hc, cc0, cc1 = self._findSplit(canv,cw,2*ah,content=c1,paraFix=False)
+                        wc, hc, cc0, cc1 = self._findSplit(canv,cw,2*ah,content=c1,paraFix=False,measured=measured)
                         if hc<=(1+endSlack)*ah:
                             c.append(c1)
                             h = ah-1e-6
@@ -1689,6 +1854,7 @@ class BalancedColumns(_FindSplitterMixin,NullDraw):
             assert not C2, "unexpected non-empty C2"
         W1, H1, C, C1 = splitFunc(H, endSlack)
         _fres.clear()
+        measured.clear()
         if C[0]==[] and C[1]==[] and C1:
             #no split situation
             C, C1 = [C1,C[1]], C[0]
@@ -154,8 +154,9 @@ class Frame:
                         s = self._prevASpace
                     s = max(s-self._prevASpace,0)
             h = y - p - s
+            prof = getattr(canv,'_layoutProfiler',None)
             if h>0 or zeroSize:
-                w, h = flowable.wrap(aW, h)
+                w, h = prof.call('wrap',flowable,flowable.wrap,aW,h) if prof else flowable.wrap(aW, h)
             else:
                 return 0
 
@@ -171,6 +172,7 @@ class Frame:
             else:
                 #now we can draw it, and update the current point.
                 sa = flowable.getSpaceAfter()
+                rec = getattr(canv,'_frameRecorder',None)   #see BaseDocTemplate.buildSections
                 fbg = getattr(self,'_frameBGs',None)
                 if fbg and fbg[-1].active:
                     bg = fbg[-1]
@@ -194,11 +196,19 @@ class Frame:
                                 fbg[-1].start = 'frame-permanent-1'
                         else:
                             fby = fbw = fbh = 0
-                    bg.render(canv,self,fbx,fby,fbw,fbh)
+                    if rec:
+                        rec.record('bg',self,bg,fbx,fby,fbw,fbh)
+                    else:
+                        bg.render(canv,self,fbx,fby,fbw,fbh)
                     if bgm=='frame':
                         fbg.pop()
 
-                flowable.drawOn(canv, self._x + self._leftExtraIndent, y, _sW=aW-w)
+                if rec:
+                    rec.record('draw',self,flowable,self._x + self._leftExtraIndent, y, aW-w)
+                elif prof:
+                    prof.call('draw',flowable,flowable.drawOn,canv, self._x + self._leftExtraIndent, y, aW-w)
+                else:
+                    flowable.drawOn(canv, self._x + self._leftExtraIndent, y, _sW=aW-w)
                 flowable.canv=canv
                 if self._debug: logger.debug('drew %s' % flowable.identity())
                 y -= sa
@@ -232,7 +242,8 @@ class Frame:
         flowable._frame = self                  #some flowables might need these
         flowable.canv = canv
         try:
-            r = flowable.split(self._aW, h)
+            prof = getattr(canv,'_layoutProfiler',None)
+            r = prof.call('split',flowable,flowable.split,self._aW,h) if prof else flowable.split(self._aW, h)
         finally:
             #sometimes canv/_frame aren't still on the flowable
             for a in ('canv', '_frame'):
@@ -241,7 +252,11 @@ class Frame:
         return r
 
     def drawBoundary(self, canv, __boundary__=None):
-        canv.drawBoundary(__boundary__ or self.showBoundary, self._x1, self._y1,
+        rec = getattr(canv,'_frameRecorder',None)
+        if rec:
+            rec.record('boundary',self,__boundary__)
+        else:
+            canv.drawBoundary(__boundary__ or self.showBoundary, self._x1, self._y1,
                                 self._x2 - self._x1, self._y2 - self._y1)
 
     def addFromList(self, drawlist, canv):
@@ -261,6 +276,17 @@ class Frame:
                 #leave it in the list for later
                 break
 
+    def _copy(self):
+        '''return a cheap working copy of this frame for simulated layout;
+        list and dict attributes are copied one level deep and any pending
+        generated content is dropped'''
+        f = self.__class__.__new__(self.__class__)
+        D = f.__dict__
+        for k,v in self.__dict__.items():
+            if k!='_generated_content':
+                D[k] = v.copy() if isinstance(v,(list,dict)) else v
+        return f
+
     def add_generated_content(self,*C):
         self.__dict__.setdefault('_generated_content',[]).extend(C)
 
@@ -10,7 +10,9 @@ __all__=(
 __version__='3.5.20'
 __doc__='''The standard paragraph implementation'''
 from string import whitespace
-from operator import truth
+from operator import truth, gt
+from itertools import accumulate
+from bisect import bisect_right
 from unicodedata import category
 from reportlab.pdfbase.pdfmetrics import stringWidth, getAscentDescent, getFont
 from reportlab.pdfgen.textobject import rtlSupport, bidiText, bidiWordList, isBidiStr,\
@@ -1261,6 +1263,55 @@ def _hyphenateWord(hyphenator,fontName,fontSize,w,ww,newWidth,maxWidth, uriWaste
         else:
             return [(_SplitWordHY if hy else _SplitWordH)(h+hy),_SplitWordEnd(t)]
 
+def _prefixSumBreakWords(words, maxWidths, fontName, fontSize, spaceWidth, dSpaceShrink, splitLongWords, encoding='utf8'):
+    '''greedy line breaking of plain words in a single font.
+
+    Word widths are measured once; each line end is found by binary search over
+    cumulative widths and then confirmed against the exact running widths the
+    word by word loop in Paragraph.breakLines would compute, so the result is
+    identical. Returns None if the words need that loop (soft hyphens, already
+    split words or a word that would have to be split).
+    '''
+    for w in words:
+        if w.__class__ is not str or _shy in w: return None
+    WM = {}
+    for w in words:
+        if w not in WM:
+            WM[w] = stringWidth(w, fontName, fontSize, encoding)
+    W = list(map(WM.__getitem__,words))
+    if splitLongWords and max(W)>min(maxWidths): return None
+    sdw = spaceWidth - dSpaceShrink
+    G = list(accumulate(W,initial=0))  #cumulative widths with shrunk spaces
+    if sdw:
+        G = [g+k*sdw for k,g in enumerate(G)]
+    n = len(W)
+    maxlineno = len(maxWidths)-1
+    lines = []
+    widthMax = 0
+    i = lineno = 0
+    while i<n:
+        maxWidth = maxWidths[min(maxlineno,lineno)]
+        m = bisect_right(G,G[i]+maxWidth+sdw,i+1)-i  #estimated words on this line
+        while 1:
+            j = min(n,i+m+2)
+            X = [spaceWidth]*(2*(j-i)-1)
+            X[0::2] = W[i:j]
+            R = list(accumulate(X))[0::2]   #exact running widths as the loop computes them
+            F = list(map(gt,R[1:],[maxWidth+dSpaceShrink*k for k in range(1,j-i)]))
+            if True in F:
+                k = F.index(True)+1
+                break
+            if j==n:
+                k = j-i
+                break
+            m *= 2
+        currentWidth = R[k-1]
+        if currentWidth>widthMax: widthMax = currentWidth
+        lines.append((maxWidth - currentWidth, words[i:i+k]))
+        i += k
+        lineno += 1
+    return lines, widthMax
+
 def _splitWord(w, lineWidth, maxWidths, lineno, fontName, fontSize, encoding='utf8'):
     '''
     split w into words that fit in lines of length
@@ -1853,6 +1904,7 @@ class Paragraph(Flowable):
 
         It will also be able to handle any MathML specified Greek characters.
     """
+    _precompilable = 1
     def __init__(self, text, style=None, bulletText = None, frags=None, caseSensitive=1, encoding='utf8'):
         if style is None:
             style = ParagraphStyle(name='paragraphImplicitDefaultStyle')
@@ -2164,6 +2216,12 @@ class Paragraph(Flowable):
                     return f.clone(kind=0, lines=[],ascent=ascent,descent=descent,fontSize=fontSize)
             spaceWidth = stringWidth(' ', fontName, fontSize, self.encoding)
             dSpaceShrink = spaceShrinkage*spaceWidth
+            if not (doBidi or attemptHyphenation) and 0<=dSpaceShrink<=spaceWidth:
+                R = _prefixSumBreakWords(words, maxWidths, fontName, fontSize, spaceWidth,
+                                dSpaceShrink, splitLongWords, self.encoding)
+                if R:
+                    lines, self._width_max = R
+                    return f.clone(kind=0, lines=lines,ascent=ascent,descent=descent,fontSize=fontSize)
             cLine = []
             currentWidth = -spaceWidth   # hack to get around extra space for word 1
             hyw = stringWidth('-', fontName, fontSize, self.encoding)
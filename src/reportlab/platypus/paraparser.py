@@ -22,6 +22,14 @@ from html.entities import name2codepoint
 
 _re_para = re.compile(r'^\s*<\s*para(?:\s+|>|/>)')
 
+#tokens recognised by ParaParser's fast path; any text not completely covered by
+#these is handed to HTMLParser.feed. The grammar is a strict subset of what
+#HTMLParser accepts and yields exactly the same handler calls.
+_fastTokenRe = re.compile(r'''([^&<]+)'''
+        r'''|<(/?)(b|i|strong|em|font|br|para)((?:[ \t\n\r\f]+[a-zA-Z_][-.:a-zA-Z0-9_]*[ \t\n\r\f]*=[ \t\n\r\f]*(?:"[^"&<]*"|'[^'&<]*'))*)[ \t\n\r\f]*(/?)>'''
+        r'''|&(#(?:[0-9]+|[xX][0-9a-fA-F]+)|[a-zA-Z][-.a-zA-Z0-9]*);''',re.I)
+_fastAttrRe = re.compile(r'''([a-zA-Z_][-.:a-zA-Z0-9_]*)[ \t\n\r\f]*=[ \t\n\r\f]*(?:"([^"&<]*)"|'([^'&<]*)')''')
+
 sizeDelta = 2       # amount to reduce font size by for super and sub script
 subFraction = 0.5   # fraction of font size that a sub script should be lowered
 supFraction = 0.5 # fraction of font size that a super script should be raised
@@ -2501,6 +2509,11 @@ class ParaFrag(ABag):
     segments as they are being parsed by the ParaParser.
     fontname, fontSize, rise, textColor, cbDefn
     """
+    def __copy__(self):
+        #same result as the generic copy.copy, but without the reduce protocol
+        n = self.__class__.__new__(self.__class__)
+        n.__dict__.update(self.__dict__)
+        return n
 
 _greek2Utf8=None
 def _greekConvert(data):
@@ -3083,6 +3096,8 @@ class ParaParser(HTMLParser):
 
     #----------------------------------------------------------------
 
+    fastParse = 1   #set false to always use the HTMLParser tokenizer
+
     def __init__(self,verbose=0, caseSensitive=0, ignoreUnknownTags=1, crashOnError=True):
         HTMLParser.__init__(self, **(dict(convert_charrefs=False)))
         self.verbose = verbose
@@ -3215,11 +3230,52 @@ class ParaParser(HTMLParser):
         if not(len(text)>=6 and text[0]=='<' and _re_para.match(text)):
             text = u"<para>"+text+u"</para>"
         try:
-            self.feed(text)
+            if not (self.fastParse and self._fastFeed(text)):
+                self.feed(text)
         except:
             annotateException('\nparagraph text %s caused exception' % ascii(text))
         return self._complete_parse()
 
+    def _fastFeed(self, text):
+        '''tokenize simple markup (plain text, entities, b/i/strong/em/font/br)
+        without HTMLParser; return False, having done nothing, if text
+        contains anything else'''
+        T = []
+        pos = 0
+        for m in _fastTokenRe.finditer(text):
+            if m.start()!=pos: return False
+            pos = m.end()
+            data, close, tag, attrs, selfClose, ref = m.groups()
+            if data is not None:
+                T.append((0,data))
+            elif tag is not None:
+                tag = tag.lower()
+                if close:
+                    if attrs or selfClose: return False
+                    T.append((2,tag))
+                else:
+                    A = {}
+                    if attrs:
+                        for a in _fastAttrRe.finditer(attrs):
+                            v = a.group(2)
+                            A[a.group(1).lower()] = a.group(3) if v is None else v
+                    T.append((1,(tag,A)))
+                    if selfClose: T.append((2,tag))
+            elif ref[0]=='#':
+                T.append((3,ref[1:]))
+            else:
+                T.append((4,ref))
+        if pos!=len(text): return False
+        handlers = (self.handle_data,
+                    lambda x: self.handle_starttag(*x),
+                    self.handle_endtag,
+                    self.handle_charref,
+                    self.handle_entityref,
+                    )
+        for k, v in T:
+            handlers[k](v)
+        return True
+
     def handle_starttag(self, tag, attrs):
         "Called by HTMLParser when a tag starts"
 
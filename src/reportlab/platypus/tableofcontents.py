@@ -69,6 +69,23 @@ except:
             if x not in self:
                 list.append(self,x)
 
+def _digestEntry(digest, entry):
+    '''chain entry into a running digest; None means the entries can only be compared in full'''
+    if digest is not None:
+        try:
+            return hash((digest,entry))
+        except TypeError:
+            pass
+
+def _reuseParagraph(text, style, old, new):
+    '''return a Paragraph for text in style, reusing one from the previous build if possible'''
+    k = text, id(style)
+    p = old.pop(k,None)
+    if p is None:
+        p = Paragraph(text, style)
+    new.setdefault(k,p)
+    return p
+
 def drawPageNumbers(canvas, style, pages, availWidth, availHeight, dot=' . ', formatter=None):
     '''
     Draws pagestr on the canvas using the given style.
@@ -168,18 +185,24 @@ class TableOfContents(IndexingFlowable):
         self._notifyKind = kwds.pop('notifyKind','TOCEntry')
         if kwds: raise ValueError('unexpected keyword arguments %s' % ', '.join(kwds.keys()))
         self._table = None
-        self._entries = []
+        self._tableKey = None
+        self._paraCache = {}
+        self.clearEntries()
         self._lastEntries = []
+        self._lastDigest = self._digest
 
     def beforeBuild(self):
         # keep track of the last run
         self._lastEntries = self._entries[:]
+        self._lastDigest = self._digest
         self.clearEntries()
 
     def isIndexing(self):
         return 1
 
     def isSatisfied(self):
+        if self._digest is not None and self._digest != self._lastDigest:
+            return False
         return (self._entries == self._lastEntries)
 
     def notify(self, kind, stuff):
@@ -192,6 +215,7 @@ class TableOfContents(IndexingFlowable):
 
     def clearEntries(self):
         self._entries = []
+        self._digest = 0
 
     def getLevelStyle(self, n):
         '''Returns the style for level n, generating and caching styles on demand if not present.'''
@@ -213,7 +237,9 @@ class TableOfContents(IndexingFlowable):
         Requires that enough styles are defined."""
 
         assert type(level) == type(1), "Level must be an integer"
-        self._entries.append((level, text, pageNum, key))
+        entry = (level, text, pageNum, key)
+        self._entries.append(entry)
+        self._digest = _digestEntry(self._digest, entry)
 
 
     def addEntries(self, listOfEntries):
@@ -251,24 +277,33 @@ class TableOfContents(IndexingFlowable):
             drawPageNumbers(canvas, style, [(page, key)], availWidth, availHeight, dot)
         self.canv.setNamedCB('drawTOCEntryEnd',drawTOCEntryEnd)
 
-        tableData = []
-        for (level, text, pageNum, key) in _tempEntries:
-            style = self.getLevelStyle(level)
-            if key:
-                text = '<a href="#%s">%s</a>' % (key, text)
-                keyVal = repr(key).replace(',','\\x2c').replace('"','\\x2c')
-            else:
-                keyVal = None
-            para = Paragraph('%s<onDraw name="drawTOCEntryEnd" label="%d,%d,%s"/>' % (text, pageNum, level, keyVal), style)
-            if style.spaceBefore:
-                tableData.append([Spacer(1, style.spaceBefore),])
-            tableData.append([para,])
+        #the table only needs rebuilding when the entries, width or styles change
+        if self._table is None or self._tableKey != self._getTableKey(availWidth) or self._tableEntries != _tempEntries:
+            old = self._paraCache
+            self._paraCache = new = {}
+            tableData = []
+            for (level, text, pageNum, key) in _tempEntries:
+                style = self.getLevelStyle(level)
+                if key:
+                    text = '<a href="#%s">%s</a>' % (key, text)
+                    keyVal = repr(key).replace(',','\\x2c').replace('"','\\x2c')
+                else:
+                    keyVal = None
+                para = _reuseParagraph('%s<onDraw name="drawTOCEntryEnd" label="%d,%d,%s"/>' % (text, pageNum, level, keyVal), style, old, new)
+                if style.spaceBefore:
+                    tableData.append([Spacer(1, style.spaceBefore),])
+                tableData.append([para,])
 
-        self._table = Table(tableData, colWidths=(availWidth,), style=self.tableStyle)
+            self._table = Table(tableData, colWidths=(availWidth,), style=self.tableStyle)
+            self._tableKey = self._getTableKey(availWidth)
+            self._tableEntries = list(_tempEntries)
 
         self.width, self.height = self._table.wrapOn(self.canv,availWidth, availHeight)
         return (self.width, self.height)
 
+    def _getTableKey(self, availWidth):
+        return availWidth, self.tableStyle, tuple(self.levelStyles), self._lastDigest
+
 
     def split(self, availWidth, availHeight):
         """At this stage we do not care about splitting the entries,
@@ -302,9 +337,11 @@ class SimpleIndex(IndexingFlowable):
         Accepts the same arguments as the setup method.
         """
         #keep stuff in a dictionary while building
-        self._entries = {}
+        self.clearEntries()
         self._lastEntries = {}
+        self._lastDigest = self._digest
         self._flowable = None
+        self._paraCache = {}
         self._notifyKind = kwargs.pop('notifyKind','IndexEntry')
         self.setup(**kwargs)
 
@@ -348,6 +385,7 @@ class SimpleIndex(IndexingFlowable):
         self.name = name
         self.formatFunc = self.getFormatFunc(format)
         self.offset = offset
+        self._buildKey = None
 
     def __call__(self,canv,kind,label):
         label = asNative(label,'latin1')
@@ -386,15 +424,20 @@ class SimpleIndex(IndexingFlowable):
         return 1
 
     def isSatisfied(self):
+        if self._digest != self._lastDigest:
+            return False
         return (self._entries == self._lastEntries)
 
     def beforeBuild(self):
         # keep track of the last run
         self._lastEntries = self._entries.copy()
+        self._lastDigest = self._digest
         self.clearEntries()
 
     def clearEntries(self):
         self._entries = {}
+        #(count, xor of hashes) of the distinct entries; a cheap order free inequality test
+        self._digest = (0, 0)
 
     def notify(self, kind, stuff):
         """The notification hook called to register all kinds of events.
@@ -407,7 +450,13 @@ class SimpleIndex(IndexingFlowable):
 
     def addEntry(self, text, pageNum, key=None):
         """Allows incremental buildup"""
-        self._entries.setdefault(makeTuple(text),set([])).add((pageNum, key))
+        text = makeTuple(text)
+        pages = self._entries.setdefault(text,set([]))
+        entry = (pageNum, key)
+        if entry not in pages:
+            pages.add(entry)
+            n, h = self._digest
+            self._digest = (n+1, h ^ hash((text,entry)))
 
     def split(self, availWidth, availHeight):
         """At this stage we do not care about splitting the entries,
@@ -425,11 +474,6 @@ class SimpleIndex(IndexingFlowable):
         return list(sorted(lE.items()))
 
     def _build(self,availWidth,availHeight):
-        _tempEntries = [(tuple(asUnicode(t) for t in texts),pageNumbers)
-                            for texts, pageNumbers in self._getlastEntries()]
-        def getkey(seq):
-            return [''.join((c for c in unicodedata.normalize('NFD', x.upper()) if unicodedata.category(c) != 'Mn')) for x in seq[0]]
-        _tempEntries.sort(key=getkey)
         leveloffset = self.headers and 1 or 0
 
         def drawIndexEntryEnd(canvas, kind, label):
@@ -439,6 +483,20 @@ class SimpleIndex(IndexingFlowable):
             drawPageNumbers(canvas, style, pages, availWidth, availHeight, self.dot)
         self.canv.setNamedCB('drawIndexEntryEnd',drawIndexEntryEnd)
 
+        #the sort and the table are only redone when the entries, width or styles change
+        lE = self._lastEntries or self._entries
+        if (self._flowable is not None and lE and self._buildKey == self._getBuildKey(availWidth)
+                and self._builtEntries == lE):
+            return
+
+        _tempEntries = [(tuple(asUnicode(t) for t in texts),pageNumbers)
+                            for texts, pageNumbers in self._getlastEntries()]
+        def getkey(seq):
+            return [''.join((c for c in unicodedata.normalize('NFD', x.upper()) if unicodedata.category(c) != 'Mn')) for x in seq[0]]
+        _tempEntries.sort(key=getkey)
+
+        old = self._paraCache
+        self._paraCache = new = {}
         alpha = ''
         tableData = []
         lastTexts = []
@@ -456,7 +514,7 @@ class SimpleIndex(IndexingFlowable):
                 else:
                     header = ' '
                 tableData.append([Spacer(1, alphaStyle.spaceBefore),])
-                tableData.append([Paragraph(header, alphaStyle),])
+                tableData.append([_reuseParagraph(header, alphaStyle, old, new),])
                 tableData.append([Spacer(1, alphaStyle.spaceAfter),])
 
 
@@ -473,13 +531,19 @@ class SimpleIndex(IndexingFlowable):
                 text = escapeOnce(text)
 
                 style = self.getLevelStyle(i+leveloffset)
-                para = Paragraph(text, style)
+                para = _reuseParagraph(text, style, old, new)
                 if style.spaceBefore:
                     tableData.append([Spacer(1, style.spaceBefore),])
                 tableData.append([para,])
                 i += 1
 
         self._flowable = Table(tableData, colWidths=[availWidth], style=self.tableStyle)
+        self._buildKey = self._getBuildKey(availWidth)
+        self._builtEntries = {k:frozenset(v) for k,v in lE.items()}
+
+    def _getBuildKey(self, availWidth):
+        return (availWidth, self.tableStyle, self.headers, tuple(makeTuple(self.textStyle)),
+                self._lastDigest if self._lastEntries else self._digest)
 
     def wrap(self, availWidth, availHeight):
         "All table properties should be known by now."
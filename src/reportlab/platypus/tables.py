@@ -6,6 +6,7 @@ __all__= (
         'TableStyle',
         'CellStyle',
         'LongTable',
+        'StreamingTable',
         )
 __version__='3.5.21'
 
@@ -36,6 +37,8 @@ from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.platypus.doctemplate import Indenter, NullActionFlowable
 from reportlab.platypus.flowables import LIIndenter
 from collections import namedtuple
+from itertools import islice
+from bisect import bisect_right
 
 LINECAPS={None: None, 'butt':0,'round':1,'projecting':2,'squared':2}
 LINEJOINS={None: None, 'miter':0, 'mitre':0, 'round':1,'bevel':2}
@@ -264,12 +267,14 @@ RoundingRectLine = namedtuple('RoundingRectLine','xs ys xe ye weight color cap d
 
 _SPECIALROWS=("splitfirst", "splitlast", "inrowsplitstart","inrowsplitend")
 class Table(Flowable):
+    _precompilable = 1
+    _partialWrap = 0        #wrap may stop sizing rows once the available height is filled
     def __init__(self, data, colWidths=None, rowHeights=None, style=None,
                 repeatRows=0, repeatCols=0, splitByRow=1, splitInRow=0, emptyTableAction=None, ident=None,
                 hAlign=None,vAlign=None, normalizedData=0, cellStyles=None, rowSplitRange=None,
                 spaceBefore=None,spaceAfter=None, longTableOptimize=None, minRowHeights=None,
                 cornerRadii=__UNSET__, #or [topLeft, topRight, bottomLeft bottomRight]
-                renderCB=None, shadow=None
+                renderCB=None, shadow=None, batchText=None,
                 ):
         self.ident = ident
         self.hAlign = hAlign or 'CENTER'
@@ -287,6 +292,7 @@ class Table(Flowable):
         if not emptyTableAction: emptyTableAction = rl_config.emptyTableAction
         self._longTableOptimize = (getattr(self,'_longTableOptimize',rl_config.longTableOptimize)
                                     if longTableOptimize is None else longTableOptimize)
+        self._batchText = rl_config.tableBatchText if batchText is None else batchText
         if not (nrows and ncols):
             if emptyTableAction=='error':
                 raise ValueError(f'{self.identity()} must have at least a row and column')
@@ -332,13 +338,7 @@ class Table(Flowable):
         self._rowHeights = self._argH = rowHeights
         self._colWidths = self._argW = colWidths
         if cellStyles is None:
-            cellrows = []
-            for i in range(nrows):
-                cellcols = []
-                for j in range(ncols):
-                    cellcols.append(CellStyle(repr((i,j))))
-                cellrows.append(cellcols)
-            self._cellStyles = cellrows
+            self._cellStyles = _CellStyles(_CellStyleIndex(ncols),range(nrows))
         else:
             self._cellStyles = cellStyles
 
@@ -622,12 +622,13 @@ class Table(Flowable):
         fontSize = s.fontsize
         return max([stringWidth(x,fontName,fontSize) for x in v])
 
-    def _calc_height(self, availHeight, availWidth, H=None, W=None):
+    def _calc_height(self, availHeight, availWidth, H=None, W=None, partial=0):
+        '''size the rows; with partial and longTableOptimize stop once availHeight is filled'''
         H = self._argH
         if not W: W = _calc_pc(self._argW,availWidth)   #widths array
 
         hmax = lim = len(H)
-        longTable = self._longTableOptimize
+        longTable = partial and self._longTableOptimize
 
         if None in H:
             minRowHeights = self._minRowHeights
@@ -647,9 +648,18 @@ class Table(Flowable):
             H = H[:]    #make a copy as we'll change it
             self._rowHeights = H
             spanCons = {}
+            msr = -1        #last row of any span constraint
+            height = 0      #running sum of H[:i]
             FUZZ = rl_config._FUZZ
-            while None in H:
-                i = H.index(None)
+            for i in range(lim):
+                #we can stop if we have filled up all available room
+                #and all spans are complete in H[:i]
+                if longTable and height>availHeight and i>msr:
+                    hmax = i
+                    break
+                if H[i] is not None:
+                    height += H[i]
+                    continue
                 V = self._cellvalues[i] # values for row i
                 S = self._cellStyles[i] # styles for row i
                 h = 0
@@ -687,20 +697,12 @@ class Table(Flowable):
                             if r0!=r1:
                                 x = r0,r1
                                 spanCons[x] = max(spanCons.get(x,t),t)
+                                if r1>msr: msr = r1
                                 t = 0
                     if t>h: h = t   #record a new maximum
                 # If a minimum height has been specified use that, otherwise allow the cell to grow
-                H[i] = max(minRowHeights[i],h) if minRowHeights else h
-                # we can stop if we have filled up all available room
-                if longTable:
-                    hmax = i+1      #we computed H[i] so known len == i+1
-                    height = sum(H[:hmax])
-                    if height > availHeight:
-                        #we can terminate if all spans are complete in H[:hmax]
-                        if spanCons:
-                            msr = max(x[1] for x in spanCons.keys())    #RS=[endrowspan,.....]
-                            if hmax>msr:
-                                break
+                H[i] = h = max(minRowHeights[i],h) if minRowHeights else h
+                height += h
             if None not in H: hmax = lim
 
             if spanCons:
@@ -723,7 +725,7 @@ class Table(Flowable):
         j.reverse()     #reverse the reversed list of row positions
         self._hmax = hmax
 
-    def _calc(self, availWidth, availHeight):
+    def _calc(self, availWidth, availHeight, partial=0):
         #if hasattr(self,'_width'): return
 
         #in some cases there are unsizable things in
@@ -747,7 +749,7 @@ class Table(Flowable):
             self._calcNoSplitRanges()
 
         # calculate the full table height
-        self._calc_height(availHeight,availWidth,W=W)
+        self._calc_height(availHeight,availWidth,W=W,partial=partial)
 
         # calculate the full table width
         self._calc_width(availWidth,W=W)
@@ -1229,6 +1231,9 @@ only rows may be strings with values in {_SPECIALROWS!r}''')
                 (self._srflcmds if sr[0]=='s' else self._sircmds).append(cmd)
             else:
                 sc, ec, sr, er = self.normCellRange(sc,ec,sr,er)
+                if isinstance(self._cellStyles,_CellStyles):
+                    self._cellStyles.addCommand(op, values, sc, ec, sr, er)
+                    return
                 ec += 1
                 for i in range(sr, er+1):
                     for j in range(sc, ec):
@@ -1239,6 +1244,12 @@ only rows may be strings with values in {_SPECIALROWS!r}''')
         canv = self.canv
         canv.saveState()
 
+        #segments with the same stroke state are collected and stroked as one path
+        canvLine0 = canv.__dict__.get('line')
+        self._linePath = linePath = []
+        canv.line = lambda xs, ys, xe, ye: linePath.append((xs,ys,xe,ye))
+        strokeLinePath = self._strokeLinePath
+
         rrd = self._roundingRectDef
         if rrd: #we are collection some lines
             SL = rrd.SL
@@ -1260,23 +1271,31 @@ only rows may be strings with values in {_SPECIALROWS!r}''')
             for op, (sc,sr), (ec,er), weight, color, cap, dash, join, count, space in self._linecmds:
                 if isinstance(sr,strTypes) and sr in _SPECIALROWS: continue
                 if cap!=None and ccap!=cap:
+                    strokeLinePath()
                     canv.setLineCap(cap)
                     ccap = cap
                 if dash is None or dash == []:
                     if cdash is not None:
+                        strokeLinePath()
                         canv.setDash()
                         cdash = None
                 elif dash != cdash:
+                    strokeLinePath()
                     canv.setDash(dash)
                     cdash = dash
                 if join is not None and cjoin!=join:
+                    strokeLinePath()
                     canv.setLineJoin(join)
                     cjoin = join
                 sc, ec, sr, er = self.normCellRange(sc,ec,sr,er)
                 getattr(self,_LineOpMap.get(op, '_drawUnknown' ))( (sc, sr), (ec, er), weight, color, count, space)
+            strokeLinePath()
         finally:
-            if rrd:
-                canv.line = ocanvline
+            if canvLine0 is None:
+                del canv.line
+            else:
+                canv.line = canvLine0
+            del self._linePath
         canv.restoreState()
         self._curcolor = None
 
@@ -1306,12 +1325,21 @@ only rows may be strings with values in {_SPECIALROWS!r}''')
 
     def _prepLine(self, weight, color):
         if color and color!=self._curcolor:
+            self._strokeLinePath()
             self.canv.setStrokeColor(color)
             self._curcolor = color
         if weight and weight!=self._curweight:
+            self._strokeLinePath()
             self.canv.setLineWidth(weight)
             self._curweight = weight
 
+    def _strokeLinePath(self):
+        '''stroke the line segments collected in _drawLines as a single path'''
+        P = getattr(self,'_linePath',None)
+        if P:
+            self.canv.lines(P)
+            P[:] = []
+
     def _drawHLines(self, start, end, weight, color, count, space):
         sc,sr = start
         ec,er = end
@@ -1361,7 +1389,7 @@ only rows may be strings with values in {_SPECIALROWS!r}''')
         self._drawVLines((sc+1, sr), (ec+1, er), weight, color, count, space)
 
     def wrap(self, availWidth, availHeight):
-        self._calc(availWidth, availHeight)
+        self._calc(availWidth, availHeight, partial=self._partialWrap)
         self.availWidth = availWidth
         return (self._width, self._height)
 
@@ -1703,7 +1731,7 @@ only rows may be strings with values in {_SPECIALROWS!r}''')
             usedHeights = sum(self._rowHeights[:n])
 
             cellvalues = self._cellvalues[n]
-            cellStyles = self._cellStyles[n]
+            cellStyles = [_.copy() for _ in self._cellStyles[n]]   #these may be modified
             cellWidths = self._colWidths
             curRowHeight = self._rowHeights[n]
 
@@ -1779,7 +1807,7 @@ only rows may be strings with values in {_SPECIALROWS!r}''')
                         er += self._nrows
                     spanCmds.append((cmd, (sc, sr), (ec, er)))
 
-                newCellStyles = [_[:] for _ in self._cellStyles]
+                newCellStyles = self._cellStyles[:]
                 bkgrndcmds = self._bkgrndcmds
 
                 # There are cells spanning the rows we want to split. They can be split,
@@ -1792,7 +1820,8 @@ only rows may be strings with values in {_SPECIALROWS!r}''')
                     newHeight = sum(self._rowHeights[span_sr:n])
 
                     # Copy the style:
-                    oldStyle = newCellStyles[span_sr][span_sc]
+                    row = newCellStyles[span_sr] = newCellStyles[span_sr][:]
+                    oldStyle = row[span_sc] = row[span_sc].copy()
 
                     res = self._splitCell(self._cellvalues[span_sr][span_sc],
                                           oldStyle, oldHeight, newHeight, width)
@@ -1849,7 +1878,8 @@ only rows may be strings with values in {_SPECIALROWS!r}''')
                                 oldStyle.topPadding += margin
                             elif v[1]:
                                 newStyle.bottomPadding += margin
-                    newCellStyles[n][span_sc] = newStyle
+                    row = newCellStyles[n] = newCellStyles[n][:]
+                    row[span_sc] = newStyle
 
                 # Make a new table here
                 T = self.__class__( data, colWidths=self._colWidths,
@@ -2016,6 +2046,7 @@ only rows may be strings with values in {_SPECIALROWS!r}''')
             newRowHeights.insert(n + 1, newRowHeight)
             newRowHeights[n] = usedHeight
             newCellStyles = self._cellStyles[:]
+            newCellStyles[n] = cellStyles
             newCellStyles.insert(n + 1, R1Styles)
 
             data = data[:n] + [R0] + [R1] + data[n+1:]
@@ -2091,7 +2122,8 @@ only rows may be strings with values in {_SPECIALROWS!r}''')
                 repeatRows = list(sorted(repeatRows))
                 iRows = [data[i] for i in repeatRows]
                 iRowH = [splitH[i] for i in repeatRows]
-                iCS = [T._cellStyles[i] for i in repeatRows]
+                iCS = T._cellStyles
+                iCS = iCS.take(repeatRows) if isinstance(iCS,_CellStyles) else [iCS[i] for i in repeatRows]
             R1 = self.__class__(iRows+data[n:],colWidths=T._colWidths,
                     rowHeights=iRowH+splitH[n:],
                     repeatRows=len(repeatRows), repeatCols=repeatCols,
@@ -2135,6 +2167,7 @@ only rows may be strings with values in {_SPECIALROWS!r}''')
 
         R0.hAlign = R1.hAlign = T.hAlign
         R0.vAlign = R1.vAlign = T.vAlign
+        R0._batchText = R1._batchText = self._batchText
         self.onSplit(R0)
         self.onSplit(R1)
         return [R0,R1]
@@ -2175,7 +2208,7 @@ only rows may be strings with values in {_SPECIALROWS!r}''')
         return split_at
 
     def split(self, availWidth, availHeight):
-        self._calc(availWidth, availHeight)
+        self._calc(availWidth, availHeight, partial=1)
         if self.splitByRow or self.splitInRow:
             if self._width>availWidth:  #something wrong
                 if not rl_config.allowTableBoundsErrors&1:
@@ -2342,6 +2375,9 @@ only rows may be strings with values in {_SPECIALROWS!r}''')
         canv.restoreState()
 
     def draw(self):
+        if self._hmax<len(self._rowHeights):
+            #an early stopping wrap or split left rows unsized
+            self._calc(getattr(self,'availWidth',self._width),self._height)
         c = self.canv
         c.saveState()
         self._curweight = self._curcolor = self._curcellstyle = None
@@ -2363,6 +2399,8 @@ only rows may be strings with values in {_SPECIALROWS!r}''')
                         self._drawCell(cellval, cellstyle, (colpos, rowpos), (colwidth, rowheight))
                         renderCB(self,'endCell')
                     renderCB(self,'endRow')
+            elif self._batchText and c.bottomup:
+                self._drawCellsBatched()
             else:
                 for row, rowstyle, rowpos, rowheight in zip(self._cellvalues, self._cellStyles, self._rowpositions[1:], self._rowHeights):
                     for colNo, (cellval, cellstyle, colpos, colwidth) in enumerate(zip(row, rowstyle, self._colpositions[:-1], self._colWidths)):
@@ -2428,28 +2466,37 @@ only rows may be strings with values in {_SPECIALROWS!r}''')
                 #might be already colours, or convertible to colors, or
                 # None, or the str 'None'.
                 #It's very common to alternate a pale shade with None.
+                #The rows don't overlap so each colour is filled as one path.
                 colorCycle = list(map(colors.toColorOrNone, arg))
                 count = len(colorCycle)
                 rowCount = er - sr + 1
+                P = [canv.beginPath() if color else None for color in colorCycle]
                 for i in range(rowCount):
-                    color = colorCycle[i%count]
+                    p = P[i%count]
                     h = rowHeights[sr + i]
-                    if color:
-                        canv.setFillColor(color)
-                        canv.rect(x0, y0, w, -h, stroke=0,fill=1)
+                    if p:
+                        p.rect(x0, y0, w, -h)
                     y0 = y0 - h
+                for color, p in zip(colorCycle, P[:rowCount]):
+                    if p:
+                        canv.setFillColor(color)
+                        canv.drawPath(p, stroke=0, fill=1)
             elif cmd == 'COLBACKGROUNDS':
                 #cycle through colours columnwise
                 colorCycle = list(map(colors.toColorOrNone, arg))
                 count = len(colorCycle)
                 colCount = ec - sc + 1
+                P = [canv.beginPath() if color else None for color in colorCycle]
                 for i in range(colCount):
-                    color = colorCycle[i%count]
+                    p = P[i%count]
                     w = colWidths[sc + i]
-                    if color:
-                        canv.setFillColor(color)
-                        canv.rect(x0, y0, w, h, stroke=0,fill=1)
+                    if p:
+                        p.rect(x0, y0, w, h)
                     x0 = x0 +w
+                for color, p in zip(colorCycle, P[:colCount]):
+                    if p:
+                        canv.setFillColor(color)
+                        canv.drawPath(p, stroke=0, fill=1)
             else:   #cmd=='BACKGROUND'
                 if (arg and isinstance(arg,(list,tuple))
                         and arg[0] in ('VERTICAL','HORIZONTAL', 'VERTICAL2', 'HORIZONTAL2',
@@ -2634,6 +2681,90 @@ only rows may be strings with values in {_SPECIALROWS!r}''')
             #external hyperlink
             self.canv.linkRect("", cellstyle.destination, Rect=(colpos, rowpos, colpos + colwidth, rowpos + rowheight), relative=1)
 
+    def _drawCellsBatched(self):
+        '''draw the cells a row at a time with all the plain string cells of the row
+        in a single text object; each line is positioned with a relative Td move and
+        alignment widths are measured once per distinct string and font.
+        Only used for bottom up canvases.'''
+        canv = self.canv
+        colpositions = self._colpositions[:-1]
+        colWidths = self._colWidths
+        widths = {}
+        extgstate = canv._extgstate
+        for row, rowstyle, rowpos, rowheight in zip(self._cellvalues, self._cellStyles, self._rowpositions[1:], self._rowHeights):
+            t = None
+            other = []
+            for cellval, cellstyle, colpos, colwidth in zip(row, rowstyle, colpositions, colWidths):
+                just = cellstyle.alignment
+                if (isinstance(cellval,(tuple,list,Flowable)) or just not in _BATCHALIGNS
+                        or cellstyle.valign not in _BATCHVALIGNS or cellstyle.direction or cellstyle.shaping
+                        or cellstyle.href or cellstyle.destination or getattr(cellval,'onDraw',None)):
+                    other.append((cellval, cellstyle, (colpos, rowpos), (colwidth, rowheight)))
+                    continue
+                vals = str(cellval).split("\n")
+                n = len(vals)
+                leading = cellstyle.leading
+                fontname = cellstyle.fontname
+                fontsize = cellstyle.fontsize
+                valign = cellstyle.valign
+                if valign=='BOTTOM':
+                    y = rowpos + cellstyle.bottomPadding+n*leading-fontsize
+                elif valign=='TOP':
+                    y = rowpos + rowheight - cellstyle.topPadding - fontsize
+                else:
+                    y = rowpos + (cellstyle.bottomPadding + rowheight-cellstyle.topPadding+n*leading)/2.0 - fontsize
+
+                if t is None:
+                    t = canv.beginText()
+                    lx = ly = 0
+                cur = self._curcellstyle
+                if cur is not cellstyle:
+                    if cur is None or cellstyle.color != cur.color:
+                        color = cellstyle.color
+                        if isStr(color): color = colors.toColor(color)
+                        t.setFillColor(color)
+                        alpha = getattr(color,'alpha',None)
+                        if alpha is not None and alpha!=extgstate.getValue('ca'):
+                            #text objects ignore alpha; put the gs operator in the text object
+                            canv._doc.ensureMinPdfVersion('transparency')
+                            extgstate.set(t,'ca',alpha)
+                    if cur is None or leading != cur.leading or fontname != cur.fontname or fontsize != cur.fontsize:
+                        t.setFont(fontname, fontsize, leading)
+                    self._curcellstyle = cellstyle
+
+                if just=='LEFT':
+                    x = colpos + cellstyle.leftPadding
+                    W = None
+                else:
+                    W = widths.get((fontname,fontsize))
+                    if W is None: W = widths[fontname,fontsize] = {}
+                    if just=='RIGHT':
+                        x = colpos + colwidth - cellstyle.rightPadding
+                        f = 1
+                    else:
+                        x = colpos+(colwidth+cellstyle.leftPadding-cellstyle.rightPadding)*0.5
+                        f = 0.5
+                for v in vals:
+                    if W is None:
+                        vx = x
+                    else:
+                        w = W.get(v)
+                        if w is None: w = W[v] = stringWidth(v,fontname,fontsize)
+                        vx = x - f*w
+                    t._code.append('%s Td' % fp_str(vx-lx,y-ly))
+                    t._textOut(v)
+                    lx = vx
+                    ly = y
+                    y -= leading
+            if t is not None:
+                canv._code.append(t.getCode())
+                canv._fontname = t._fontname
+                canv._fontsize = t._fontsize
+                canv._leading = t._leading
+                canv._fillColorObj = getattr(t,'_fillColorObj',canv._fillColorObj)
+            for args in other:
+                self._drawCell(*args)
+
     def _setCornerRadii(self, cornerRadii):
         if isListOfNumbersOrNone(cornerRadii):
             self._cornerRadii = None if not cornerRadii else list(cornerRadii) + (max(4-len(cornerRadii),0)*[0])
@@ -2652,8 +2783,223 @@ _LineOpMap = {  'GRID':'_drawGrid',
 class LongTable(Table):
     '''Henning von Bargen's changes will be active'''
     _longTableOptimize = 1
+    _partialWrap = 1
+
+class _RowSource:
+    '''row iterator shared by a StreamingTable and its remainders'''
+    def __init__(self, rows, repeatRows):
+        self.it = iter(rows)
+        self.header = None
+        self.repeatRows = repeatRows
+        self.done = False
+
+    def pull(self, buf, n):
+        it = self.it
+        if self.header is None:
+            self.header = [list(r) for r in islice(it,self.repeatRows)]
+        m = len(buf)
+        buf.extend(list(r) for r in islice(it,n))
+        if len(buf)-m<n: self.done = True
+
+class _StreamCommands:
+    '''the style commands of a StreamingTable sorted as Table._addCommand sorts
+    them, so that the Table split helpers (_splitLineCmds, _cr_0 and _cr_1_1)
+    can divide them between a slice and the remainder as a LongTable split does'''
+    _rowSplitRange = None
+    def __init__(self, cmds, ncols, nrows):
+        self._ncols = ncols
+        self._nrows = nrows
+        self._linecmds = []
+        self._bkgrndcmds = []
+        self._spanCmds = []
+        self._nosplitCmds = []
+        self._cellcmds = []
+        self._srflcmds = []
+        self._other = []
+        for cmd in cmds:
+            op = cmd[0]
+            if op in ('BACKGROUND','ROWBACKGROUNDS','COLBACKGROUNDS'):
+                self._bkgrndcmds.append(cmd)
+            elif op=='SPAN':
+                self._spanCmds.append(cmd)
+            elif op=='NOSPLIT':
+                self._nosplitCmds.append(cmd)
+            elif _isLineCommand(cmd):
+                Table._addCommand(self,cmd)
+            elif op=='ROUNDEDCORNERS' or cmd[1][1] in ('inrowsplitstart','inrowsplitend'):
+                self._other.append(cmd)
+            elif cmd[1][1] in _SPECIALROWS:
+                self._srflcmds.append(cmd)
+            else:
+                self._cellcmds.append(cmd)
+
+    def split(self, n, nrr):
+        '''return the commands for the first n rows and for the nrr repeated rows
+        followed by the rest'''
+        cmds0 = []
+        cmds1 = []
+        nrows = self._nrows
+        repeatRows = list(range(nrr))
+        lineCmds = Table._splitLineCmds(self,n)
+        self._addCommand = cmds0.append
+        try:
+            Table._cr_0(self,n,lineCmds,nrows,0)
+            Table._cr_0(self,n,self._bkgrndcmds,nrows,0,_srflMode=True)
+            for cmds in (self._spanCmds,self._nosplitCmds,self._cellcmds):
+                Table._cr_0(self,n,cmds,nrows,0)
+            self._addCommand = cmds1.append
+            Table._cr_1_1(self,n,nrows,repeatRows,lineCmds,0)
+            Table._cr_1_1(self,n,nrows,repeatRows,self._bkgrndcmds,0,_srflMode=True)
+            for cmds in (self._spanCmds,self._nosplitCmds,self._cellcmds):
+                Table._cr_1_1(self,n,nrows,repeatRows,cmds,0)
+        finally:
+            del self._addCommand
+        for c in self._srflcmds:
+            (sc,sr), (ec,er) = c[1:3]
+            cmds0.append(c)
+            cmds1.append(c)
+            if sr=='splitlast':
+                cmds0.append((c[0],)+((sc, n-1), (ec, n-1))+tuple(c[3:]))
+            else:
+                cmds1.append((c[0],)+((sc, 0), (ec, 0))+tuple(c[3:]))
+        return cmds0+self._other, cmds1+self._other
+
+def _negativeRows(cmds, m, nrows):
+    '''cmds with the last m of nrows rows made relative to the end again'''
+    R = []
+    for c in cmds:
+        if c[0]!='ROUNDEDCORNERS':
+            (sc,sr), (ec,er) = c[1:3]
+            if isinstance(sr,int) and sr>=nrows-m: sr -= nrows
+            if isinstance(er,int) and er>=nrows-m: er -= nrows
+            c = (c[0],)+((sc, sr), (ec, er))+tuple(c[3:])
+        R.append(c)
+    return R
+
+class StreamingTable(Flowable):
+    '''A table whose rows come from an iterator or generator.
+
+    Only the rows needed to fill the current frame are pulled and sized; each
+    split emits an ordinary Table for the page slice (with the first repeatRows
+    rows of the iterator repeated as a header) and a remainder which continues
+    from the same iterator, so the remaining rows are never copied or restyled.
+
+    style row coordinates are those of the whole table (negative rows count
+    from its end) and are divided between the slices as a split LongTable
+    divides them. Row spans must not cross a slice boundary.
+    '''
+    def __init__(self, rows, colWidths, style=None, repeatRows=0, rowHeights=None,
+                hAlign=None, vAlign=None, spaceBefore=None, spaceAfter=None,
+                chunkRows=64, **kw):
+        if not isinstance(repeatRows,int):
+            raise ValueError(f'{self.__class__.__name__} repeatRows must be an int not {repeatRows!r}')
+        self._source = rows if isinstance(rows,_RowSource) else _RowSource(rows,repeatRows)
+        self._buffer = []
+        self._H = None          #cached row heights (header + buffer) for _HW
+        self._HW = None
+        self._offset = 0        #number of body rows in earlier slices
+        self._colWidths = list(colWidths)
+        if style is not None and not isinstance(style,TableStyle):
+            style = TableStyle(style)
+        self._style = style
+        self.repeatRows = repeatRows
+        self._argRowHeight = rowHeights
+        self.hAlign = hAlign or 'CENTER'
+        self.vAlign = vAlign or 'MIDDLE'
+        if spaceBefore is None and style is not None: spaceBefore = getattr(style,'spaceBefore',None)
+        if spaceAfter is None and style is not None: spaceAfter = getattr(style,'spaceAfter',None)
+        if spaceBefore is not None: self.spaceBefore = spaceBefore
+        if spaceAfter is not None: self.spaceAfter = spaceAfter
+        self.chunkRows = chunkRows
+        self._tableKW = kw
+        self._T = None
+
+    def _makeTable(self, rows, rowHeights, style=None, **kw):
+        kw.update(self._tableKW)
+        return Table(self._source.header+rows, colWidths=self._colWidths, rowHeights=rowHeights,
+                    style=self._style if style is None else style, repeatRows=self.repeatRows,
+                    hAlign=self.hAlign, vAlign=self.vAlign, **kw)
+
+    def _splitStyles(self, k):
+        '''return the styles for a slice of k buffered rows and for the remainder'''
+        style = self._style
+        if style is None: return None, None
+        src = self._source
+        buf = self._buffer
+        cmds = style.getCommands()
+        rows = [r for c in cmds if c[0]!='ROUNDEDCORNERS' for r in (c[1][1],c[2][1]) if isinstance(r,int)]
+        m = max([-r for r in rows if r<0]+[1])
+        #the rows counted from the end must be known to lie after the slice
+        if not src.done and len(buf)-k<m-1: src.pull(buf,m-1-(len(buf)-k))
+        nh = len(src.header)
+        n = nh+k
+        nrows = nh+len(buf)
+        if not src.done:
+            #the table end is unknown so place it after every explicit row
+            nrows = max([nrows]+[r+1 for r in rows])+m
+        cmds0, cmds1 = _StreamCommands(cmds,len(self._colWidths),nrows).split(n,nh)
+        if not src.done: cmds1 = _negativeRows(cmds1,m,nrows-n+nh)
+        return TableStyle(cmds0,**style._opts), TableStyle(cmds1,**style._opts)
+
+    def _chunk(self, availWidth, availHeight):
+        '''build a Table from enough buffered rows to overflow availHeight'''
+        src = self._source
+        buf = self._buffer
+        if self._HW!=availWidth: self._H = None
+        n = max(len(buf),self.chunkRows)
+        while True:
+            if len(buf)<n and not src.done: src.pull(buf,n-len(buf))
+            if not buf and (self._offset or not src.header):
+                T = None    #nothing left to show
+                break
+            H = self._H or []
+            H = H+(len(src.header)+len(buf)-len(H))*[self._argRowHeight]
+            T = self._makeTable(buf,H,longTableOptimize=1)
+            T._calc(availWidth,availHeight,partial=1)
+            self._H = T._rowHeights[:T._hmax]
+            self._HW = availWidth
+            if T._height>availHeight or src.done: break
+            n = 2*len(buf)
+        self._T = T
+        return T
+
+    def wrap(self, availWidth, availHeight):
+        T = self._chunk(availWidth,availHeight)
+        if T is None:
+            self.width = self.height = 0
+        else:
+            self.width, self.height = T._width, T._height
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        T = self._chunk(availWidth,availHeight)
+        buf = self._buffer
+        if T is None or T._height<=availHeight: return [self]
+        nh = len(self._source.header)
+        n = T._getFirstPossibleSplitRowPosition(availHeight)
+        if n<=nh: return []
+        k = n - nh
+        H = self._H
+        style0, style1 = self._splitStyles(k)
+        S = self._makeTable(buf[:k], H[:n], style=style0,
+                spaceBefore=getattr(self,'spaceBefore',None) if not self._offset else 0, spaceAfter=0)
+        R = self.__class__(self._source, self._colWidths, style=style1, repeatRows=self.repeatRows,
+                rowHeights=self._argRowHeight, hAlign=self.hAlign, vAlign=self.vAlign,
+                spaceBefore=0, spaceAfter=getattr(self,'spaceAfter',None), chunkRows=self.chunkRows,
+                **self._tableKW)
+        R._buffer = buf[k:]
+        R._H = H[:nh]+H[n:]
+        R._HW = availWidth
+        R._offset = self._offset+k
+        return [S,R]
+
+    def draw(self):
+        if self._T is not None:
+            self._T.drawOn(self.canv,0,0)
 
 LINECOMMANDS = list(_LineOpMap.keys())
+_BATCHALIGNS = ('LEFT','RIGHT','CENTRE','CENTER')
+_BATCHVALIGNS = ('BOTTOM','TOP','MIDDLE')
 
 class TableRenderCB:
     '''table render callback abstract base klass to be called in Table.draw'''
@@ -2690,7 +3036,9 @@ def _setCellStyle(cellStyles, i, j, op, values):
     #new = CellStyle('<%d, %d>' % (i,j), cellStyles[i][j])
     #cellStyles[i][j] = new
     ## modify in place!!!
-    new = cellStyles[i][j]
+    _applyCellStyleOp(cellStyles[i][j], op, values)
+
+def _applyCellStyleOp(new, op, values):
     if op == 'FONT':
         n = len(values)
         new.fontname = values[0]
@@ -2729,6 +3077,133 @@ def _setCellStyle(cellStyles, i, j, op, values):
     elif op == 'SHAPING':
         new.shaping = values[0]
 
+class _CellStyleIndex:
+    '''cell style commands for a table and the tables split from it
+
+    Each command is stored once as (op, values, sc, ec). The global row ids
+    are divided into intervals, starting at starts[i], each with the key
+    (keys[i]) of the commands covering its rows. A cell's style depends only
+    on the commands covering it so cells with the same covering commands share
+    one interned CellStyle, created when a row is first looked at; the shared
+    CellStyles must be copied before they are modified.
+    '''
+    def __init__(self, ncols):
+        self.ncols = ncols
+        self.cmds = []
+        self.starts = [0]   #sorted interval starts
+        self.keys = [()]    #command key for each interval
+        self.styles = {}    #command key --> CellStyle
+        self.rowKeys = {}   #row command key --> row of CellStyles
+
+    def _start(self, r):
+        '''return the index of the interval starting at row r, splitting one if need be'''
+        starts = self.starts
+        i = bisect_right(starts,r)
+        if starts[i-1]==r: return i-1
+        starts.insert(i,r)
+        self.keys.insert(i,self.keys[i-1])
+        return i
+
+    def add(self, op, values, sc, ec, runs):
+        k = len(self.cmds)
+        self.cmds.append((op, values, sc, ec))
+        keys = self.keys
+        for lo, hi in runs:
+            i0 = self._start(lo)
+            for i in range(i0,self._start(hi+1)):
+                keys[i] += (k,)
+
+    def row(self, r):
+        key = self.keys[bisect_right(self.starts,r)-1]
+        R = self.rowKeys.get(key)
+        if R is None:
+            cmds = self.cmds
+            styles = self.styles
+            R = []
+            for j in range(self.ncols):
+                ck = tuple(k for k in key if cmds[k][2]<=j<=cmds[k][3])
+                s = styles.get(ck)
+                if s is None:
+                    s = styles[ck] = CellStyle(repr((r,j)))
+                    for k in ck:
+                        _applyCellStyleOp(s,cmds[k][0],cmds[k][1])
+                R.append(s)
+            self.rowKeys[key] = R
+        return R
+
+class _CellStyles:
+    '''list like sequence of the rows of CellStyles of a Table
+
+    Entries of _rows are either global row ids of a shared _CellStyleIndex or
+    explicit lists of CellStyle instances. Slicing and concatenation only copy
+    the row ids so split tables share the index and its interned styles.
+    '''
+    __slots__ = ('_index','_rows')
+    def __init__(self, index, rows):
+        self._index = index
+        self._rows = rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, i):
+        if isinstance(i,slice):
+            return self.__class__(self._index,self._rows[i])
+        r = self._rows[i]
+        return r if isinstance(r,list) else self._index.row(r)
+
+    def __iter__(self):
+        row = self._index.row
+        for r in self._rows:
+            yield r if isinstance(r,list) else row(r)
+
+    def __add__(self, other):
+        if isinstance(other,_CellStyles) and other._index is self._index:
+            return self.__class__(self._index,list(self._rows)+list(other._rows))
+        return self._copies()+list(other)
+
+    def __radd__(self, other):
+        return list(other)+self._copies()
+
+    def _copies(self):
+        '''the rows as lists of unshared CellStyles which may be modified in place'''
+        return [[s.copy() for s in row] for row in self]
+
+    def _rowList(self):
+        if not isinstance(self._rows,list):
+            self._rows = list(self._rows)
+        return self._rows
+
+    def __setitem__(self, i, row):
+        self._rowList()[i] = row
+
+    def insert(self, i, row):
+        self._rowList().insert(i,row)
+
+    def take(self, I):
+        rows = self._rows
+        return self.__class__(self._index,[rows[i] for i in I])
+
+    def addCommand(self, op, values, sc, ec, sr, er):
+        rows = self._rows[sr:er+1]
+        if isinstance(rows,range):
+            runs = [(rows.start,rows.stop-1)] if rows else []
+        else:
+            runs = []
+            for i,r in enumerate(rows,sr):
+                if isinstance(r,list):
+                    #the row and its CellStyles may be shared so they are copied
+                    r = self._rows[i] = r[:]
+                    for j in range(sc,ec+1):
+                        s = r[j] = r[j].copy()
+                        _applyCellStyleOp(s,op,values)
+                elif runs and runs[-1][1]==r-1:
+                    runs[-1] = runs[-1][0],r
+                else:
+                    runs.append((r,r))
+        if runs:
+            self._index.add(op,values,sc,ec,runs)
+
 GRID_STYLE = TableStyle(
     [('GRID', (0,0), (-1,-1), 0.25, colors.black),
      ('ALIGN', (1,1), (-1,-1), 'RIGHT')]
@@ -18,6 +18,9 @@ defaultImageCaching
 warnOnMissingFontGlyphs
 verbose
 showBoundary
+drawingsAsForms
+rasterCacheSize
+rasterCacheDir
 emptyTableAction
 invariant
 eps_preview_transparent
@@ -26,6 +29,7 @@ eps_ttf_embed
 eps_ttf_embed_uid
 overlapAttachedSpace
 longTableOptimize
+tableBatchText
 autoConvertEncoding
 _FUZZ
 wrapA85
@@ -88,6 +92,9 @@ defaultImageCaching =       0                       #set to zero to remove those
 warnOnMissingFontGlyphs =   0                       #if 1, warns of each missing glyph
 verbose =                   0
 showBoundary =              0                       # turns on and off boundary behaviour in Drawing
+drawingsAsForms =           0                       #if true renderPDF.draw places drawings as forms shared by identical drawings
+rasterCacheSize =           64                      #number of drawings rasterized for placing as images kept in memory
+rasterCacheDir =            None                    #if set the directory where drawings rasterized for placing as images are kept
 emptyTableAction=           'error'                 # one of 'error', 'indicate', 'ignore'
 invariant=                  0                       #produces repeatable,identical PDFs with same timestamp info (for regression testing)
 eps_preview_transparent=    None                    #set to white etc
@@ -97,6 +104,7 @@ eps_ttf_embed_uid=          0                       #set to 1 to enable
 overlapAttachedSpace=       1                       #if set non false then adajacent flowable space after
                                                     #and space before are merged (max space is used).
 longTableOptimize =         1                       #default do use Henning von Bargen's long table optimizations
+tableBatchText =            0                       #if true tables draw the plain string cells of a row in one text object
 autoConvertEncoding  =      0                       #convert internally as needed (experimental)
 _FUZZ=                      1e-6                    #fuzz for layout arithmetic
 wrapA85=                    0                       #set to 1 to get old wrapped line behaviour
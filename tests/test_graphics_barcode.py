@@ -332,6 +332,44 @@ class BarcodeWidgetTestCase(unittest.TestCase):
                 if not klass.valid(c):
                     raise ValueError('%s.valid(%r) does not match' % (klass.__name__,c))
 
+    def test_barcode_symbols(self):
+        '''test createBarcodeSymbols against createBarcodeDrawing'''
+        from reportlab.graphics.barcode import createBarcodeSymbol, createBarcodeSymbols
+        from reportlab.graphics.shapes import Group, UserNode
+        def barArea(node,scale=1):
+            A = 0
+            for n in node.contents:
+                if isinstance(n,UserNode): n = n.provideNode()
+                if isinstance(n,Group):
+                    A += barArea(n,scale*n.transform[0]*n.transform[3])
+                elif isinstance(n,Rect) and n.fillColor is not None:
+                    A += abs(n.width*n.height*scale)
+            return A
+        for name, value in (('Code128','AB-1234'),('EAN13','123456789012'),('I2of5','1234'),('QR','HELLO'),('FIM','A')):
+            d = createBarcodeDrawing(name,value=value)
+            s = createBarcodeSymbol(name,value)
+            self.assertEqual((s.width,s.height),(d.width,d.height))
+            self.assertAlmostEqual(sum(w*h for k,runs in s.bars for x,y,w,h in runs),barArea(d),6,
+                    msg='%s bar area differs' % name)
+        values = ['LBL%04d' % (i%37) for i in range(100)]
+        S = createBarcodeSymbols('Code128',values,processes=0,barHeight=20)
+        self.assertIs(S[0],S[37])
+        self.assertIs(S[1],createBarcodeSymbol('Code128','LBL0001',barHeight=20))
+        P = createBarcodeSymbols('Code128',['X%d' % i for i in range(10)],processes=2,humanReadable=1)
+        Q = createBarcodeSymbols('Code128',['X%d' % i for i in range(10)],processes=0,humanReadable=1)
+        self.assertEqual([(p.bars,p.strings) for p in P],[(q.bars,q.strings) for q in Q])
+        from unittest import mock
+        import multiprocessing, os
+        with mock.patch.object(multiprocessing,'get_context',side_effect=AssertionError('pool used')), \
+                mock.patch.object(os,'cpu_count',return_value=4):
+            D = createBarcodeSymbols('Code128',['Y%d' % i for i in range(10)],humanReadable=1)
+        self.assertEqual([d.strings for d in D],[createBarcodeSymbol('Code128','Y%d' % i,humanReadable=1).strings for i in range(10)])
+        c = Canvas(self.makeFn('barcode-symbols.pdf'))
+        for i,s in enumerate(S+P):
+            s.drawOn(c,20+(i%4)*140,800-(i//4%20)*40)
+            if i%80==79: c.showPage()
+        c.save()
+
     def createSample(self,name,memory):
         f = open(self.makeFn(name),'wb')
         f.write(memory)
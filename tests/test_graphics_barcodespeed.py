@@ -0,0 +1,126 @@
+#Copyright ReportLab Europe Ltd. 2000-2026
+#see license.txt for license details
+"""
+Times barcode symbol construction over the range of symbol sizes and
+checks the fast paths agree with the straightforward implementations.
+"""
+__version__='3.3.0'
+from reportlab.lib.testutils import setOutDir,makeSuiteForClasses, outputfile, printLocation
+setOutDir(__name__)
+import unittest, time, random
+from reportlab.graphics.barcode.qrencoder import QRCode, QR8bitByte, QRRSBlock, QRUtil, QRPolynomial, QRErrorCorrectLevel
+from reportlab.graphics.barcode.ecc200datamatrix import ECC200DataMatrix, FACTORS
+
+def qrCases(seed=7):
+    '''yield version, level, data filling each QR version and error correction level'''
+    R = random.Random(seed)
+    for version in range(1,41):
+        for level in 'LMQH':
+            ec = getattr(QRErrorCorrectLevel,level)
+            total = sum(b.dataCount for b in QRRSBlock.getRSBlocks(version, ec))
+            yield version, level, ''.join(chr(R.randrange(32,127)) for i in range(total-3))
+
+class QrSpeedTestCase(unittest.TestCase):
+    def test0(self):
+        "fast QR mask scoring and error correction agree with the originals"
+        for version, level, data in qrCases():
+            if version not in (1,7,21,40): continue
+            q = QRCode(version, getattr(QRErrorCorrectLevel,level))
+            q.addData(QR8bitByte(data))
+            for i in range(8):
+                q.makeImpl(True, i)
+                self.assertEqual(QRUtil.getLostPoint(q),QRUtil._getLostPoint(q),
+                        'version %d level %s mask %d' % (version,level,i))
+        R = random.Random(11)
+        for ecCount in (7,10,13,18,22,26,30):
+            for n in (1,19,55,118):
+                data = [R.randrange(256) for i in range(n)]
+                rsPoly = QRUtil.getErrorCorrectPolynomial(ecCount)
+                modPoly = QRPolynomial(data, ecCount).mod(rsPoly)
+                mLen = modPoly.getLength()
+                expected = [(modPoly.get(i) if i >= 0 else 0) for i in range(mLen - ecCount, mLen)]
+                self.assertEqual(QRUtil.getErrorCorrectBytes(data, ecCount), expected)
+
+    def test1(self):
+        "time QR codes for every version and error correction level"
+        T = {}
+        for version, level, data in qrCases():
+            q = QRCode(version, getattr(QRErrorCorrectLevel,level))
+            q.addData(QR8bitByte(data))
+            t0 = time.time()
+            q.make()
+            T[version,level] = time.time() - t0
+            self.assertEqual(q.getModuleCount(), 4*version+17)
+        with open(outputfile('test_graphics_barcodespeed_qr.log'), 'w') as f:
+            f.write('QR codes made in %0.4f\n' % sum(T.values()))
+            for version in range(1,41):
+                f.write('version %2d %s\n' % (version,' '.join('%s %0.4f' % (level,T[version,level]) for level in 'LMQH')))
+
+def dmReedSolomon(dm, data, n):
+    '''the straightforward Reed-Solomon code words'''
+    code_words = [0]*n
+    for d in data:
+        tmp = d ^ code_words[-1]
+        for j in range(n-1, -1, -1):
+            code_words[j] = dm._gfproduct(tmp, FACTORS[n][j]) ^ (code_words[j-1] if j else 0)
+    return code_words[::-1]
+
+def dmEncode(value):
+    '''encode value by placing the bits module by module'''
+    dm = ECC200DataMatrix(value)
+    dm.validate()
+    encoded = dm._encode_c40(dm.validated)
+    encoded += dmReedSolomon(dm, encoded, dm.cw_ecc)
+    return dm._place_codewords(encoded)
+
+class DataMatrixSpeedTestCase(unittest.TestCase):
+    #ECC200DataMatrix only makes the Type 12 44x44 C40 symbol, so that is the
+    #one placement (and the one 56 codeword error correction) exercised here;
+    #the error correction alone is checked for every block size in FACTORS
+    def test0(self):
+        "fast DataMatrix error correction and placement agree with the originals"
+        R = random.Random(5)
+        dm = ECC200DataMatrix('')
+        for n in FACTORS:
+            for m in (1,10,144):
+                data = [R.randrange(256) for i in range(m)]
+                self.assertEqual(dm._get_reed_solomon_code(data, n), dmReedSolomon(dm, data, n))
+        for i in range(20):
+            value = ''.join(chr(R.randrange(256)) for i in range(R.randrange(40)))
+            dm = ECC200DataMatrix(value)
+            dm.validate()
+            self.assertEqual([list(r) for r in dm.encode()], dmEncode(value), 'value %r' % value)
+        for n in (212, 213):   #just below and at the symbol's capacity
+            value = ''.join(chr(R.randrange(65,91)) for i in range(n))
+            dm = ECC200DataMatrix(value)
+            dm.validate()
+            self.assertEqual([list(r) for r in dm.encode()], dmEncode(value), 'length %d' % n)
+        dm = ECC200DataMatrix(214*'A')
+        dm.validate()
+        self.assertRaises(Exception, dm.encode)
+
+    def test1(self):
+        "time DataMatrix symbols against placing the modules one by one"
+        R = random.Random(9)
+        alphabet = ' 0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ' #one C40 value each, so up to 213 fit
+        values = [''.join(R.choice(alphabet) for i in range(R.randrange(1,214))) for j in range(200)]
+        t0 = time.time()
+        for value in values:
+            dmEncode(value)
+        t1 = time.time()
+        for value in values:
+            dm = ECC200DataMatrix(value)
+            dm.validate()
+            dm.encode()
+        t2 = time.time()
+        with open(outputfile('test_graphics_barcodespeed_dm.log'), 'w') as f:
+            f.write('%d %dx%d DataMatrix symbols (the only size supported) made in %0.4f, originally %0.4f\n'
+                    % (len(values), dm.row_modules, dm.col_modules, t2-t1, t1-t0))
+
+def makeSuite():
+    return makeSuiteForClasses(QrSpeedTestCase, DataMatrixSpeedTestCase)
+
+#noruntests
+if __name__ == "__main__":
+    unittest.TextTestRunner().run(makeSuite())
+    printLocation()
@@ -36,6 +36,10 @@ try:
     if not haveRenderPM(): renderPM = None
 except ImportError:
     renderPM = None
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 def getFontName():
     try:
@@ -620,6 +624,123 @@ class ChartTestCase(unittest.TestCase):
         d.add(pie)
         s = renderSVG.drawToString(d)
 
+    def test_decimation(self):
+        '''LinePlot decimation keeps what the plot can show'''
+        from math import floor, sin
+        from reportlab.graphics.charts.lineplots import ScatterPlot, SimpleTimeSeriesPlot
+        from reportlab.graphics.charts.utils import decimateMinMax, decimateLTTB
+        from reportlab.graphics import renderPDF
+        self.assertEqual(decimateMinMax([0,0.2,0.4,0.6,1.1,1.2],[5,1,9,3,2,2]),[0,1,2,3,4,5])
+        self.assertEqual(decimateMinMax([0,0.2,0.4,0.6,0.8,1.1],[5,1,9,4,3,2]),[0,1,2,4,5])
+        self.assertEqual(decimateLTTB(list(range(10)),[0,0,0,9,0,0,0,0,0,0],3),[0,3,9])
+        self.assertEqual(decimateMinMax([0,0.1,0.2,0.3,0.4,0.5,0.6,0.7],[5,None,None,None,1,9,None,3]),[0,1,3,4,5,6,7])
+
+        def polyLines(g):
+            for n in g.contents:
+                if isinstance(n,PolyLine):
+                    yield n
+                elif isinstance(n,Group):
+                    yield from polyLines(n)
+
+        def columns(points):
+            C = {}
+            for i in range(0,len(points),2):
+                c = C.setdefault(floor(points[i]),[])
+                c.append(points[i+1])
+            return dict((k,(min(v),max(v))) for k,v in C.items())
+
+        data = [[(i,sin(i/50.0)*100+(i*7919)%101) for i in range(5000)]]
+        P = {}
+        for decimation in None, 'minmax', 'lttb':
+            lp = LinePlot()
+            lp.width = 100
+            lp.data = data
+            lp.decimation = decimation
+            P[decimation] = [p.points for p in polyLines(lp.draw())][0]
+            self.assertTrue(lp.data is data)
+        self.assertEqual(len(P[None]),10000)
+        self.assertTrue(len(P['minmax'])<=8*101)
+        self.assertEqual(columns(P['minmax']),columns(P[None]))
+        self.assertEqual(len(P['lttb']),200)
+        self.assertEqual(P['lttb'][:2]+P['lttb'][-2:],P[None][:2]+P[None][-2:])
+
+        #gaps in a series are kept by both methods
+        data = [[(i,None if i%400<30 else sin(i/50.0)*100+(i*7919)%101) for i in range(5000)]]
+        for decimation in None, 'minmax', 'lttb':
+            lp = LinePlot()
+            lp.width = 100
+            lp.data = data
+            lp.decimation = decimation
+            P[decimation] = [p.points for p in polyLines(lp.draw())][0]
+        self.assertTrue(len(P['minmax'])<len(P[None])//2)
+        self.assertEqual(columns(P['minmax']),columns(P[None]))
+        gapY = P[None][1]   #where the plot draws a missing value
+        gaps = lambda points: [points[i] for i in range(0,len(points),2) if points[i+1]==gapY]
+        G = gaps(P[None])
+        self.assertEqual(len(G),13*30)
+        K = gaps(P['minmax'])
+        for k in range(13):     #each gap still starts and ends where it did
+            self.assertTrue(G[30*k] in K and G[30*k+29] in K)
+
+        for klass in ScatterPlot, SimpleTimeSeriesPlot:
+            lp = klass()
+            data = lp.data
+            lp.decimation = 'minmax'
+            lp.decimationResolution = 0.01
+            d = Drawing(400,200)
+            d.add(lp)
+            renderPDF.drawToString(d)
+            self.assertTrue(lp.data is data)
+
+    def test_arrayRows(self):
+        '''ordinary data rows do not take the array path'''
+        from reportlab.graphics.charts.utils import _arrayRow
+        from reportlab.graphics.charts.axes import _arrayValues
+        for row in [(1,2),(3,4)], ((1,2),(3,4)), (1,2,None), ():
+            self.assertEqual(_arrayRow(row),None)
+            self.assertEqual(_arrayValues(row,0),None)
+
+    @rlSkipIf(not numpy,'no numpy')
+    def test_numpyData(self):
+        '''arrays and array columns plot like the equivalent lists'''
+        from reportlab.graphics import renderSVG
+        from reportlab.graphics.charts.lineplots import ScatterPlot
+        X = [i*0.5 for i in range(200)]
+        Y = [(i*37)%23-7.5 for i in range(200)]
+        L = [list(zip(X,Y)), [(x,2*x) for x in X]]
+        aY = numpy.array(Y)
+        for A in ([numpy.column_stack((X,aY)), numpy.array(L[1])],
+                  [(numpy.array(X),aY), (numpy.array(X),2*numpy.array(X))]):
+            for klass in LinePlot, ScatterPlot:
+                S = []
+                for data in L, A:
+                    lp = klass()
+                    lp.data = data
+                    d = Drawing(400,200)
+                    d.add(lp)
+                    S.append(renderSVG.drawToString(d))
+                    self.assertTrue(lp.data is data)
+                self.assertEqual(S[0],S[1])
+
+        L = [[1,-2,3,None],[4,5,-6,7]]
+        A = [numpy.array([1,-2,3,numpy.nan]),numpy.array([4,5,-6,7])]
+        for style in 'parallel', 'stacked':
+            S = []
+            for data in L, A:
+                bc = VerticalBarChart()
+                bc.categoryAxis.style = style
+                bc.data = data
+                d = Drawing(400,200)
+                d.add(bc)
+                S.append(renderSVG.drawToString(d))
+            self.assertEqual(S[0],S[1])
+
+        from reportlab.graphics.charts.utils import _numericColumn, mkTimeTuple
+        from time import mktime
+        D = ['01/02/2020','15/03/2021','01/02/2020']
+        self.assertEqual(_numericColumn(numpy.array(D)).tolist(),[mktime(mkTimeTuple(s)) for s in D])
+        self.assertEqual(_numericColumn(numpy.array(['1970-01-02','NaT'],dtype='datetime64[D]')).tolist()[0],86400.0)
+
     def test_axes(self):
         from reportlab.graphics.charts.axes import YValueAxis, XValueAxis, LogYValueAxis, LogXValueAxis, LogYValueAxis, XCategoryAxis, YCategoryAxis
         # Sample functions.
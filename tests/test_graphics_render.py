@@ -131,6 +131,104 @@ class TextRenderModeDrawing(_DrawingEditorMixin,Drawing):
         self._add(self,Line(40,40,70,70,strokeWidth=0.5,strokeColor=toColor('green')),name='L0',validate=None,desc=None)
         self._add(self,definePath([('moveTo',80,80),('lineTo',110,110),('lineTo',80,110),'closePath'],fillColor=None,strokeWidth=2,strokeColor=toColor('yellow')),name='P0',validate=None,desc=None)
 
+def _tokens(s):
+    "split PDF or PS code into tokens keeping strings, arrays and procedures whole"
+    T = []
+    i, n = 0, len(s)
+    while i<n:
+        c = s[i]
+        if c.isspace():
+            i += 1
+        elif c in '([{':
+            e = {'(':')','[':']','{':'}'}[c]
+            j = i
+            depth = 0
+            while 1:
+                if c=='(' and s[j]=='\\':
+                    j += 2
+                    continue
+                if s[j]==c:
+                    depth += 1
+                elif s[j]==e:
+                    depth -= 1
+                    if not depth: break
+                j += 1
+            T.append(s[i:j+1])
+            i = j+1
+        else:
+            j = i+1
+            while j<n and not s[j].isspace() and s[j] not in '([{/': j += 1
+            T.append(s[i:j])
+            i = j
+    return T
+
+def _paintEvents(code, setters, save, restore, concat, paints, operands=(), resets=(), state={}):
+    """return each painting operator of PDF or PS code with the operators
+    making its path, the current matrix and the graphics state it uses"""
+    from reportlab.graphics.transform import mmult
+    state = state.copy()
+    ctm = (1,0,0,1,0,0)
+    path = []
+    stack = []
+    events = []
+    args = []
+    for t in _tokens(code):
+        if t[0] in '([{/-.0123456789' or t in operands:
+            args.append(t)
+            continue
+        if t==save:
+            stack.append((state.copy(),ctm,path[:]))
+        elif t==restore:
+            state, ctm, path = stack.pop()
+        elif t==concat:
+            m = args[0][1:-1].split() if len(args)==1 else args
+            ctm = mmult(ctm,[float(x) for x in m])
+        elif t in setters:
+            state[setters[t]] = t, tuple(args)
+        elif t in paints:
+            keys = paints[t]
+            events.append((t,tuple(path),tuple(args),tuple(round(x,6) for x in ctm),
+                    sorted((k,v) for k,v in state.items() if keys is None or k in keys)))
+            if t not in resets: path = []
+        elif t in resets:
+            path = []
+        else:
+            path.append((t,tuple(args)))
+        args = []
+    return events
+
+_pdfSetters = dict(w='w',J='J',j='j',M='M',d='d',ri='ri',i='i',gs='gs',rg='fill',g='fill',k='fill',
+        cs='fillSpace',sc='fill',scn='fill',RG='stroke',G='stroke',K='stroke',CS='strokeSpace',SC='stroke',
+        SCN='stroke',Tc='Tc',Tw='Tw',Tz='Tz',TL='TL',Tf='Tf',Tr='Tr',Ts='Ts')
+_pdfStroke = 'stroke strokeSpace w J j M d gs'.split()
+_pdfFill = 'fill fillSpace gs'.split()
+_pdfPaints = {'S':_pdfStroke, 's':_pdfStroke, 'f':_pdfFill, 'F':_pdfFill, 'f*':_pdfFill, 'n':(),
+        'Do':('gs',), 'sh':('gs',), 'EI':('gs',), 'Tj':None, 'TJ':None, "'":None, '"':None}
+_pdfPaints.update((k,_pdfStroke+_pdfFill) for k in ('B','B*','b','b*'))
+
+def _pdfEvents(d):
+    "the painting done by renderPDF.draw"
+    import re
+    from io import BytesIO
+    from reportlab.pdfgen.canvas import Canvas
+    from reportlab.graphics import renderPDF
+    c = Canvas(BytesIO())
+    renderPDF.draw(d,c,0,0)
+    code = re.sub(r'\bID\b.*?\bEI\b','EI','\n'.join(c._code),flags=re.S)
+    #pdfgen sets the text render mode back to 0 after using another
+    return _paintEvents(code,_pdfSetters,'q','Q','cm',_pdfPaints,resets=('BT','ET'),state=dict(Tr=('Tr',('0',))))
+
+def _psEvents(d):
+    "the painting done by renderPS.drawToString"
+    from reportlab.graphics import renderPS
+    return _paintEvents(renderPS.drawToString(d).decode('latin1'),
+            dict(setrgbcolor='color',setcmykcolor='color',setgray='color',setlinewidth='w',setlinecap='J',
+                setlinejoin='j',setmiterlimit='M',setdash='d',setfont='font'),
+            'gsave','grestore','concat',
+            dict(stroke='color w J j M d'.split(),fill=('color',),eofill=('color',),show=('color','font'),
+                clip=(),eoclip=()),
+            operands=('findfont','scalefont'),resets=('def','RE'))
+
 class RenderTestCase(unittest.TestCase):
     "Test renderPS classes."
 
@@ -171,6 +269,223 @@ class RenderTestCase(unittest.TestCase):
         HatchDrawing().save(formats=formats,outDir=self.outDir,fnRoot='hatch')
         TextRenderModeDrawing().save(formats=formats,outDir=self.outDir,fnRoot='textmode')
 
+    def test5(self):
+        '''drawings rendered as forms are stored once per distinct content'''
+        from reportlab.pdfgen.canvas import Canvas
+        from reportlab.graphics import renderPDF
+        def label(i):
+            d = Drawing(100,40)
+            d.add(Rect(0,0,100,40,fillColor=toColor('yellow'),fillOpacity=0.3+0.2*i,strokeColor=None))
+            d.add(String(5,15,'label %d' % i,fontName='Helvetica',fontSize=12))
+            return d
+        canv = Canvas(outputfile('test_graphics_render_forms.pdf'),pageCompression=0)
+        for n in range(60):
+            renderPDF.draw(label(n%3),canv,100*(n%5),40*(n//5),asForm=True)
+        canv.showPage()
+        pdf = canv.getpdfdata()
+        self.assertEqual(pdf.count(b'/Subtype /Form'),3)
+        self.assertEqual(pdf.count(b' Do'),60)
+        self.assertEqual(pdf.count(b'(label 1) Tj'),1)
+
+        #the same operators with different graphics state resources must not be shared
+        names = []
+        for ca in (0.5,0.5,0.25):
+            canv.beginForm(None)
+            canv.setFillAlpha(ca)
+            canv.rect(0,0,10,10,fill=1)
+            names.append(canv.endForm())
+        self.assertEqual(names[0],names[1])
+        self.assertNotEqual(names[0],names[2])
+
+    def test6(self):
+        '''a compiled display list paints like its drawing'''
+        from reportlab.graphics import renderPDF, renderPS, renderSVG, testshapes
+        from reportlab.graphics.renderbase import compileDrawing, DisplayList
+        from reportlab.graphics.charts.lineplots import ScatterPlot, sample1a
+        from reportlab.graphics.charts.piecharts import Pie, sample5
+        from reportlab.graphics.charts.barcharts import sampleStacked1
+        #the testshapes drawings use fonts renderPS cannot embed
+        D = [(getattr(testshapes,n)(),0) for n in dir(testshapes) if n.startswith('getDrawing')]
+        D.extend((d,1) for d in (FillModeDrawing(fillMode=0),AutoCloseDrawing(autoclose='svg'),
+                HatchDrawing(),TextRenderModeDrawing(),sample1a(),sample5(),sampleStacked1()))
+        d = Drawing(400,200)
+        sp = ScatterPlot()
+        sp.data = [[(i,(i*37)%101) for i in range(50)]]
+        d.add(sp)
+        p = Pie()
+        p.x = 250
+        p.data = [1,2,3,4]
+        p.labels = list('abcd')
+        d.add(p)
+        D.append((d,1))
+        for d, ps in D:
+            dl = compileDrawing(d)
+            self.assertTrue(isinstance(dl,DisplayList))
+            self.assertEqual((dl.width,dl.height),(d.width,d.height))
+            events = _pdfEvents(d)
+            self.assertTrue(events)
+            self.assertEqual(_pdfEvents(dl),events)
+            self.assertEqual(_pdfEvents(dl),events)
+            if ps:
+                self.assertEqual(_psEvents(dl),_psEvents(d))
+            self.assertEqual(renderSVG.drawToString(dl),renderSVG.drawToString(d))
+        renderPDF.drawToFile(dl,outputfile('test_graphics_render_displaylist.pdf'))
+
+    @rlSkipIf(not renderPM,'no renderPM')
+    def test7(self):
+        '''renderPM.drawBatch gives the images drawn one at a time'''
+        from reportlab.graphics import testshapes
+        D = [getattr(testshapes,n) for n in dir(testshapes) if n.startswith('getDrawing')]
+        expected = [renderPM.drawToPMCanvas(f()).pixBuf for f in D]
+        for processes in 0, 2:
+            self.assertEqual(list(renderPM.drawBatch(D,fmt='RAW',processes=processes)),expected)
+        fn = outputfile('test_graphics_render_batch.gif')
+        self.assertEqual(list(renderPM.drawBatch([(D[0],fn),D[0]()],fmt='GIF',processes=0))[0],fn)
+        with open(fn,'rb') as f:
+            self.assertEqual(f.read(),renderPM.drawToString(D[0](),fmt='GIF'))
+
+    def test8(self):
+        '''display list digests are stable and follow the content'''
+        from reportlab.graphics.renderbase import compileDrawing
+        from reportlab.graphics import testshapes, renderPDF, renderSVG
+        from reportlab.lib.colors import red, blue
+        for n in dir(testshapes):
+            if n.startswith('getDrawing'):
+                f = getattr(testshapes,n)
+                self.assertEqual(compileDrawing(f()).digest(),compileDrawing(f()).digest(),n)
+        d = HatchDrawing()
+        d0 = compileDrawing(d).digest()
+        self.assertTrue(d0)
+        d.contents[0].strokeColor = blue
+        d1 = compileDrawing(d).digest()
+        self.assertNotEqual(d0,d1)
+        d.contents[0].strokeColor = red
+        self.assertEqual(compileDrawing(d).digest(),d0)
+        d.contents[0].strokeColor = blue
+        self.assertEqual(compileDrawing(d).digest(),d1)
+        #the display list keeps what it draws
+        dl = compileDrawing(d)
+        pdf = renderPDF.drawToString(dl,invariant=1)
+        svg = renderSVG.drawToString(dl)
+        h = d.contents[0]
+        h.strokeColor = red
+        h.strokeWidth = 3
+        h.points.extend((0,0,10,10))
+        d.width = 200
+        self.assertEqual(renderPDF.drawToString(dl,invariant=1),pdf)
+        self.assertEqual(renderSVG.drawToString(dl),svg)
+        self.assertEqual(dl.digest(),d1)
+        self.assertNotEqual(compileDrawing(d).digest(),d1)
+        d.add(Line(0,0,10,10))
+        d.contents[-1]._drawTimeCallback = lambda node,canvas,renderer: None
+        self.assertEqual(compileDrawing(d).digest(),None)
+
+    def test11(self):
+        '''a display list saves and restores the graphics state only for groups'''
+        from io import BytesIO
+        from reportlab.pdfgen.canvas import Canvas
+        from reportlab.graphics import renderPDF
+        from reportlab.graphics.renderbase import compileDrawing
+        from reportlab.graphics.shapes import Circle
+        from reportlab.lib.colors import red, blue
+        d = Drawing(400,400)
+        g = Group()
+        for i in range(2000):
+            g.add(Circle(i%400,(i*7)%400,2,fillColor=red if i%3 else blue,strokeColor=None))
+        d.add(g)
+        dl = compileDrawing(d)
+        c = Canvas(BytesIO())
+        renderPDF.draw(dl,c,0,0)
+        self.assertEqual(c._code.count('q'),3)
+        #only a change of colour is set
+        self.assertEqual(c._code.count('1 0 0 rg'),667)
+        self.assertEqual(_pdfEvents(dl),_pdfEvents(d))
+
+    @rlSkipIf(not renderPM,'no renderPM')
+    def test9(self):
+        '''drawings with rasterDPI are rasterized once and embedded once'''
+        import shutil
+        from reportlab.graphics.renderPDF import GraphicsFlowable
+        from reportlab.platypus import SimpleDocTemplate
+        cacheDir = outputfile('test_graphics_render_rastercache')
+        shutil.rmtree(cacheDir,ignore_errors=True)
+        os.makedirs(cacheDir)
+        def story():
+            S = []
+            for i in range(4):
+                d = HatchDrawing()
+                d.rasterDPI = 100
+                S.append(d)
+            S.append(GraphicsFlowable(HatchDrawing(),rasterDPI=200))
+            return S
+        renderPM._rasterCache.clear()
+        key, png = renderPM.drawToCachedPNG(HatchDrawing(),dpi=100,cacheDir=cacheDir)
+        self.assertEqual(renderPM.drawToCachedPNG(HatchDrawing(),dpi=100)[1],png)
+        self.assertEqual(os.listdir(cacheDir),[key+'.png'])
+        renderPM._rasterCache.clear()
+        self.assertEqual(renderPM.drawToCachedPNG(HatchDrawing(),dpi=100,cacheDir=cacheDir),(key,png))
+        fn = outputfile('test_graphics_render_raster.pdf')
+        SimpleDocTemplate(fn).build(story())
+        with open(fn,'rb') as f:
+            self.assertEqual(f.read().count(b'/Subtype /Image'),2)
+
+    def test10(self):
+        '''renderPM.drawBatch control flow with a stand in backend'''
+        from unittest import mock
+        from reportlab.graphics import renderPM
+        class GState:
+            '''the "pixels" are the operations since the canvas was last painted over'''
+            fontName = 'Times-Roman'
+            fontSize = 10
+            created = []
+            def __init__(self,w,h,bg=0xffffff,fmt='RGB24'):
+                self.width, self.height = w, h
+                self.ops = [('paint',)]
+                self.created.append(self)
+            def __getattr__(self,name):
+                if name.startswith('_'): raise AttributeError(name)
+                return lambda *args: self.ops.append((name,)+args)
+            def setFont(self,fontName,fontSize):
+                self.fontName, self.fontSize = fontName, fontSize
+            def pathFill(self,*args):
+                w, h = self.width, self.height
+                if self.ops[-6:]==[('pathBegin',),('moveTo',0,0),('lineTo',w,0),('lineTo',w,h),('lineTo',0,h),('pathClose',)]:
+                    self.ops = [('paint',)]
+                else:
+                    self.ops.append(('pathFill',)+args)
+            @property
+            def pixBuf(self):
+                return repr(self.ops).encode()
+        class Backend:
+            pass
+        Backend.GState = GState
+        def rects():
+            d = Drawing(50,40)
+            d.add(Rect(5,5,10,10))
+            return d
+        def clipped():
+            d = Drawing(50,40)
+            d.add(Path(points=[0,0,20,0,20,20],operators=[0,1,1,3],isClipPath=1))
+            d.add(Rect(0,0,30,30,fillColor=toColor('red')))
+            return d
+        def big():
+            d = rects()
+            d.width = 100
+            return d
+        with mock.patch.object(renderPM,'_getPMBackend',lambda backend=None: Backend), \
+                mock.patch.object(renderPM,'_setFont',lambda gs,fontName,fontSize: gs.setFont(fontName,fontSize)):
+            expected = [renderPM.drawToPMCanvas(f()).pixBuf for f in (rects,clipped,rects,big,rects)]
+            del GState.created[:]
+            fn = outputfile('test_graphics_render_batch.raw')
+            R = list(renderPM.drawBatch([rects,clipped(),(rects,fn),big,rects()],fmt='RAW'))
+        self.assertEqual(R[2],fn)
+        with open(fn,'rb') as f:
+            R[2] = f.read()
+        self.assertEqual(R,expected)
+        #all in this process with the canvases reused
+        self.assertEqual(len(GState.created),2)
+        self.assertEqual(renderPM._batchCanvases,{})
+
     @rlSkipIf(not renderPM,'no renderPM')
     def testSVGLibIssues(self):
         SVGLibIssue104().save(formats=['pdf','png'],outDir=self.outDir, fnRoot='svglib-issue104')
@@ -172,6 +172,46 @@ class ValidatorTestCase(unittest.TestCase):
         for c in ([],(),('eps','pdf')):
             assert v(c), msg % str(c)
 
+    def test9(self):
+        "fast paths and memoized results agree with the tests"
+        isInt = validators.isInt
+        v = validators.NoneOr(isInt)
+        for c in (1,None,True,'4',1,'4'):
+            self.assertTrue(v(c), 'NoneOr(isInt)(%r) failed' % (c,))
+        for c in (1.0,'4.0',1.0,'4.0',()):
+            self.assertFalse(v(c), 'NoneOr(isInt)(%r) passed' % (c,))
+        r = validators.isNumberInRange(0,1)
+        self.assertTrue(r(0.5))
+        self.assertFalse(r(2))
+        self.assertFalse(r(2))
+        self.assertTrue(validators.isColorOrNone(colors.CMYKColor(0,0,0,1)))
+        self.assertTrue(validators.isAnything(object()))
+
+        from reportlab.lib.attrmap import validateSetattrs
+        from reportlab.graphics.shapes import Rect, String
+        from reportlab import rl_config
+        r = Rect(0,0,10,10,fillColor=colors.red)
+        validateSetattrs(r,x=1,strokeWidth=2)
+        self.assertEqual((r.x,r.strokeWidth,r.fillColor),(1,2,colors.red))
+        def raises(f,*args,**kw):
+            try:
+                f(*args,**kw)
+            except AttributeError:
+                return True
+            return False
+        oShapeChecking = rl_config.shapeChecking
+        try:
+            for rl_config.shapeChecking in (0,1):
+                #validateSetattrs checks exactly when setattr does whatever the test order
+                r = Rect(0,0,10,10)
+                for kw in (dict(x='a'),dict(xx=1)):
+                    (k,v), = kw.items()
+                    self.assertEqual(raises(validateSetattrs,Rect(0,0,10,10),**kw),raises(setattr,r,k,v),
+                            'shapeChecking=%s %r' % (rl_config.shapeChecking,kw))
+                self.assertEqual(raises(Rect,0,'a',10,10),raises(setattr,r,'y','a'))
+                self.assertEqual(raises(String,0,0,None),raises(setattr,String(0,0,''),'text',None))
+        finally:
+            rl_config.shapeChecking = oShapeChecking
 
 def makeSuite():
     return makeSuiteForClasses(ValidatorTestCase)
@@ -0,0 +1,70 @@
+#Copyright ReportLab Europe Ltd. 2000-2017
+#see license.txt for license details
+"""
+Times a long three column glossary in BalancedColumns with the flowable
+heights measured once per column width and with every trial height
+re-wrapping the content.
+"""
+__version__='3.3.0'
+from reportlab.lib.testutils import setOutDir,makeSuiteForClasses, outputfile, printLocation
+setOutDir(__name__)
+import unittest, time
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib import randomtext
+from reportlab.platypus import SimpleDocTemplate, Paragraph, BalancedColumns
+from reportlab.platypus.flowables import _FindSplitterMixin
+
+def makeStory(n=300):
+    styles = getSampleStyleSheet()
+    story = []
+    for m in n, n//8:
+        L = []
+        for i in range(m):
+            L.append(Paragraph('<b>term %d</b>' % i, styles['Heading4']))
+            L.append(Paragraph(' '.join(randomtext.PYTHON[(i*7+j)%len(randomtext.PYTHON)] for j in range(5+i%20)), styles['BodyText']))
+        story.append(BalancedColumns(L,nCols=3,spaceBefore=10,spaceAfter=20))
+        story.append(Paragraph('after the glossary',styles['Normal']))
+    return story
+
+class BalancedColumnsSpeedTestCase(unittest.TestCase):
+    def build(self, fn):
+        wraps = []
+        wrap = Paragraph.wrap
+        def countingWrap(self,aW,aH):
+            wraps.append(aW)
+            return wrap(self,aW,aH)
+        Paragraph.wrap = countingWrap
+        try:
+            doc = SimpleDocTemplate(outputfile(fn), invariant=1)
+            t0 = time.time()
+            doc.build(makeStory())
+            t1 = time.time()
+        finally:
+            Paragraph.wrap = wrap
+        with open(outputfile(fn),'rb') as f:
+            return t1-t0, len(wraps), f.read()
+
+    def test0(self):
+        "measuring once per column width must give the same document as re-wrapping every trial"
+        t1, n1, pdf1 = self.build('test_platypus_balancedcolumns_measured.pdf')
+        _findSplit = _FindSplitterMixin._findSplit
+        def unmeasuredFindSplit(self,*args,**kwds):
+            kwds.pop('measured',None)
+            return _findSplit(self,*args,**kwds)
+        _FindSplitterMixin._findSplit = unmeasuredFindSplit
+        try:
+            t0, n0, pdf0 = self.build('test_platypus_balancedcolumns_rewrapped.pdf')
+        finally:
+            _FindSplitterMixin._findSplit = _findSplit
+        self.assertEqual(pdf1,pdf0)
+        self.assertTrue(n1<n0)
+        with open(outputfile('test_platypus_balancedcolumns.log'), 'w') as f:
+            f.write('glossary built in %0.4f with %d paragraph wraps measured, %0.4f with %d re-wrapped\n' % (t1, n1, t0, n0))
+
+def makeSuite():
+    return makeSuiteForClasses(BalancedColumnsSpeedTestCase)
+
+#noruntests
+if __name__ == "__main__":
+    unittest.TextTestRunner().run(makeSuite())
+    printLocation()
@@ -479,6 +479,39 @@ class BreakingTestCase(unittest.TestCase):
         canv.showPage()
         canv.save()
 
+    def test7(self):
+        "prefix sum breaking must match the word by word loop"
+        from reportlab.platypus import paragraph as P
+        import random
+        R = random.Random(7)
+        fast = P._prefixSumBreakWords
+        def noFast(*args,**kwds):
+            return None
+        normal = getSampleStyleSheet()['Normal']
+        try:
+            for i in range(100):
+                text = randomText(R.choice(('PYTHON','CHOMSKY','BLAH')),R.randint(1,6))
+                style = ParagraphStyle('s',parent=normal,
+                            spaceShrinkage=R.choice((0,0.05,0.2)),
+                            fontSize=R.choice((8,10,13.3)),
+                            splitLongWords=R.choice((0,1)))
+                widths = [R.choice((30,100,123.45,451.3))]
+                if R.random()<0.5: widths.insert(0,widths[0]-20)
+                P._prefixSumBreakWords = fast
+                p = Paragraph(text,style)
+                bl = p.breakLines(widths[:])
+                wm = p._width_max
+                P._prefixSumBreakWords = noFast
+                q = Paragraph(text,style)
+                self.assertEqual(bl.lines,q.breakLines(widths[:]).lines)
+                self.assertEqual(wm,q._width_max)
+                #rewrapping at the exact measured width is a common boundary case
+                bl = q.breakLines([wm])
+                P._prefixSumBreakWords = fast
+                self.assertEqual(Paragraph(text,style).breakLines([wm]).lines,bl.lines)
+        finally:
+            P._prefixSumBreakWords = fast
+
 def makeSuite():
     return makeSuiteForClasses(BreakingTestCase)
 
@@ -756,6 +756,56 @@ This should be a mailto link <a href="mailto:reportlab-users@lists2.reportlab.co
         style = ParagraphStyle("trivial")
         Paragraph("&amp;", style)
 
+    def test5(self):
+        '''onPageStatic decoration is drawn once as a form and placed on every page'''
+        calls = []
+        def letterhead(canv,doc):
+            calls.append(doc.page)
+            canv.setFont('Helvetica-Bold',24)
+            canv.setFillColor(colors.lightgrey)
+            canv.drawCentredString(canv._pagesize[0]/2,canv._pagesize[1]-inch,'STATIC LETTERHEAD')
+            canv.rect(inch,inch,canv._pagesize[0]-2*inch,canv._pagesize[1]-2*inch)
+        def pageNumber(canv,doc):
+            canv.drawString(inch,0.5*inch,'Page %d' % doc.page)
+        normal = getSampleStyleSheet()['Normal']
+        story = [Paragraph('paragraph %d' % i,normal) for i in range(200)]
+        fn = outputfile('test_platypus_onPageStatic.pdf')
+        doc = SimpleDocTemplate(fn, invariant=1, pageCompression=0)
+        doc.build(story,onFirstPage=pageNumber,onLaterPages=pageNumber,onPageStatic=letterhead)
+        self.assertEqual(calls,[1])
+        self.assertTrue(doc.page>3)
+        with open(fn,'rb') as f:
+            pdf = f.read()
+        self.assertEqual(pdf.count(b'/Subtype /Form'),1)
+        self.assertEqual(pdf.count(b'/FormXob.PTStatic0 Do'),doc.page)
+
+    def test6(self):
+        '''onPageStatic forms are made per page size with a matching bounding box'''
+        from reportlab.lib.pagesizes import A4, landscape
+        from reportlab.platypus import Frame, NextPageTemplate
+        calls = []
+        def letterhead(canv,doc):
+            calls.append(canv._pagesize)
+            canv.rect(inch,inch,canv._pagesize[0]-2*inch,canv._pagesize[1]-2*inch)
+        normal = getSampleStyleSheet()['Normal']
+        fn = outputfile('test_platypus_onPageStatic_sizes.pdf')
+        doc = BaseDocTemplate(fn, pagesize=A4, invariant=1, pageCompression=0)
+        doc.addPageTemplates([PageTemplate(id=id,frames=[Frame(inch,inch,pagesize[0]-2*inch,pagesize[1]-2*inch)],
+                        pagesize=pagesize,onPageStatic=letterhead)
+                        for id,pagesize in (('portrait',A4),('landscape',landscape(A4)))])
+        story = []
+        for i in range(4):
+            story.append(NextPageTemplate('landscape' if i%2 else 'portrait'))
+            story.append(Paragraph('page %d' % i,normal))
+            story.append(PageBreak())
+        doc.build(story)
+        self.assertEqual(calls,[A4,landscape(A4)])
+        with open(fn,'rb') as f:
+            pdf = f.read()
+        self.assertEqual(pdf.count(b'/Subtype /Form'),2)
+        self.assertEqual(pdf.count(b'/BBox [ 0 0 595.2756 841.8898 ]'),1)
+        self.assertEqual(pdf.count(b'/BBox [ 0 0 841.8898 595.2756 ]'),1)
+
 def makeSuite():
     return makeSuiteForClasses(PlatypusTestCase)
 
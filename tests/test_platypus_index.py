@@ -125,6 +125,37 @@ class IndexTestCase(unittest.TestCase):
     
             doc.build(story, canvasmaker=index.getCanvasMaker())
 
+    def test1(self):
+        "the index table is only rebuilt when its entries change"
+        from reportlab.pdfgen.canvas import Canvas
+        canv = Canvas(outputfile('test_platypus_index_rebuild.pdf'))
+        index = SimpleIndex(dot=' . ')
+        for i in range(20):
+            index.addEntry(('term%02d' % i,'sub'),(i//5+1,str(i//5+1)),'key%d' % i)
+        index.addEntry(('term00','sub'),(1,'1'),'key0')
+        self.assertEqual(index._digest[0],20)
+        index.beforeBuild()
+        index.wrapOn(canv,400,600)
+        t = index._flowable
+        P = dict(index._paraCache)
+        for i in range(20):
+            index.addEntry(('term%02d' % i,'sub'),(i//5+1,str(i//5+1)),'key%d' % i)
+        self.assertTrue(index.isSatisfied())
+        index.beforeBuild()
+        index.wrapOn(canv,400,600)
+        self.assertTrue(index._flowable is t)
+        index.wrapOn(canv,300,600)
+        self.assertFalse(index._flowable is t)
+        t = index._flowable
+        for i in range(20):
+            index.addEntry(('term%02d' % i,'sub'),(i//5+1+(i==19),str(i//5+1+(i==19))),'key%d' % i)
+        self.assertFalse(index.isSatisfied())
+        index.beforeBuild()
+        index.wrapOn(canv,300,600)
+        self.assertFalse(index._flowable is t)
+        #only the changed entry needs a new paragraph
+        self.assertEqual(len([k for k in index._paraCache if k not in P]),1)
+
 def makeSuite():
     return makeSuiteForClasses(IndexTestCase)
 
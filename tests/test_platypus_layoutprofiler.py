@@ -0,0 +1,70 @@
+#Copyright ReportLab Europe Ltd. 2000-2017
+#see license.txt for license details
+"""Tests BaseDocTemplate.setLayoutProfiler
+"""
+__version__='3.3.0'
+from reportlab.lib.testutils import setOutDir,makeSuiteForClasses, outputfile, printLocation
+setOutDir(__name__)
+import unittest, json
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, KeepTogether, XBox, Spacer
+from reportlab.platypus.doctemplate import LayoutProfiler
+
+def makeStory():
+    normal = getSampleStyleSheet()['Normal']
+    story = []
+    for i in range(30):
+        story.append(Paragraph('Paragraph %d ' % i + 'some words '*40, normal))
+        if i%10==5:
+            story.append(KeepTogether([Paragraph('kept %d' % i,normal),
+                Table([[str(r),'x'*r] for r in range(10)],style=[('GRID',(0,0),(-1,-1),0.5,colors.black)])]))
+    story.append(Spacer(1,200))
+    story.append(XBox(300,500,'too tall for what is left'))
+    return story
+
+class LayoutProfilerTestCase(unittest.TestCase):
+    def build(self, fn, prof=None):
+        doc = SimpleDocTemplate(outputfile(fn), invariant=1)
+        if prof: self.assertTrue(doc.setLayoutProfiler(prof) is prof)
+        doc.build(makeStory())
+        with open(outputfile(fn),'rb') as f:
+            return doc.page, f.read()
+
+    def test0(self):
+        "profiling must not change the output and must account for the layout"
+        prof = LayoutProfiler()
+        self.assertEqual(self.build('test_platypus_layoutprofiler.pdf',prof),
+                        self.build('test_platypus_layoutprofiler_plain.pdf'))
+        r = json.loads(prof.toJSON())
+        self.assertEqual(len(r['builds']),1)
+        pages = r['pages']
+        self.assertEqual([p['page'] for p in pages],list(range(1,len(pages)+1)))
+        self.assertEqual(sum(p['flowables'] for p in pages),len([f for f in r['flowables'] if 'draw' in f]))
+        self.assertTrue(r['postponed'][-1]['identity'].startswith('<XBox'))
+        self.assertEqual(r['postponed'][-1]['page'],len(pages)-1)
+        self.assertTrue(r['frameBreaks']>=1)
+        C = r['classes']
+        self.assertEqual(C['XBox']['draw']['count'],1)
+        self.assertEqual(C['Table']['draw']['count'],3)
+        self.assertEqual(C['KeepTogether']['wrap']['count'],3)
+        self.assertTrue(C['Table']['wrap']['count']>3)
+        self.assertTrue(C['Paragraph']['split']['count']>=len(pages)-2)
+        for s in C.values():
+            self.assertTrue(0<=s['self']<=s['time']+1e-6)
+        kt = [f for f in r['flowables'] if f['class']=='KeepTogether']
+        self.assertEqual(len(kt),3)
+        self.assertTrue(kt[0]['time']>=kt[0]['self'])
+        text = prof.summary(5)
+        self.assertTrue(text.startswith('layout time'))
+        self.assertIn('postponed:',text)
+        prof.reset()
+        self.assertEqual(prof.report()['classes'],{})
+
+def makeSuite():
+    return makeSuiteForClasses(LayoutProfilerTestCase)
+
+#noruntests
+if __name__ == "__main__":
+    unittest.TextTestRunner().run(makeSuite())
+    printLocation()
@@ -12,6 +12,9 @@ import unittest
 from reportlab.platypus import cleanBlockQuotedText
 from reportlab.platypus.paraparser import ParaParser, ParaFrag
 from reportlab.lib.colors import black
+from reportlab.lib.abag import ABag
+from reportlab.lib.sequencer import Sequencer, setSequencer
+import io, re
 
 class ParaParserTestCase(unittest.TestCase):
     """Tests of data structures created by paragraph parser.  Esp. ability
@@ -129,8 +132,87 @@ class ParaParserTestCase(unittest.TestCase):
         #         func,
         #         )
 
+def _fragState(x):
+    if isinstance(x,ABag):
+        return (x.__class__,dict((k,_fragState(v)) for k,v in x.__dict__.items()))
+    if isinstance(x,(list,tuple)):
+        return type(x)(_fragState(v) for v in x)
+    if type(x).__eq__ is object.__eq__:
+        return type(x)  #eg ImageReader; identity can never match
+    return x
+
+class FastParseTestCase(unittest.TestCase):
+    """the fast path tokenizer must give exactly the same frags as HTMLParser"""
+
+    setUp = ParaParserTestCase.setUp
+
+    def _parse(self,txt,style,fastParse):
+        p = ParaParser()
+        p.fastParse = fastParse
+        seq = setSequencer(Sequencer())  #<seq> tags have side effects
+        try:
+            return _fragState(p.parse(txt,style))
+        except Exception as e:
+            return e.__class__, re.sub('0x[0-9a-fA-F]+','0x?',str(e))
+        finally:
+            setSequencer(seq)
+
+    def assertSameParse(self,txt,style=None):
+        style = style or self.style
+        self.assertEqual(self._parse(txt,style,1),self._parse(txt,style,0),'fast parse differs for %r' % txt)
+
+    def testSimple(self):
+        for txt in (
+                '',
+                'Hello World',
+                'a &amp; b &lt;&gt; &#32;&#x20;&nbsp; c &unknown; d',
+                'Hello <b>Bold <i>both</i></b> <I>Italic</I> <strong>S</strong><em>E</em>',
+                'a<br/>b<br />c<BR/>',
+                '<font name="Courier" size=\'14\' color="red">x</font> y',
+                '<font face="Helvetica-Bold">x<b>y</b></font>',
+                '<para>in a para</para>',
+                '<para alignment="center" fontSize="11">in a para</para>',
+                '<b/>after empty bold',
+                'Hello <b>World',
+                'Hello </b>World',
+                '<font bad="1">x</font>',
+                '<b>unbalanced</i>',
+                ):
+            self.assertSameParse(txt)
+
+    def testFallback(self):
+        for txt in (
+                '1 & 2',
+                'a < b',
+                '<u>under</u> <super>1</super>',
+                '<font size=12>unquoted</font>',
+                '<font name="a&amp;b">x</font>',
+                '&amp without semicolon',
+                '<![CDATA[<>&]]>',
+                '<b >x</b >',
+                '</ b>',
+                ):
+            self.assertSameParse(txt)
+
+    def testParagraphsCorpus(self):
+        "run the paragraph tests comparing every parse against the slow path"
+        import test_platypus_paragraphs
+        texts = []
+        orig = ParaParser.parse
+        def parse(self,text,style):
+            texts.append((text,style))
+            return orig(self,text,style)
+        ParaParser.parse = parse
+        try:
+            unittest.TextTestRunner(stream=io.StringIO()).run(test_platypus_paragraphs.makeSuite())
+        finally:
+            ParaParser.parse = orig
+        self.assertTrue(len(texts)>100)
+        for text,style in texts:
+            self.assertSameParse(text,style)
+
 def makeSuite():
-    return makeSuiteForClasses(ParaParserTestCase)
+    return makeSuiteForClasses(ParaParserTestCase,FastParseTestCase)
 
 #noruntests
 if __name__ == "__main__":
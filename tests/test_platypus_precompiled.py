@@ -0,0 +1,119 @@
+#Copyright ReportLab Europe Ltd. 2000-2017
+#see license.txt for license details
+"""Tests for Precompiled and precompileStory
+"""
+__version__='3.3.0'
+from reportlab.lib.testutils import setOutDir,makeSuiteForClasses, outputfile, printLocation
+setOutDir(__name__)
+import unittest, time
+from reportlab.lib import colors
+from reportlab.lib.randomtext import PYTHON
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, Spacer, KeepTogether
+from reportlab.platypus.flowables import Precompiled, precompileStory, clearPrecompiledStories, _precompiledStories
+
+styles = getSampleStyleSheet()
+
+def words(i,n):
+    return ' '.join(PYTHON[(i*7+j)%len(PYTHON)] for j in range(n))
+
+def terms(calls=[]):
+    calls.append(1)
+    S = [Paragraph('Terms and conditions',styles['Heading1'])]
+    for i in range(60):
+        S.append(Paragraph('%d. %s' % (i,words(i,8+i%30)), styles['BodyText']))
+        if i%15==7:
+            S.append(Table([[str(r),Paragraph('cell <b>%d</b> ' % r*5,styles['Normal']),'x'*r] for r in range(12)],
+                    style=[('GRID',(0,0),(-1,-1),0.5,colors.black)]))
+    S.append(KeepTogether([Paragraph('signed',styles['Normal']),Spacer(1,36)]))
+    return S
+
+class PrecompiledTestCase(unittest.TestCase):
+    def build(self, fn, customer, pre):
+        doc = SimpleDocTemplate(outputfile(fn), invariant=1)
+        story = [Paragraph('Dear customer %d' % customer, styles['Normal']),Spacer(1,20+customer*30)]
+        story.extend(precompileStory(terms,key='terms') if pre else terms())
+        doc.build(story)
+        with open(outputfile(fn),'rb') as f:
+            return f.read()
+
+    def test0(self):
+        "precompiled stories must draw exactly like the plain ones and be reused"
+        clearPrecompiledStories()
+        calls = terms.__defaults__[0]
+        del calls[:]
+        T = [0,0]
+        for customer in range(4):
+            for pre in 0,1:
+                t0 = time.time()
+                pdf = self.build('test_platypus_precompiled%s.pdf' % ('_pre' if pre else ''),customer,pre)
+                T[pre] += time.time()-t0
+                if pre:
+                    self.assertEqual(pdf,plain)
+                else:
+                    plain = pdf
+        self.assertEqual(len(calls),5)
+        S = precompileStory(terms,key='terms')
+        self.assertEqual(len(calls),5)
+        self.assertEqual([f.__class__.__name__ for f in S[:3]],['Precompiled']*3)
+        self.assertEqual(S[-1].__class__.__name__,'KeepTogether')
+        with open(outputfile('test_platypus_precompiled.log'), 'w') as f:
+            f.write('4 documents built in %0.4f precompiled, %0.4f plain\n' % (T[1], T[0]))
+
+    def test1(self):
+        "changed styles invalidate the cache and other widths are laid out afresh"
+        clearPrecompiledStories()
+        calls = []
+        story = lambda: [Paragraph(words(3,60),styles['BodyText'])]
+        def counted():
+            calls.append(1)
+            return story()
+        P = precompileStory(counted,width=200,key='x')
+        w, h = P[0].wrapOn(None,200,1000)
+        self.assertEqual(precompileStory(counted,width=200,key='x'),P)
+        self.assertEqual(len(calls),1)
+        style = styles['BodyText']
+        leading = style.leading
+        style.leading = leading+2
+        try:
+            Q = precompileStory(counted,width=200,key='x')
+            self.assertEqual(len(calls),2)
+            self.assertTrue(Q[0].wrapOn(None,200,1000)[1]>h)
+        finally:
+            style.leading = leading
+        p = Precompiled(story()[0])
+        self.assertEqual(p.wrapOn(None,200,1000),(w,h))
+        w1, h1 = p.wrapOn(None,300,1000)
+        self.assertTrue(h1<h)
+        self.assertEqual(p.wrapOn(None,300,10),(w1,h1))
+        S = p.splitOn(None,300,h1/2)
+        self.assertEqual(len(S),2)
+        self.assertEqual(p.wrapOn(None,300,1000),(w1,h1))
+
+    def test2(self):
+        "only the marked classes are precompiled and the cache is bounded"
+        from reportlab.platypus import flowables, LongTable
+        class MyParagraph(Paragraph):
+            pass
+        P = precompileStory([Paragraph('a',styles['Normal']),MyParagraph('b',styles['Normal']),
+                    Table([['c']]),LongTable([['d']])])
+        self.assertEqual([f.__class__.__name__ for f in P],['Precompiled','MyParagraph','Precompiled','LongTable'])
+        clearPrecompiledStories()
+        n = flowables._precompiledStoriesSize
+        for i in range(n+5):
+            precompileStory(lambda: [Paragraph(str(i),styles['Normal'])],key=i)
+            precompileStory(lambda: [],key=0)   #keep the first one in use
+        self.assertEqual(len(_precompiledStories),n)
+        self.assertTrue((0,None) in _precompiledStories)
+        self.assertFalse((1,None) in _precompiledStories)
+        self.assertTrue((n+4,None) in _precompiledStories)
+        clearPrecompiledStories()
+        self.assertEqual(len(_precompiledStories),0)
+
+def makeSuite():
+    return makeSuiteForClasses(PrecompiledTestCase)
+
+#noruntests
+if __name__ == "__main__":
+    unittest.TextTestRunner().run(makeSuite())
+    printLocation()
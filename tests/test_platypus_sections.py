@@ -0,0 +1,109 @@
+#Copyright ReportLab Europe Ltd. 2000-2017
+#see license.txt for license details
+"""Tests BaseDocTemplate.buildSections
+"""
+__version__='3.3.0'
+from reportlab.lib.testutils import setOutDir,makeSuiteForClasses, outputfile, printLocation
+setOutDir(__name__)
+import unittest, random
+from reportlab.lib import colors
+from reportlab.lib.units import cm
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.randomtext import randomText
+from reportlab.platypus.paragraph import Paragraph
+from reportlab.platypus.tables import Table
+from reportlab.platypus.flowables import PageBreakIfNotEmpty
+from reportlab.platypus.frames import Frame
+from reportlab.platypus.doctemplate import PageTemplate, BaseDocTemplate, NextPageTemplate, SimpleDocTemplate
+
+def onPage(canv, doc):
+    canv.saveState()
+    canv.setFont('Times-Roman', 10)
+    canv.drawString(10*cm, cm, '%s page %d' % (doc.pageTemplate.id, doc.page))
+    canv.restoreState()
+
+class SectionDocTemplate(BaseDocTemplate):
+    def __init__(self, filename, **kw):
+        BaseDocTemplate.__init__(self, filename, **kw)
+        self.addPageTemplates([
+            PageTemplate('first',[Frame(2.5*cm, 2.5*cm, 16*cm, 20*cm, id='F0')],onPage=onPage),
+            PageTemplate('later',[Frame(2.5*cm, 2.5*cm, 7.8*cm, 25*cm, id='F1'),
+                                Frame(10.7*cm, 2.5*cm, 7.8*cm, 25*cm, id='F2')],onPage=onPage),
+            ])
+
+    def afterFlowable(self, flowable):
+        if isinstance(flowable,Paragraph) and flowable.style.name=='Heading1':
+            text = flowable.getPlainText()
+            self.canv.bookmarkPage(text)
+            self.canv.addOutlineEntry(text,text,0)
+
+def makeSection(i):
+    styles = getSampleStyleSheet()
+    random.seed(i)  #randomText uses the random module
+    S = [PageBreakIfNotEmpty(nextTemplate='first'),
+        Paragraph('Chapter %d' % i, styles['Heading1']),
+        NextPageTemplate('later')]
+    for j in range(random.randint(10,40)):
+        S.append(Paragraph(randomText('CHOMSKY',random.randint(1,4)), styles['Normal']))
+        if random.random()<0.1:
+            S.append(Table([[str(r),'x'*r] for r in range(random.randint(2,30))],
+                    style=[('GRID',(0,0),(-1,-1),0.5,colors.black)]))
+    return S
+
+class SectionsTestCase(unittest.TestCase):
+    def build(self, fn, processes):
+        doc = SectionDocTemplate(outputfile(fn), invariant=1)
+        if processes is None:
+            story = []
+            for i in range(6):
+                story.extend(makeSection(i))
+            doc.build(story)
+        else:
+            doc.buildSections([makeSection(i) for i in range(6)],processes=processes)
+        with open(outputfile(fn),'rb') as f:
+            return doc.page, f.read()
+
+    def test0(self):
+        "sections built in process or in workers must match a normal build"
+        pages, pdf = self.build('test_platypus_sections_normal.pdf',None)
+        self.assertTrue(pages>6)
+        for processes in (1,3):
+            self.assertEqual(self.build('test_platypus_sections_%d.pdf' % processes,processes),(pages,pdf))
+
+    def test1(self):
+        "SimpleDocTemplate sections use its First and Later page templates"
+        def section(i):
+            S = makeSection(i)
+            return [PageBreakIfNotEmpty()]+S[1:2]+S[3:]
+        def simpleOnPage(canv, doc):
+            canv.drawString(cm, cm, 'simple page %d' % doc.page)
+        results = []
+        for processes in (None,1,3):
+            fn = outputfile('test_platypus_sections_simple_%s.pdf' % processes)
+            doc = SimpleDocTemplate(fn, invariant=1)
+            if processes is None:
+                story = []
+                for i in range(4):
+                    story.extend(section(i))
+                doc.build(story,onFirstPage=simpleOnPage,onLaterPages=simpleOnPage)
+            else:
+                doc.buildSections([section(i) for i in range(4)],onFirstPage=simpleOnPage,
+                        onLaterPages=simpleOnPage,processes=processes)
+            with open(fn,'rb') as f:
+                results.append((doc.page,f.read()))
+        self.assertTrue(results[0][0]>4)
+        self.assertEqual(results[1],results[0])
+        self.assertEqual(results[2],results[0])
+
+    def test2(self):
+        "buildSections without page templates raises a clear error"
+        doc = BaseDocTemplate(outputfile('test_platypus_sections_none.pdf'))
+        self.assertRaises(ValueError,doc.buildSections,[makeSection(0)])
+
+def makeSuite():
+    return makeSuiteForClasses(SectionsTestCase)
+
+#noruntests
+if __name__ == "__main__":
+    unittest.TextTestRunner().run(makeSuite())
+    printLocation()
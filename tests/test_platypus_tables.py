@@ -1186,6 +1186,224 @@ class TablesTestCase(unittest.TestCase):
             ok = True
         self.assertEqual(ok,True,f'\n{pdffn} not built')
 
+    def test_longTableOptimize(self):
+        '''longTableOptimize should only size the rows needed to fill availHeight when splitting'''
+        from reportlab.platypus import LongTable
+        data = [[str(i),'x'] for i in range(1000)]
+        t = LongTable(data)
+        w, h = t.wrap(400,200)
+        self.assertTrue(h>200)
+        self.assertTrue(t._hmax<20,'%d rows were sized' % t._hmax)
+        self.assertEqual(t._rowHeights[t._hmax:],(1000-t._hmax)*[None])
+
+        #a row span crossing the frame bottom must be sized completely
+        t = Table(data, longTableOptimize=1, style=[('SPAN',(0,5),(0,30))])
+        t.split(400,200)
+        self.assertEqual(t._hmax,31)
+
+        #fixed height rows also stop the sizing
+        t = Table(data, longTableOptimize=1, rowHeights=[None]+998*[20]+[None])
+        t.split(400,200)
+        self.assertEqual(t._hmax,11)
+        self.assertEqual(t._rowHeights[-1],None)
+
+        t = Table(data, longTableOptimize=0)
+        t.split(400,200)
+        self.assertEqual(t._hmax,1000)
+
+        #an ordinary Table is sized completely by wrap and every row is drawn
+        from reportlab.pdfgen.canvas import Canvas
+        c = Canvas(outputfile('test_platypus_tables_longTableOptimize.pdf'))
+        data = [[str(i),'x'] for i in range(100)]
+        t = Table(data)
+        self.assertEqual(t.wrapOn(c,400,200),Table(data,longTableOptimize=0).wrapOn(c,400,200))
+        self.assertEqual(t._hmax,100)
+        t.drawOn(c,10,10)
+
+        #a LongTable wrapped short of its end still draws all its rows
+        t = LongTable(data)
+        t.wrapOn(c,400,200)
+        self.assertTrue(t._hmax<100)
+        t.drawOn(c,10,10)
+        self.assertEqual(t._hmax,100)
+        self.assertEqual(t._height,1800)
+        c.save()
+
+    def test_streamingTable(self):
+        '''StreamingTable pulls rows on demand and emits the same pages as a LongTable'''
+        from reportlab.platypus.tables import LongTable, StreamingTable
+        pulled = []
+        def rows(n):
+            yield ['#','name','value']
+            for i in range(n):
+                pulled.append(i)
+                yield [str(i),'name %d' % i,'x'*(i%7)+('\nmore' if i%13==0 else '')]
+        style = [('GRID',(0,0),(-1,-1),0.5,colors.black),
+                ('BACKGROUND',(0,0),(-1,0),colors.lightblue),
+                ('ROWBACKGROUNDS',(0,1),(-1,-1),[colors.white,colors.lightgrey])]
+
+        t = StreamingTable(rows(10000),colWidths=[60,150,150],style=style,repeatRows=1)
+        w, h = t.wrap(400,300)
+        self.assertTrue(h>300)
+        self.assertTrue(len(pulled)<200,'%d rows were pulled' % len(pulled))
+        body = []
+        while 1:
+            S = t.split(400,300)
+            if len(S)==1: break
+            s, t = S
+            self.assertEqual(s._cellvalues[0],['#','name','value'])
+            body.extend(r[0] for r in s._cellvalues[1:])
+            self.assertTrue(len(pulled)-len(body)<200)
+        t.wrap(400,300)
+        body.extend(r[0] for r in t._T._cellvalues[1:])
+        self.assertEqual(body,[str(i) for i in range(10000)])
+
+        pages = []
+        for kind in ('LongTable','StreamingTable'):
+            doc = SimpleDocTemplate(outputfile('test_platypus_tables_%s.pdf' % kind))
+            if kind=='LongTable':
+                T = LongTable(list(rows(2000)),colWidths=[60,150,150],style=style,repeatRows=1)
+            else:
+                T = StreamingTable(rows(2000),colWidths=[60,150,150],style=style,repeatRows=1)
+            doc.build([Paragraph('Streaming',getSampleStyleSheet()['Heading1']),T])
+            pages.append(doc.page)
+        self.assertEqual(pages[0],pages[1])
+
+    def test_streamingTableStyle(self):
+        '''StreamingTable style rows are those of the whole table as for a LongTable'''
+        import re, io
+        from collections import Counter
+        from reportlab.platypus.tables import LongTable, StreamingTable
+        def rows(n):
+            yield ['#','name','value']
+            for i in range(n):
+                yield [str(i),'name %d' % i,'x'*(i%7)]
+        style = [('GRID',(0,0),(-1,-1),0.5,colors.black),
+                ('BACKGROUND',(0,3),(-1,3),colors.red),
+                ('LINEBELOW',(0,-1),(-1,-1),2,colors.blue),
+                ('BACKGROUND',(0,-2),(-1,-2),colors.yellow),
+                ('TEXTCOLOR',(0,100),(-1,-1),colors.green),
+                ('LINEBELOW',(0,'splitlast'),(-1,'splitlast'),1,colors.orange),
+                ('LINEABOVE',(0,'splitfirst'),(-1,'splitfirst'),1,colors.purple),
+                ]
+        out = []
+        for T in (LongTable(list(rows(300)),colWidths=[60,150,150],style=style,repeatRows=1),
+                StreamingTable(rows(300),colWidths=[60,150,150],style=style,repeatRows=1,chunkRows=16)):
+            buf = io.BytesIO()
+            doc = SimpleDocTemplate(buf,invariant=1,pageCompression=0)
+            doc.build([T])
+            ops = Counter(re.findall(rb'[\d.]+ [\d.]+ [\d.]+ (?:rg|RG)',buf.getvalue()))
+            out.append((doc.page,ops))
+        self.assertTrue(out[0][0]>5)
+        self.assertEqual(out[0][1][b'1 0 0 rg'],1)
+        self.assertEqual(out[0][1][b'0 0 1 RG'],1)
+        self.assertEqual(out[0],out[1])
+
+    def test_cellStyleIntervals(self):
+        '''cell style commands are held as intervals and resolve to shared CellStyles'''
+        data = [[str(i),'x'] for i in range(100)]
+        t = Table(data, style=[('FONT',(0,0),(-1,-1),'Helvetica',8),
+                            ('TEXTCOLOR',(1,10),(1,19),colors.red),
+                            ('FONT',(0,'splitlast'),(-1,'splitlast'),'Times-Bold'),
+                            ('FONT',(0,'splitfirst'),(-1,'splitfirst'),'Courier'),
+                            ])
+        S = t._cellStyles
+        self.assertEqual(len(S),100)
+        self.assertIs(S[0][0],S[99][0])
+        self.assertIs(S[0][1],S[9][1])
+        self.assertIsNot(S[10][1],S[9][1])
+        self.assertEqual((S[15][1].fontname,S[15][1].fontsize,S[15][1].color),('Helvetica',8,colors.red))
+        self.assertEqual(S[20][1].color,'black')
+
+        t.setStyle([('FONTSIZE',(0,-1),(0,-1),12)])
+        self.assertEqual(S[99][0].fontsize,12)
+        self.assertEqual(S[98][0].fontsize,8)
+
+        t.wrap(200,300)
+        R0, R1 = t.split(200,300)
+        n = R0._nrows
+        self.assertEqual(R0._cellStyles[n-1][0].fontname,'Times-Bold')
+        self.assertEqual(R1._cellStyles[0][0].fontname,'Courier')
+        for R, rows in ((R0,range(n-1)),(R1,range(1,R1._nrows))):
+            for i in rows:
+                self.assertEqual(R._cellStyles[i][0].fontname,'Helvetica')
+        self.assertEqual(R1._cellStyles[-1][0].fontsize,12)
+
+        #explicit rows hold shared CellStyles which are copied before they are modified
+        S = t._cellStyles[:]
+        S[30] = S[30][:]
+        S.addCommand('TEXTCOLOR',(colors.blue,),0,0,29,31)
+        self.assertEqual([S[i][0].color for i in range(28,33)],['black',colors.blue,colors.blue,colors.blue,'black'])
+        self.assertIs(S[28][0],S[32][0])
+        self.assertEqual(t._cellStyles[30][0].color,'black')
+        #the index keeps the commands covering each interval of rows
+        index = S._index
+        self.assertEqual(index.starts,[0,10,n-1,n,20,29,30,31,32,99,100])
+        self.assertEqual(index.keys[5:9],[(0,5),(0,),(0,5),(0,)])
+
+        #user supplied cellStyles are still modified in place
+        from reportlab.platypus.tables import CellStyle
+        cs = [[CellStyle(repr((i,j))) for j in range(2)] for i in range(3)]
+        t = Table([['a','b']]*3, cellStyles=cs, style=[('ALIGN',(1,0),(1,-1),'RIGHT')])
+        self.assertEqual([r[1].alignment for r in cs],3*['RIGHT'])
+        self.assertEqual([r[0].alignment for r in cs],3*['LEFT'])
+
+    def test_batchText(self):
+        '''batchText draws a row's string cells in one text object at the same places'''
+        import re
+        from reportlab.pdfgen.canvas import Canvas
+        def textPositions(code):
+            R = []
+            x = y = 0
+            fill = font = None
+            A = []
+            for m in re.finditer(r'(\((?:\\.|[^\\)])*\))|(\S+)',code):
+                if m.group(1):
+                    s = m.group(1)
+                    continue
+                op = m.group(2)
+                if op=='BT': x = y = 0
+                elif op=='Tm': x, y = map(float,A[-2:])
+                elif op=='Td': x, y = x+float(A[-2]), y+float(A[-1])
+                elif op=='Tf': font = tuple(A[-2:])
+                elif op=='rg': fill = tuple(A[-3:])
+                elif op=='Tj': R.append((font,fill,round(x,2),round(y,2),s))
+                else:
+                    A = A+[op] if op[0] in '/.-0123456789' else []
+                    continue
+                A = []
+            return sorted(R)
+        data = [['Item','Qty','Price']]+[['Item %d' % i,str(i),'%.2f' % (i*1.5)] for i in range(20)]
+        data[3][0] = Paragraph('para',getSampleStyleSheet()['Normal'])
+        data[4][2] = '1.0\n2.0'
+        style = [('FONT',(0,0),(-1,0),'Helvetica-Bold'),('ALIGN',(1,0),(1,-1),'CENTRE'),
+                ('ALIGN',(2,0),(2,-1),'RIGHT'),('TEXTCOLOR',(1,5),(1,10),colors.red),
+                ('VALIGN',(0,0),(-1,-1),'MIDDLE'),('ALIGN',(2,7),(2,7),'DECIMAL'),('FONTSIZE',(0,12),(-1,15),7)]
+        code = []
+        for batchText in (0,1):
+            t = Table(data,style=style,batchText=batchText)
+            t.wrap(400,800)
+            canv = Canvas(outputfile('test_platypus_tables_batchText.pdf'))
+            t.drawOn(canv,0,0)
+            code.append(canv.getCurrentPageContent())
+        self.assertEqual(textPositions(code[1]),textPositions(code[0]))
+        self.assertTrue(code[1].count('BT ')<code[0].count('BT ')//2)
+
+    def test_mergedPaths(self):
+        '''grid segments sharing a stroke state and row backgrounds sharing a colour are painted as single paths'''
+        from reportlab.pdfgen.canvas import Canvas
+        data = [[str(i),str(i*i),'x'] for i in range(50)]
+        t = Table(data,style=[('GRID',(0,0),(-1,-1),0.5,colors.black),
+                            ('ROWBACKGROUNDS',(0,0),(-1,-1),[colors.white,colors.lightgrey,colors.pink])])
+        t.wrap(400,1000)
+        canv = Canvas(outputfile('test_platypus_tables_mergedPaths.pdf'))
+        t.drawOn(canv,0,0)
+        code = canv.getCurrentPageContent()
+        self.assertEqual(code.count('f*\n'),3)
+        self.assertEqual(code.count(' re'),50)
+        self.assertEqual(code.count('\nS\n'),1)
+        self.assertEqual(code.count(' l\n'),4+49+2)
+
 
 def makeSuite():
     return makeSuiteForClasses(TablesTestCase)
@@ -372,6 +372,32 @@ class TocTestCase(unittest.TestCase):
         doc = MyDocTemplate(outputfile('test_platypus_toc_simple.pdf'))
         doc.build(S)
 
+    def test3(self):
+        "the toc table is only rebuilt when its entries change"
+        from reportlab.pdfgen.canvas import Canvas
+        canv = Canvas(outputfile('test_platypus_toc_rebuild.pdf'))
+        toc = tableofcontents.TableOfContents()
+        E = [(i%3,'Chapter %d' % i,i+1,None) for i in range(12)]
+        toc.addEntries(E)
+        toc.beforeBuild()
+        toc.wrapOn(canv,400,600)
+        t = toc._table
+        P = dict(toc._paraCache)
+        toc.addEntries(E)
+        self.assertTrue(toc.isSatisfied())
+        toc.beforeBuild()
+        toc.wrapOn(canv,400,600)
+        self.assertTrue(toc._table is t)
+        E[5] = (2,'Chapter 5',7,None)
+        toc.addEntries(E)
+        self.assertFalse(toc.isSatisfied())
+        toc.beforeBuild()
+        toc.wrapOn(canv,400,600)
+        self.assertFalse(toc._table is t)
+        self.assertEqual(len([k for k in toc._paraCache if k not in P]),1)
+        toc.drawOn(canv,72,72)
+        canv.save()
+
 def makeSuite():
     return makeSuiteForClasses(TocTestCase)
 
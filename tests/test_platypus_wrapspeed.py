@@ -0,0 +1,69 @@
+#Copyright ReportLab Europe Ltd. 2000-2017
+#see license.txt for license details
+"""
+Times a story of nested KeepTogether and table-in-table flowables, which
+wrap their content via flowables._listWrapOn, with the cheap Frame._copy
+and with the old deepcopy of the document frame.
+"""
+__version__='3.3.0'
+from reportlab.lib.testutils import setOutDir,makeSuiteForClasses, outputfile, printLocation
+setOutDir(__name__)
+import unittest, time
+from copy import deepcopy
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, KeepTogether, FrameBG, ListFlowable
+from reportlab.platypus.frames import Frame
+
+def makeStory(n=40, depth=4):
+    styles = getSampleStyleSheet()
+    normal = styles['Normal']
+    grid = [('GRID',(0,0),(-1,-1),0.25,colors.grey)]
+    story = [FrameBG(color=colors.lightyellow,start='frame')]
+    for i in range(n):
+        inner = Table([[Paragraph('inner %d.%d' % (i,j),normal),
+                        [Paragraph('cell text %d' % j,normal),Paragraph('more text',normal)]] for j in range(3)],
+                        style=grid)
+        lst = ListFlowable([Paragraph('item %d' % k,normal) for k in range(3)])
+        outer = Table([[[Paragraph('Block %d' % i,styles['Heading3']),inner],Paragraph('x',normal)]],
+                        style=grid)
+        kt = KeepTogether([outer,lst,Paragraph('after %d' % i,normal)])
+        for d in range(depth):
+            kt = KeepTogether([Paragraph('level %d' % d,normal),kt])
+        story.append(KeepTogether([Paragraph('Section %d' % i,styles['Heading2']),kt]))
+    return story
+
+def frameDeepCopy(self):
+    f = deepcopy(self)
+    f.__dict__.pop('_generated_content',None)
+    return f
+
+class ListWrapSpeedTestCase(unittest.TestCase):
+    def build(self, fn):
+        doc = SimpleDocTemplate(outputfile(fn), invariant=1)
+        t0 = time.time()
+        doc.build(makeStory())
+        t1 = time.time()
+        with open(outputfile(fn),'rb') as f:
+            return t1-t0, f.read()
+
+    def test0(self):
+        "Frame._copy must give the same document as deepcopying the frame"
+        t1, pdf1 = self.build('test_platypus_wrapspeed_copy.pdf')
+        _copy = Frame._copy
+        Frame._copy = frameDeepCopy
+        try:
+            t0, pdf0 = self.build('test_platypus_wrapspeed_deepcopy.pdf')
+        finally:
+            Frame._copy = _copy
+        self.assertEqual(pdf1,pdf0)
+        with open(outputfile('test_platypus_wrapspeed.log'), 'w') as f:
+            f.write('nested story built in %0.4f with Frame._copy, %0.4f with deepcopy\n' % (t1, t0))
+
+def makeSuite():
+    return makeSuiteForClasses(ListWrapSpeedTestCase)
+
+#noruntests
+if __name__ == "__main__":
+    unittest.TextTestRunner().run(makeSuite())
+    printLocation()
@@ -165,6 +165,80 @@ class RenderSvgSimpleTestCase(unittest.TestCase):
         d = Drawing(1,1)
         self.assertTrue(isStr(renderSVG.drawToString(d)),msg='renderSVG.draweToString should return bytes')
 
+    def test6(self):
+        "the document is written as it is drawn"
+        class Writer(list):
+            write = list.append
+        d = Drawing(200, 100)
+        g = Group(Rect(0,0,10,10),String(10,10,'a<b'))
+        g.translate(5,5)
+        d.add(g)
+        d.add(Group())
+        d.add(Circle(50,50,10))
+        w = Writer()
+        c = renderSVG.SVGCanvas((d.width,d.height),fn=w)
+        renderSVG.draw(d, c)
+        self.assertIn('<circle cx="50" cy="50" r="10"',w[-2])
+        c.save()
+        self.assertEqual(w[-1],'</svg>\n')
+        svg = ''.join(w)
+        self.assertEqual(svg,renderSVG.drawToString(d))
+        c = renderSVG.SVGCanvas((d.width,d.height))
+        renderSVG.draw(d, c)
+        path = outputfile("test_renderSVG_simple_test6.svg")
+        c.save(path)
+        with open(path,'r') as f:
+            self.assertEqual(f.read(),svg)
+        fg = load(path).getElementsByTagName('g')[0]
+        dg = fg.getElementsByTagName('g')[0]
+        self.assertEqual([n.tagName for n in dg.childNodes if n.nodeType==n.ELEMENT_NODE],['g','g','circle'])
+        self.assertEqual(dg.getElementsByTagName('g')[0].getAttribute('transform'),' matrix(1,0,0,1,5,5)')
+        self.assertEqual(dg.getElementsByTagName('text')[0].childNodes[0].nodeValue,'a<b')
+        w = Writer()
+        c = renderSVG.SVGCanvas((d.width,d.height),fn=w)
+        c.endGroup(c.startGroup())
+        c.rect(0,0,1,1)
+        c.translate(1,1)
+        c.rect(0,0,2,2)
+        c.save()
+        gs = minidom.parseString(''.join(w)).getElementsByTagName('g')
+        self.assertEqual(gs[-1].getAttribute('transform'),'translate(1,1)')
+        self.assertEqual([r.getAttribute('width') for r in gs[-1].getElementsByTagName('rect')],['2'])
+        self.assertEqual(len(gs[0].getElementsByTagName('rect')),2)
+        self.assertRaises(AttributeError,getattr,c,'doc')
+
+    def test7(self):
+        "the DOM attributes still work and give the same output"
+        d = Drawing(200, 100)
+        g = Group(Rect(0,0,10,10),String(10,10,'a<b'))
+        g.translate(5,5)
+        d.add(g)
+        d.add(Circle(50,50,10))
+        svg = renderSVG.drawToString(d)
+        c = renderSVG.SVGCanvas((d.width,d.height))
+        renderSVG.draw(d, c)
+        self.assertEqual(c.svg.tagName,'svg')
+        self.assertIs(c.currGroup,c.groupTree)
+        self.assertEqual(c.groupTree.getAttribute('id'),'group')
+        self.assertIs(c.doc.documentElement,c.svg)
+        path = outputfile("test_renderSVG_simple_test7.svg")
+        c.save(path)
+        with open(path,'r') as f:
+            self.assertEqual(f.read(),svg)
+
+        c = renderSVG.SVGCanvas((d.width,d.height))
+        c.rect(0,0,1,1)
+        group = c.currGroup
+        c.currGroup = node = c.doc.createElement('g')
+        group.appendChild(node)
+        c.rect(0,0,2,2)
+        c.currGroup = group
+        c.translate(3,3)
+        c.rect(0,0,3,3)
+        self.assertEqual([r.getAttribute('width') for r in group.getElementsByTagName('rect')],['1','2','3'])
+        self.assertEqual([r.getAttribute('width') for r in node.getElementsByTagName('rect')],['2'])
+        self.assertTrue(group.getAttribute('transform').endswith(' translate(3,3)'))
+
     def tearDown(self):
         "When finished, make a little index page to view them in situ"
         